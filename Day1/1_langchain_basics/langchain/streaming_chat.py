@@ -1,10 +1,15 @@
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
-from langchain.chat_models import init_chat_model
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from shared.llm_cassette import cassette_model
 
 load_dotenv()
 
-model = init_chat_model("llama-3.3-70b-versatile", model_provider="groq")
+# Same as init_chat_model; records/replays when LLM_CASSETTE is set
+model = cassette_model("llama-3.3-70b-versatile", model_provider="groq")
 
 # Streaming response - shows text as it generates
 for chunk in model.stream("What is Groq?"):
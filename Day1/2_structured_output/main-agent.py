@@ -1,4 +1,6 @@
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -6,6 +8,9 @@ from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import InMemorySaver
 from pydantic import BaseModel
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.llm_metrics import instrument, metrics_from_env
+
 
 # Using create_react_agent instead of building a custom graph
 # Internally, agents create a graph and execute it automatically
@@ -20,11 +25,13 @@ class TaskPlan(BaseModel):
 
 
 def demonstrate_task_planning():
-    agent = create_react_agent(
-        model="groq:llama-3.3-70b-versatile",
-        tools=[],
-        prompt="You are a project manager. Create detailed task plans with clear steps.",
-        response_format=TaskPlan,
+    agent = instrument(
+        create_react_agent(
+            model="groq:llama-3.3-70b-versatile",
+            tools=[],
+            prompt="You are a project manager. Create detailed task plans with clear steps.",
+            response_format=TaskPlan,
+        )
     )
 
     response = agent.invoke(
@@ -51,3 +58,7 @@ def demonstrate_task_planning():
 
 
 demonstrate_task_planning()
+
+metrics = metrics_from_env()
+if metrics:
+    metrics.print_summary()
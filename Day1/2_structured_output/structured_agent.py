@@ -1,8 +1,13 @@
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.llm_cassette import cassette_model
+
 load_dotenv()
 
 
@@ -16,7 +21,8 @@ class TaskPlan(BaseModel):
 
 # Create agent with structured output
 agent = create_react_agent(
-    model="groq:llama-3.3-70b-versatile",
+    # Same as "groq:llama-3.3-70b-versatile"; records/replays when LLM_CASSETTE is set
+    model=cassette_model("groq:llama-3.3-70b-versatile"),
     tools=[],
     prompt="You are a project manager. Create detailed task plans with clear steps.",
     response_format=TaskPlan,
@@ -0,0 +1,111 @@
+"""
+Rolling Chat History - Bounded, prompt-cache-friendly conversation memory
+
+Keeps the message list sent to the model small and its prefix stable:
+- The system message only changes when the personality changes or old
+  turns are folded into the summary, so provider-side prompt caching hits
+  on every other turn.
+- The live window is capped by an approximate token budget. When it
+  overflows, the oldest turns are dropped in one block (down to half the
+  budget) and folded into a compact summary, instead of shifting the
+  window by one turn every time.
+- Switching personality summarises the current conversation and carries
+  the summary into the new system message.
+"""
+
+
+def estimate_tokens(text):
+    """Rough token estimate (about 4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def extractive_summary(previous_summary, messages, max_chars=1200):
+    """
+    Fallback summariser that needs no model call
+
+    Keeps the previous summary and the first line of each user message,
+    newest last, dropping the oldest lines beyond max_chars.
+    """
+    lines = previous_summary.splitlines()
+    for message in messages:
+        if message["role"] == "user":
+            first_line = (message["content"].strip().splitlines() or [""])[0][:200]
+            lines.append(f"- User said: {first_line}")
+
+    # Drop the oldest lines first so the newest context survives
+    while len(lines) > 1 and sum(len(line) + 1 for line in lines) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)[-max_chars:]
+
+
+class RollingHistory:
+    """
+    Conversation history with a byte-stable system prefix and a token budget
+
+    Args:
+        system_prompt: Personality / instruction text for the system message
+        max_tokens: Approximate token budget for the live turns
+        summarizer: Callable(previous_summary, messages) -> str used to fold
+            evicted turns and personality switches into a summary
+    """
+
+    def __init__(self, system_prompt, max_tokens=2000, summarizer=None):
+        self.max_tokens = max_tokens
+        self.summarizer = summarizer or extractive_summary
+        self.summary = ""
+        self.turns = []
+        self._turn_tokens = 0
+        self._set_system_message(system_prompt)
+
+    def _set_system_message(self, system_prompt):
+        self.system_prompt = system_prompt
+        content = system_prompt
+        if self.summary:
+            content += f"\n\nSummary of the earlier conversation:\n{self.summary}"
+        # Built once and reused so the prefix is identical between turns
+        self._system_message = {"role": "system", "content": content}
+
+    def add(self, role, content):
+        """Append a user or assistant message and enforce the token budget"""
+        self.turns.append({"role": role, "content": content})
+        self._turn_tokens += estimate_tokens(content)
+
+        if role == "assistant" and self._turn_tokens > self.max_tokens:
+            self._evict()
+
+    def _evict(self):
+        """Drop the oldest turns down to half the budget and summarise them"""
+        target = self.max_tokens // 2
+        dropped = 0
+
+        while dropped < len(self.turns) and self._turn_tokens > target:
+            self._turn_tokens -= estimate_tokens(self.turns[dropped]["content"])
+            dropped += 1
+
+        # Never start the live window with an assistant reply
+        while dropped < len(self.turns) and self.turns[dropped]["role"] == "assistant":
+            self._turn_tokens -= estimate_tokens(self.turns[dropped]["content"])
+            dropped += 1
+
+        evicted, self.turns = self.turns[:dropped], self.turns[dropped:]
+        self.summary = self.summarizer(self.summary, evicted)
+        self._set_system_message(self.system_prompt)
+
+    def switch_system_prompt(self, system_prompt):
+        """Change personality while carrying context over as a summary"""
+        if self.turns:
+            self.summary = self.summarizer(self.summary, self.turns)
+        self.turns = []
+        self._turn_tokens = 0
+        self._set_system_message(system_prompt)
+
+    def messages(self):
+        """Messages to send to the model"""
+        return [self._system_message, *self.turns]
+
+    def stats(self):
+        return {
+            "live_turns": len(self.turns),
+            "live_tokens": self._turn_tokens,
+            "summary_tokens": estimate_tokens(self.summary) if self.summary else 0,
+        }
@@ -2,6 +2,8 @@ import os
 from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 
+from chat_history import RollingHistory, extractive_summary
+
 load_dotenv()
 
 # Initialize the chat model
@@ -10,6 +12,28 @@ model = ChatGroq(
 )
 
 
+def summarize_conversation(previous_summary, messages):
+    """Fold older turns into a short summary using the chat model"""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    try:
+        response = model.invoke(
+            [
+                {
+                    "role": "system",
+                    "content": "Summarize the conversation in at most 5 short bullet points. Keep names, facts and user preferences. Output only the bullet points.",
+                },
+                {
+                    "role": "user",
+                    "content": f"Earlier summary:\n{previous_summary or '(none)'}\n\nConversation:\n{transcript}",
+                },
+            ]
+        )
+        return response.content
+    except Exception:
+        # Keep chatting even if the summary call fails
+        return extractive_summary(previous_summary, messages)
+
+
 def personality_chatbot():
     print("Personality Chatbot - You are talking to a friendly AI assistant!")
     print("Type 'quit' to exit, 'personality' to change AI personality")
@@ -24,7 +48,12 @@ def personality_chatbot():
     }
 
     current_personality = "friendly"
-    conversation = [{"role": "system", "content": personalities[current_personality]}]
+    # Token-bounded history; context survives personality switches as a summary
+    history = RollingHistory(
+        personalities[current_personality],
+        max_tokens=2000,
+        summarizer=summarize_conversation,
+    )
 
     while True:
         user_input = input("You: ")
@@ -43,12 +72,7 @@ def personality_chatbot():
                 personality_names = list(personalities.keys())
                 if 0 <= choice < len(personality_names):
                     current_personality = personality_names[choice]
-                    conversation = [
-                        {
-                            "role": "system",
-                            "content": personalities[current_personality],
-                        }
-                    ]
+                    history.switch_system_prompt(personalities[current_personality])
                     print(f"Changed to {current_personality} personality!")
                 else:
                     print("Invalid choice, keeping current personality.")
@@ -56,15 +80,15 @@ def personality_chatbot():
                 print("Invalid input, keeping current personality.")
             continue
 
-        # Add user message to conversation
-        conversation.append({"role": "user", "content": user_input})
-
         try:
             # Get AI response
-            response = model.invoke(conversation)
+            response = model.invoke(
+                history.messages() + [{"role": "user", "content": user_input}]
+            )
 
-            # Add AI response to conversation
-            conversation.append({"role": "assistant", "content": response.content})
+            # Add both turns only once the call succeeded
+            history.add("user", user_input)
+            history.add("assistant", response.content)
 
             print(f"AI ({current_personality}): {response.content}")
 
@@ -0,0 +1,81 @@
+"""
+Benchmark: safe_calculator vs eval for repeated expressions
+
+Agents tend to send the same few expressions again and again. eval()
+re-parses and re-compiles every time; safe_calculator parses, validates
+and compiles once and then reuses the cached bytecode.
+
+Run: python benchmark_calculate.py
+"""
+
+import timeit
+
+from safe_calculator import (
+    CONSTANTS,
+    FUNCTIONS,
+    compile_expression,
+    evaluate,
+    evaluate_many,
+)
+
+EXPRESSIONS = [
+    "15 * 8 + 3",
+    "(1 + 2) * (3 + 4) / 5",
+    "2 ** 10 - 1",
+    "sqrt(144) + log(100, 10)",
+    "abs(-42) % 5 + round(3.14159, 2)",
+]
+
+ROUNDS = 20_000
+
+
+def bench_eval():
+    namespace = {**FUNCTIONS, **CONSTANTS}
+    for expression in EXPRESSIONS:
+        eval(expression, {"__builtins__": {}}, namespace)
+
+
+def bench_safe():
+    for expression in EXPRESSIONS:
+        evaluate(expression)
+
+
+def bench_safe_uncached():
+    compile_expression.cache_clear()
+    for expression in EXPRESSIONS:
+        evaluate(expression)
+
+
+def main():
+    calls = ROUNDS * len(EXPRESSIONS)
+    print(f"{len(EXPRESSIONS)} expressions x {ROUNDS} rounds = {calls} calls")
+
+    for name, func, rounds in [
+        ("eval", bench_eval, ROUNDS),
+        ("safe (cached)", bench_safe, ROUNDS),
+        ("safe (no cache)", bench_safe_uncached, ROUNDS // 10),
+    ]:
+        seconds = timeit.timeit(func, number=rounds)
+        per_call_us = seconds / (rounds * len(EXPRESSIONS)) * 1e6
+        print(f"  {name:<16} {per_call_us:8.2f} us/call")
+
+    # One expression over many bindings: single call vs per-row calls
+    rows = 100_000
+    bindings = {"price": [float(i) for i in range(rows)], "qty": [3.0] * rows}
+    expression = "price * qty * 1.18"
+
+    seconds = timeit.timeit(lambda: evaluate_many(expression, bindings), number=5) / 5
+    print(f"\nevaluate_many over {rows} rows: {seconds * 1000:.1f} ms")
+
+    seconds = timeit.timeit(
+        lambda: [
+            evaluate(expression, {"price": p, "qty": q})
+            for p, q in zip(bindings["price"], bindings["qty"])
+        ],
+        number=1,
+    )
+    print(f"evaluate per row over {rows} rows: {seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: streaming count_file vs reading the whole file
+
+Generates a text file of the requested size (default 2 GB) and counts it
+with text_stats.count_file (fixed-size chunks, one reused buffer) and with the old
+approach (read everything, then len(text.split())). Reports throughput and
+the peak memory each approach added.
+
+Run: python benchmark_count_words.py [size_mb] [--naive]
+The naive run needs several times the file size in RAM, so it is opt-in.
+"""
+
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from text_stats import count_file
+
+LINE = "The quick brown fox jumps over the lazy dog while agents count words.\n"
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def make_file(path, size_mb):
+    block = LINE * (1024 * 1024 // len(LINE))
+    written = 0
+    with open(path, "w") as f:
+        while written < size_mb * 1024 * 1024:
+            f.write(block)
+            written += len(block)
+
+
+def run(name, func, path):
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    words = func(path)
+    seconds = time.perf_counter() - start
+    print(
+        f"  {name:<18} {words:>12} words  {seconds:7.2f} s  "
+        f"{size_mb / seconds:8.1f} MB/s  peak RSS +{peak_rss_mb() - rss_before:.0f} MB"
+    )
+
+
+def naive_count(path):
+    with open(path, encoding="utf-8") as f:
+        return len(f.read().split())
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    size_mb = int(args[0]) if args else 2048
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "words.txt")
+        print(f"Generating {size_mb} MB test file...")
+        make_file(path, size_mb)
+
+        print("Counting:")
+        run("count_file", lambda p: count_file(p)["words"], path)
+        run("count_file top_n=10", lambda p: count_file(p, top_n=10)["words"], path)
+        if "--naive" in sys.argv:
+            run("read + split", naive_count, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Fact Store - Persistent, indexed memory for remember_fact / recall_facts
+
+Instead of keeping every remembered fact in the chat history (which makes
+every prompt bigger), facts are appended to a JSONL file and indexed:
+
+- An inverted keyword index (token -> fact ids) answers recall queries by
+  scoring only the facts that share a word with the query (IDF weighted).
+- Optionally, with an embedding function, a vector index adds semantic
+  matches ("my pet" finds "I have a dog named Rex").
+
+The agent then recalls just the few relevant facts when it needs them.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "for", "from",
+    "has", "have", "i", "in", "is", "it", "its", "me", "my", "of", "on",
+    "or", "that", "the", "this", "to", "was", "what", "when", "where",
+    "which", "who", "with", "you", "your",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords"""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+class FactStore:
+    """
+    Append-only fact store with keyword and optional vector indexes
+
+    Args:
+        path: JSONL file the facts are persisted to
+        embedding_function: Optional callable(text) -> list[float], e.g.
+            GoogleGenerativeAIEmbeddings(...).embed_query
+    """
+
+    def __init__(self, path="facts.jsonl", embedding_function=None):
+        self.path = path
+        self.embedding_function = embedding_function
+        self.facts = []
+        self._index = defaultdict(set)
+        self._seen = {}
+        self._vectors = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._add_to_index(json.loads(line))
+
+    def _add_to_index(self, fact):
+        fact_id = len(self.facts)
+        self.facts.append(fact)
+        self._seen[" ".join(fact["text"].lower().split())] = fact_id
+        for token in set(tokenize(fact["text"])):
+            self._index[token].add(fact_id)
+        if fact.get("embedding"):
+            self._vectors[fact_id] = _normalize(fact["embedding"])
+
+    def add(self, text):
+        """
+        Store a fact (duplicates are ignored)
+
+        Returns:
+            True if the fact was new
+        """
+        text = text.strip()
+        normalized = " ".join(text.lower().split())
+
+        with self._lock:
+            if not text or normalized in self._seen:
+                return False
+
+            fact = {"text": text, "created": time.time()}
+            if self.embedding_function:
+                fact["embedding"] = list(self.embedding_function(text))
+
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(fact) + "\n")
+            self._add_to_index(fact)
+            return True
+
+    def search(self, query, k=5):
+        """
+        Find the facts most relevant to a query
+
+        Args:
+            query: Free text query
+            k: Maximum number of facts to return
+
+        Returns:
+            List of fact texts, best match first
+        """
+        # Embed outside the lock (a remote call); add() may run in parallel
+        query_vector = None
+        if self.embedding_function and self._vectors:
+            query_vector = _normalize(self.embedding_function(query))
+
+        scores = defaultdict(float)
+        with self._lock:
+            total = len(self.facts)
+
+            # Keyword matches, weighted by how rare the word is
+            for token in set(tokenize(query)):
+                ids = self._index.get(token)
+                if ids:
+                    idf = math.log(1 + total / len(ids))
+                    for fact_id in ids:
+                        scores[fact_id] += idf
+
+            # Optional semantic matches
+            if query_vector is not None:
+                best_keyword = max(scores.values(), default=1.0)
+                for fact_id, vector in self._vectors.items():
+                    similarity = sum(a * b for a, b in zip(query_vector, vector))
+                    if similarity > 0.5:
+                        scores[fact_id] += similarity * best_keyword
+
+            ranked = sorted(scores, key=lambda fact_id: (-scores[fact_id], -fact_id))
+            return [self.facts[fact_id]["text"] for fact_id in ranked[:k]]
+
+    def __len__(self):
+        return len(self.facts)
+
+
+def _normalize(vector):
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
@@ -0,0 +1,370 @@
+"""
+Safe Calculator - AST-whitelisted arithmetic for the calculate tool
+
+Replaces `eval(expression)`:
+- Only numbers, variables, + - * / // % **, unary +/- and a fixed set of
+  math functions/constants are allowed. Attribute access, subscripts,
+  lambdas, comprehensions, strings, etc. are rejected before anything runs.
+- Inputs that would hang or crash the process are rejected too: round()
+  digits, exponents, factorials and result sizes are bounded, and so is
+  the nesting depth of the expression.
+- Parsed and compiled expressions are kept in an LRU cache, so repeated
+  expressions skip parsing and validation.
+- evaluate_many() evaluates one expression over many variable bindings in a
+  single NumPy pass (falls back to a Python loop without NumPy).
+"""
+
+import ast
+import math
+import numbers
+from functools import lru_cache
+
+MAX_EXPRESSION_LENGTH = 500
+MAX_EXPONENT = 10_000
+MAX_FACTORIAL = 1_000
+MAX_ROUND_DIGITS = 100
+# Nesting levels; compiling and rewriting the tree recurse once per level
+MAX_DEPTH = 300
+# Integers up to ~4200 decimal digits: CPython refuses to turn longer ones
+# into a string (sys.set_int_max_str_digits, default 4300)
+MAX_RESULT_BITS = 14_000
+
+
+class CalculationError(ValueError):
+    """Raised for expressions that are invalid or not allowed"""
+
+
+def _safe_pow(base, exponent):
+    if isinstance(exponent, (int, float)) and abs(exponent) > MAX_EXPONENT:
+        raise CalculationError(f"Exponent too large (max {MAX_EXPONENT})")
+    if isinstance(base, int) and isinstance(exponent, int):
+        # Bound the size of the resulting integer, e.g. (10**5000)**5000
+        if base.bit_length() * abs(exponent) > MAX_RESULT_BITS:
+            raise CalculationError("Result too large")
+    return base**exponent
+
+
+def _safe_factorial(n):
+    if n > MAX_FACTORIAL:
+        raise CalculationError(f"Factorial argument too large (max {MAX_FACTORIAL})")
+    return math.factorial(n)
+
+
+def _check_round_digits(ndigits):
+    # round(5, -10**9) builds 10**(10**9) internally
+    if ndigits is not None and abs(ndigits) > MAX_ROUND_DIGITS:
+        raise CalculationError(f"round() digits too large (max {MAX_ROUND_DIGITS})")
+
+
+def _safe_round(number, ndigits=None):
+    _check_round_digits(ndigits)
+    return round(number) if ndigits is None else round(number, ndigits)
+
+
+def _check_variables(variables):
+    for name, value in variables.items():
+        # numbers.Number: int, float, complex (and NumPy scalars), not str
+        if isinstance(value, bool) or not isinstance(value, numbers.Number):
+            raise CalculationError(f"Variable {name} must be a number")
+
+
+def _check_result(result):
+    """Reject integer results too long to print (e.g. factorial(1000)**2)"""
+    if isinstance(result, int) and result.bit_length() > MAX_RESULT_BITS:
+        raise CalculationError("Result too large")
+    return result
+
+
+FUNCTIONS = {
+    "abs": abs,
+    "round": _safe_round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "log2": math.log2,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "sinh": math.sinh,
+    "cosh": math.cosh,
+    "tanh": math.tanh,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "hypot": math.hypot,
+    "factorial": _safe_factorial,
+    "radians": math.radians,
+    "degrees": math.degrees,
+}
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+)
+
+
+class _PowRewriter(ast.NodeTransformer):
+    """Rewrite `a ** b` into `_pow(a, b)` so huge exponents are rejected"""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.copy_location(
+                ast.Call(
+                    func=ast.Name(id="_pow", ctx=ast.Load()),
+                    args=[node.left, node.right],
+                    keywords=[],
+                ),
+                node,
+            )
+        return node
+
+
+class CompiledExpression:
+    """A validated expression compiled to Python bytecode"""
+
+    def __init__(self, source, code, variables, functions):
+        self.source = source
+        self.code = code
+        self.variables = variables
+        self.functions = functions
+
+    def evaluate(self, namespace):
+        return eval(self.code, {"__builtins__": {}}, namespace)
+
+
+def _validate(tree):
+    """Reject any node that is not plain arithmetic; return names used"""
+    variables = set()
+    functions = set()
+    called = set()
+
+    # Iterative depth check, before anything walks the tree recursively
+    stack = [(tree, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if depth > MAX_DEPTH:
+            raise CalculationError(f"Expression too deeply nested (max {MAX_DEPTH})")
+        stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+
+    # ast.walk visits a Call before its func Name
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise CalculationError(f"Unsupported syntax: {type(node).__name__}")
+
+        if isinstance(node, ast.Constant) and not (
+            isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+        ):
+            raise CalculationError(f"Only numbers are allowed, got {node.value!r}")
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+                raise CalculationError("Only the built-in math functions can be called")
+            if node.keywords:
+                raise CalculationError("Keyword arguments are not supported")
+            functions.add(node.func.id)
+            called.add(node.func)
+
+        if isinstance(node, ast.Name) and node.id in FUNCTIONS and node not in called:
+            raise CalculationError(f"Function {node.id} must be called")
+
+        if isinstance(node, ast.Name) and node.id not in FUNCTIONS:
+            if node.id.startswith("_"):
+                raise CalculationError(f"Invalid name: {node.id}")
+            if node.id not in CONSTANTS:
+                variables.add(node.id)
+
+    return frozenset(variables), frozenset(functions)
+
+
+@lru_cache(maxsize=256)
+def compile_expression(expression):
+    """
+    Parse, validate and compile an expression (cached)
+
+    Args:
+        expression: Arithmetic expression such as "15 * 8 + sqrt(x)"
+
+    Returns:
+        CompiledExpression
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise CalculationError(
+            f"Expression too long (max {MAX_EXPRESSION_LENGTH} characters)"
+        )
+
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise CalculationError(f"Invalid expression: {e.msg}") from None
+
+    variables, functions = _validate(tree)
+    try:
+        tree = ast.fix_missing_locations(_PowRewriter().visit(tree))
+        code = compile(tree, "<calculate>", "eval")
+    except (RecursionError, MemoryError):
+        raise CalculationError("Expression too complex") from None
+    return CompiledExpression(expression, code, variables, functions)
+
+
+_SCALAR_NAMESPACE = {**FUNCTIONS, **CONSTANTS, "_pow": _safe_pow}
+
+
+def evaluate(expression, variables=None):
+    """
+    Evaluate an arithmetic expression safely
+
+    Args:
+        expression: Expression string
+        variables: Optional mapping of variable name -> number
+
+    Returns:
+        The numeric result
+    """
+    compiled = compile_expression(expression)
+    variables = variables or {}
+    _check_variables(variables)
+
+    missing = compiled.variables - variables.keys()
+    if missing:
+        raise CalculationError(f"Unknown variable(s): {', '.join(sorted(missing))}")
+
+    try:
+        return _check_result(compiled.evaluate({**_SCALAR_NAMESPACE, **variables}))
+    except CalculationError:
+        raise
+    except (ArithmeticError, ValueError, TypeError) as e:
+        raise CalculationError(str(e)) from None
+    except (RecursionError, MemoryError):
+        raise CalculationError("Expression too complex") from None
+
+
+def _numpy_namespace(np):
+    # min/max/log/hypot take extra positional arguments like their scalar
+    # versions; passed to the ufuncs directly they would become `out=`
+    def minimum(*args):
+        return np.minimum.reduce(np.broadcast_arrays(*args))
+
+    def maximum(*args):
+        return np.maximum.reduce(np.broadcast_arrays(*args))
+
+    def log(x, base=None):
+        return np.log(x) if base is None else np.log(x) / np.log(base)
+
+    def hypot(*args):
+        return np.sqrt(sum(np.square(a) for a in args))
+
+    def round_(x, ndigits=None):
+        _check_round_digits(ndigits)
+        return np.round(x) if ndigits is None else np.round(x, ndigits)
+
+    return {
+        "abs": np.abs,
+        "round": round_,
+        "min": minimum,
+        "max": maximum,
+        "sqrt": np.sqrt,
+        "exp": np.exp,
+        "log": log,
+        "log10": np.log10,
+        "log2": np.log2,
+        "sin": np.sin,
+        "cos": np.cos,
+        "tan": np.tan,
+        "asin": np.arcsin,
+        "acos": np.arccos,
+        "atan": np.arctan,
+        "sinh": np.sinh,
+        "cosh": np.cosh,
+        "tanh": np.tanh,
+        "floor": np.floor,
+        "ceil": np.ceil,
+        "hypot": hypot,
+        "radians": np.radians,
+        "degrees": np.degrees,
+        "_pow": np.power,
+        **CONSTANTS,
+    }
+
+
+def evaluate_many(expression, bindings):
+    """
+    Evaluate one expression for many variable bindings
+
+    Args:
+        expression: Expression string, e.g. "price * qty * (1 + tax)"
+        bindings: Mapping of variable name -> list of values (all the same
+            length), e.g. {"price": [10, 20], "qty": [3, 1], "tax": [0.1, 0.1]}
+
+    Returns:
+        List of results, one per row
+    """
+    compiled = compile_expression(expression)
+
+    missing = compiled.variables - bindings.keys()
+    if missing:
+        raise CalculationError(f"Unknown variable(s): {', '.join(sorted(missing))}")
+
+    lengths = {len(values) for values in bindings.values()}
+    if len(lengths) > 1:
+        raise CalculationError("All variables must have the same number of values")
+    rows = lengths.pop() if lengths else 1
+    for name, values in bindings.items():
+        _check_variables({f"{name}[{i}]": v for i, v in enumerate(values)})
+
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    # factorial has no NumPy ufunc, so it always takes the Python path
+    if np is not None and "factorial" not in compiled.functions:
+        namespace = _numpy_namespace(np)
+        namespace.update(
+            {name: np.asarray(values, dtype=float) for name, values in bindings.items()}
+        )
+        try:
+            with np.errstate(all="ignore"):
+                result = compiled.evaluate(namespace)
+            return np.broadcast_to(result, (rows,)).tolist()
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise CalculationError(str(e)) from None
+        except (RecursionError, MemoryError):
+            raise CalculationError("Expression too complex") from None
+
+    # Python fallback: one scalar evaluation per row, still parsed only once
+    results = []
+    for i in range(rows):
+        row = {name: values[i] for name, values in bindings.items()}
+        try:
+            results.append(
+                _check_result(compiled.evaluate({**_SCALAR_NAMESPACE, **row}))
+            )
+        except CalculationError as e:
+            raise CalculationError(f"Row {i}: {e}") from None
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise CalculationError(f"Row {i}: {e}") from None
+        except (RecursionError, MemoryError):
+            raise CalculationError(f"Row {i}: Expression too complex") from None
+    return results
@@ -1,13 +1,25 @@
 import os
+import sys
+from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 from langchain.tools import tool
 from langgraph.prebuilt import create_react_agent
 
+from safe_calculator import CalculationError, evaluate, evaluate_many
+from text_stats import count_file, count_text, format_stats
+from tool_cache import cached_tool, print_cache_stats
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.llm_metrics import instrument, metrics_from_env
+from shared.parallel_tools import parallel_tool_node
+
 load_dotenv()
 
 
 # Define simple tools
 @tool
+@cached_tool(pure=False)  # result changes every call
 def get_current_time():
     """Get the current time and date"""
     from datetime import datetime
@@ -16,20 +28,48 @@ def get_current_time():
 
 
 @tool
-def calculate(expression: str):
-    """Calculate a mathematical expression"""
+@cached_tool(ttl=3600)
+def calculate(expression: str, variables: Optional[dict[str, list[float]]] = None):
+    """Calculate a mathematical expression, e.g. "15 * 8 + 3" or "sqrt(2) * pi".
+    Supports + - * / // % **, sqrt, log, exp, sin, cos, tan, abs, round, min, max, factorial.
+    To evaluate the same expression for many values in one call, use variable names in
+    the expression and pass variables, e.g. expression="price * qty",
+    variables={"price": [10, 20], "qty": [3, 1]}."""
     try:
-        result = eval(expression)
+        if variables:
+            results = evaluate_many(expression, variables)
+            return f"Results: {results}"
+        result = evaluate(expression)
         return f"Result: {result}"
-    except Exception as e:
+    except CalculationError as e:
         return f"Error calculating {expression}: {e}"
 
 
+def _file_version(text="", path=None, top_n=0):
+    """Size and mtime of the counted file, so edits invalidate cached counts"""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+    except OSError:
+        return None
+
+
 @tool
-def count_words(text: str):
-    """Count the number of words in a text"""
-    word_count = len(text.split())
-    return f"Word count: {word_count}"
+@cached_tool(ttl=3600, version=_file_version)
+def count_words(text: str = "", path: Optional[str] = None, top_n: int = 0):
+    """Count the words, lines, characters and bytes in a text.
+    For large documents pass a file path instead of the text; the file is streamed, not loaded.
+    Set top_n to also get the N most frequent words."""
+    try:
+        if path:
+            stats = count_file(path, top_n=top_n)
+        else:
+            stats = count_text(text, top_n=top_n)
+        return format_stats(stats)
+    except OSError as e:
+        return f"Error reading {path}: {e}"
 
 
 # Create agent with tools
@@ -38,11 +78,13 @@ def create_simple_agent():
 
     agent = create_react_agent(
         model="groq:llama-3.3-70b-versatile",
-        tools=tools,
+        # Several tool calls in one turn run concurrently, each with a timeout
+        tools=parallel_tool_node(tools, timeout=10),
         prompt="You are a helpful assistant with access to tools. Use the tools when needed to help users.",
     )
 
-    return agent
+    # Records tokens/latency per LLM call when LLM_METRICS_FILE is set
+    return instrument(agent)
 
 
 # Test the agent
@@ -73,3 +115,10 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Error: {e}")
         print("-" * 40)
+
+    print("Tool cache:")
+    print_cache_stats()
+
+    metrics = metrics_from_env()
+    if metrics:
+        metrics.print_summary()
@@ -0,0 +1,144 @@
+"""
+Text Stats - Constant-memory word counting for count_words
+
+len(text.split()) builds a list of every word, and large documents have to
+be pasted into the prompt to be counted at all. This module counts words,
+lines, characters and bytes in one pass over fixed-size chunks:
+
+- count_text() for inline text
+- count_file() for a file path, read chunk by chunk into one reused
+  buffer, so a multi-GB file never has to fit in memory
+
+Optionally it also returns the top-N most frequent words (memory then grows
+with the vocabulary, not with the file size).
+"""
+
+import codecs
+import os
+import string
+from collections import Counter
+
+CHUNK_SIZE = 1024 * 1024
+
+# A word running across chunks is kept (for word frequencies) up to this
+# many characters, so text without whitespace can't grow the carry-over
+MAX_WORD_CHARS = 1000
+
+# Punctuation becomes whitespace for word frequencies ("dog," counts as "dog")
+_PUNCTUATION = str.maketrans(string.punctuation, " " * len(string.punctuation))
+
+
+class _Counter:
+    """Accumulates stats over consecutive text chunks"""
+
+    def __init__(self, top_n):
+        self.top_n = top_n
+        self.words = 0
+        self.lines = 0
+        self.chars = 0
+        self.frequencies = Counter() if top_n else None
+        self._carry = None
+
+    def feed(self, text):
+        self.chars += len(text)
+        self.lines += text.count("\n")
+        if not text:
+            return
+
+        # str.split() splits on the same whitespace as str.isspace()
+        words = text.split()
+        if self._carry is not None:
+            if words and not text[0].isspace():
+                # The held-back word continues in this chunk
+                words[0] = (self._carry + words[0])[:MAX_WORD_CHARS]
+            else:
+                self._count([self._carry])
+            self._carry = None
+        # Hold back a word that may continue in the next chunk
+        if words and not text[-1].isspace():
+            self._carry = words.pop()[:MAX_WORD_CHARS]
+        self._count(words)
+
+    def finish(self):
+        if self._carry is not None:
+            self._count([self._carry])
+        self._carry = None
+
+    def _count(self, words):
+        if not words:
+            return
+        self.words += len(words)
+        if self.frequencies is not None:
+            text = " ".join(words)
+            self.frequencies.update(text.lower().translate(_PUNCTUATION).split())
+
+    def result(self, byte_count):
+        stats = {
+            "words": self.words,
+            "lines": self.lines,
+            "chars": self.chars,
+            "bytes": byte_count,
+        }
+        if self.frequencies is not None:
+            stats["top_words"] = self.frequencies.most_common(self.top_n)
+        return stats
+
+
+def count_text(text, top_n=0, chunk_size=CHUNK_SIZE):
+    """
+    Count words, lines, characters and bytes of a string
+
+    Args:
+        text: Text to count
+        top_n: Also return the N most frequent words (0 = skip)
+
+    Returns:
+        Dictionary with words, lines, chars, bytes (and top_words)
+    """
+    counter = _Counter(top_n)
+    for start in range(0, len(text), chunk_size):
+        counter.feed(text[start : start + chunk_size])
+    counter.finish()
+    return counter.result(len(text.encode("utf-8")))
+
+
+def count_file(path, top_n=0, chunk_size=CHUNK_SIZE):
+    """
+    Count words, lines, characters and bytes of a file in constant memory
+
+    Args:
+        path: Path to a UTF-8 text file
+        top_n: Also return the N most frequent words (0 = skip)
+
+    Returns:
+        Dictionary with words, lines, chars, bytes (and top_words)
+    """
+    counter = _Counter(top_n)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    size = 0
+
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            size += read
+            counter.feed(decoder.decode(view[:read]))
+        counter.feed(decoder.decode(b"", final=True))
+
+    counter.finish()
+    return counter.result(size)
+
+
+def format_stats(stats):
+    """Human readable summary for the tool response"""
+    text = (
+        f"Word count: {stats['words']}\n"
+        f"Lines: {stats['lines']}, characters: {stats['chars']}, bytes: {stats['bytes']}"
+    )
+    if stats.get("top_words"):
+        top = ", ".join(f"{word} ({count})" for word, count in stats["top_words"])
+        text += f"\nMost frequent words: {top}"
+    return text
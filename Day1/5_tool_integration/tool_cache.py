@@ -0,0 +1,137 @@
+"""
+Tool Cache - Argument-keyed result cache for deterministic tools
+
+Agents often call the same tool with the same arguments more than once in
+a session (count_words on the same text, calculate on the same
+expression). cached_tool memoises the result per argument set:
+
+- pure=True tools are cached; pure=False tools (get_current_time, tools
+  with side effects) always run but are still counted.
+- ttl limits how long a result stays valid; maxsize bounds the cache with
+  least-recently-used eviction.
+- Every hit dispatches a "tool_cache_hit" custom event with the latency
+  the original call took, so hits show up in LangSmith traces and
+  astream_events. cache_stats() reports hits, misses and saved time.
+
+Usage (below @tool so the tool schema still comes from the function):
+    @tool
+    @cached_tool(ttl=600)
+    def count_words(text: str): ...
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from langchain_core.callbacks.manager import dispatch_custom_event
+
+_stats = {}
+
+
+def _make_key(args, kwargs):
+    return json.dumps([args, kwargs], sort_keys=True, default=repr)
+
+
+def _report_hit(name, saved_seconds):
+    try:
+        dispatch_custom_event(
+            "tool_cache_hit",
+            {"tool": name, "saved_ms": round(saved_seconds * 1000, 2)},
+        )
+    except RuntimeError:
+        # Called outside a runnable (e.g. directly in a script): no trace to add to
+        pass
+
+
+def cached_tool(pure=True, ttl=None, maxsize=128, version=None):
+    """
+    Cache a tool function's results by its arguments
+
+    Args:
+        pure: Only pure (deterministic, side-effect free) tools are cached
+        ttl: Seconds a cached result stays valid (None = until evicted)
+        maxsize: Maximum number of cached argument sets (LRU eviction)
+        version: Optional callable(*args, **kwargs) whose result is added to
+            the key, e.g. a file's mtime so edits invalidate the entry
+    """
+
+    def decorator(func):
+        name = func.__name__
+        stats = _stats.setdefault(
+            name, {"pure": pure, "hits": 0, "misses": 0, "saved_seconds": 0.0}
+        )
+
+        if not pure:
+            @functools.wraps(func)
+            def passthrough(*args, **kwargs):
+                stats["misses"] += 1
+                return func(*args, **kwargs)
+
+            return passthrough
+
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            if version is not None:
+                key += _make_key(version(*args, **kwargs), None)
+            now = time.monotonic()
+
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and (entry[0] is None or entry[0] > now):
+                    cache.move_to_end(key)
+                    stats["hits"] += 1
+                    stats["saved_seconds"] += entry[2]
+                    hit = entry
+                else:
+                    hit = None
+                    if entry is not None:
+                        del cache[key]
+
+            if hit is not None:
+                _report_hit(name, hit[2])
+                return hit[1]
+
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            latency = time.perf_counter() - start
+
+            with lock:
+                stats["misses"] += 1
+                expires = now + ttl if ttl is not None else None
+                cache[key] = (expires, result, latency)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+
+            return result
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def cache_stats():
+    """Hits, misses and saved time per decorated tool"""
+    return {
+        name: {**stats, "saved_seconds": round(stats["saved_seconds"], 6)}
+        for name, stats in _stats.items()
+    }
+
+
+def print_cache_stats():
+    for name, stats in cache_stats().items():
+        if not stats["pure"]:
+            print(f"  {name}: not cached (impure), {stats['misses']} calls")
+            continue
+        calls = stats["hits"] + stats["misses"]
+        print(
+            f"  {name}: {stats['hits']}/{calls} cache hits, "
+            f"saved {stats['saved_seconds'] * 1000:.2f} ms"
+        )
@@ -1,14 +1,28 @@
 import os
+import sys
+from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 from langchain.tools import tool
 from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import InMemorySaver
 
+from fact_store import FactStore
+from safe_calculator import CalculationError, evaluate, evaluate_many
+from tool_cache import cached_tool, print_cache_stats
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.parallel_tools import parallel_tool_node
+
 load_dotenv()
 
+# Facts persist across runs and threads; only relevant ones are recalled
+facts = FactStore("facts.jsonl")
+
 
 # Define tools
 @tool
+@cached_tool(pure=False)  # result changes every call
 def get_current_time():
     """Get the current time and date"""
     from datetime import datetime
@@ -17,30 +31,52 @@ def get_current_time():
 
 
 @tool
-def calculate(expression: str):
-    """Calculate a mathematical expression"""
+@cached_tool(ttl=3600)
+def calculate(expression: str, variables: Optional[dict[str, list[float]]] = None):
+    """Calculate a mathematical expression, e.g. "15 * 8 + 3" or "sqrt(2) * pi".
+    Supports + - * / // % **, sqrt, log, exp, sin, cos, tan, abs, round, min, max, factorial.
+    To evaluate the same expression for many values in one call, use variable names in
+    the expression and pass variables, e.g. expression="price * qty",
+    variables={"price": [10, 20], "qty": [3, 1]}."""
     try:
-        result = eval(expression)
+        if variables:
+            results = evaluate_many(expression, variables)
+            return f"Results: {results}"
+        result = evaluate(expression)
         return f"Result: {result}"
-    except Exception as e:
+    except CalculationError as e:
         return f"Error calculating {expression}: {e}"
 
 
 @tool
+@cached_tool(pure=False)  # has to run every time it is asked to remember
 def remember_fact(fact: str):
     """Remember an important fact for later use"""
-    return f"I'll remember: {fact}"
+    if facts.add(fact):
+        return f"I'll remember: {fact}"
+    return f"I already know: {fact}"
+
+
+@tool
+@cached_tool(pure=False)  # results change as new facts are remembered
+def recall_facts(query: str):
+    """Recall previously remembered facts relevant to a query, such as the user's name or favourite food"""
+    relevant = facts.search(query, k=5)
+    if not relevant:
+        return "No relevant facts remembered."
+    return "Remembered facts:\n" + "\n".join(f"- {fact}" for fact in relevant)
 
 
 # Create agent with tools and memory
 def create_memory_agent():
-    tools = [get_current_time, calculate, remember_fact]
+    tools = [get_current_time, calculate, remember_fact, recall_facts]
     checkpointer = InMemorySaver()
 
     agent = create_react_agent(
         model="groq:llama-3.3-70b-versatile",
-        tools=tools,
-        prompt="You are a helpful assistant with tools and memory. Use tools when needed and remember important information from conversations.",
+        # Several tool calls in one turn run concurrently, each with a timeout
+        tools=parallel_tool_node(tools, timeout=10),
+        prompt="You are a helpful assistant with tools and memory. Use tools when needed. Save important information about the user with remember_fact, and use recall_facts to look it up instead of guessing.",
         checkpointer=checkpointer,
     )
 
@@ -53,9 +89,10 @@ def interactive_tools_demo():
     print("Tools with Memory Demo")
     print("=" * 50)
     print("Available tools:")
-    tools = [get_current_time, calculate, remember_fact]
+    tools = [get_current_time, calculate, remember_fact, recall_facts]
     for tool in tools:
         print(f"  - {tool.name}: {tool.description}")
+    print(f"Facts remembered so far: {len(facts)}")
     print()
     print("Type 'quit' to exit, 'new' for new conversation thread")
     print()
@@ -66,6 +103,8 @@ def interactive_tools_demo():
         user_input = input("You: ")
 
         if user_input.lower() in ["quit", "exit", "q"]:
+            print("Tool cache:")
+            print_cache_stats()
             print("Goodbye!")
             break
 
@@ -0,0 +1,109 @@
+"""
+Check: MCPSessionManager restarts a crashed stdio server transparently
+
+Opens a session to mcp-server/filesystem_mcp.py, makes one tool call,
+SIGKILLs the server process, then calls again. The second call must
+succeed after exactly one restart, on a new server process. Then it kills
+the server again and makes five calls at once: all must succeed after a
+single restart.
+
+Exits 1 if any check fails. Linux only (finds the child process in /proc).
+
+Run: python check_session_restart.py
+"""
+
+import asyncio
+import contextlib
+import os
+import signal
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.mcp_sessions import MCPSessionManager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SERVER = os.path.join(HERE, "mcp-server", "filesystem_mcp.py")
+
+
+def server_pids():
+    """PIDs of this process's children running the filesystem server"""
+    pids = []
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{name}/cmdline", "rb") as f:
+                command = f.read()
+        except (OSError, IndexError, ValueError):
+            continue
+        if parent == os.getpid() and b"filesystem_mcp.py" in command:
+            pids.append(int(name))
+    return pids
+
+
+def kill(pids):
+    for pid in pids:
+        os.kill(pid, signal.SIGKILL)
+        # The event loop's child watcher may reap it first
+        with contextlib.suppress(ChildProcessError):
+            os.waitpid(pid, 0)
+
+
+async def main():
+    failures = []
+
+    def check(name, ok):
+        print(f"  {'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server = {
+            "command": sys.executable,
+            "args": [SERVER],
+            "transport": "stdio",
+            "cwd": workdir,
+            # Same interpreter environment as this check (stdio_client
+            # otherwise passes only a minimal default environment)
+            "env": dict(os.environ),
+        }
+        manager = MCPSessionManager({"EducosysFileSystem": server}, cache_path=None)
+        session = manager.servers["EducosysFileSystem"]
+        try:
+            first = await session.call_tool("listDir", {"path": "."})
+            check("first call succeeds", not first.isError)
+            before = server_pids()
+            check("one server process running", len(before) == 1)
+
+            kill(before)
+            second = await session.call_tool("listDir", {"path": "."})
+            after = server_pids()
+            check("call after the crash succeeds", not second.isError)
+            check("exactly one restart", session.restarts == 1)
+            check("new server process", len(after) == 1 and after != before)
+
+            # Concurrent calls failing on the same crash restart it once
+            kill(after)
+            results = await asyncio.gather(
+                *(session.call_tool("listDir", {"path": "."}) for _ in range(5))
+            )
+            check(
+                "concurrent calls after a crash succeed",
+                not any(r.isError for r in results),
+            )
+            check("one restart for concurrent calls", session.restarts == 2)
+            check("one server process after it", len(server_pids()) == 1)
+        finally:
+            await manager.close()
+
+    if failures:
+        sys.exit(1)
+    print("Restart check passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,35 +1,49 @@
 import asyncio
 import os
-from turtle import delay
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.mcp_sessions import MCPSessionManager
+from shared.parallel_tools import parallel_tool_node
+
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
 
 async def run_agent():
-    client = MultiServerMCPClient(
-        {
-            "EducosysFileSystem": {
-                "command": "python",
-                "args": ["./mcp-server/filesystem_mcp.py"],
-                "transport": "stdio",
-            },
+    # Connect to a shared server if one is running
+    # (python mcp-server/filesystem_mcp.py --transport http), else spawn one
+    if os.getenv("FILESYSTEM_MCP_URL"):
+        server = {"url": os.getenv("FILESYSTEM_MCP_URL"), "transport": "streamable_http"}
+    else:
+        server = {
+            "command": "python",
+            "args": ["./mcp-server/filesystem_mcp.py"],
+            "transport": "stdio",
         }
-    )
 
-    tools = await client.get_tools()
+    # One warm server session for the whole run; tool schemas cached on disk
+    mcp_sessions = MCPSessionManager({"EducosysFileSystem": server})
+    try:
+        await run_with_tools(await mcp_sessions.get_tools())
+    finally:
+        await mcp_sessions.close()
+
+
+async def run_with_tools(tools):
     print(f"Found {len(tools)} total tools")
     print("\nAvailable tools:")
     for i, tool in enumerate(tools):
         print(f"   {i+1}. {tool.name}")
     agent = create_react_agent(
         model="groq:llama-3.1-8b-instant",
-        tools=tools,
-        prompt="You are a helpful AI assistant with access filesystem tools. IMPORTANT: Only use the tools that are actually available. For EducosysFileSystem operations, use addFile , addFolder, deleteFile to list directory contents. Always provide the full path when using RyukFileSystem tools.",
+        # MCP tool calls in one turn are awaited concurrently, each with a timeout
+        tools=parallel_tool_node(tools, timeout=15),
+        prompt="You are a helpful AI assistant with access filesystem tools. IMPORTANT: Only use the tools that are actually available. For EducosysFileSystem operations, use addFile , addFolder, deleteFile to list directory contents. When several files or folders need to be created or deleted, use batchOperations once instead of many single calls. To inspect files use listDir, grepFiles and readFile with line ranges rather than reading whole files. To see what changed in the workspace, call snapshot once and then diffSince with the returned token instead of listing everything again. Always provide the full path when using RyukFileSystem tools.",
     )
     file_response1 = await agent.ainvoke(
         {
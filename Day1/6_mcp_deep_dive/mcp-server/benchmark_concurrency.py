@@ -0,0 +1,119 @@
+"""
+Benchmark: concurrent tool calls against one shared filesystem_mcp.py
+
+Starts the server once, over streamable HTTP, in a temporary directory and
+has several clients fire create / read / delete calls at it, each keeping
+`concurrency` requests in flight. All clients talk to the same server
+process, and half of the files are shared between them, so calls from
+different clients contend for the same per-path locks. Reports requests
+per second and latency per configuration.
+
+Run: python benchmark_concurrency.py [requests_per_client]
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from benchmark_transports import free_port, wait_for_port
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filesystem_mcp.py")
+CLIENTS = [1, 4, 8]
+CONCURRENCY = [1, 8, 32]
+
+
+async def one_request(session, client_id, i, latencies):
+    # Every other request touches a file all clients share
+    name = f"shared_{i % 16}.txt" if i % 2 else f"client{client_id}_{i}.txt"
+    tool, args = [
+        ("addFile", {"filename": name}),
+        ("readFile", {"path": name}),
+        ("deleteFile", {"filename": name}),
+    ][i % 3]
+
+    start = time.perf_counter()
+    await session.call_tool(tool, args)
+    latencies.append(time.perf_counter() - start)
+
+
+async def run_client(url, client_id, requests, concurrency, latencies, ready, go):
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            ready.release()
+            await go.wait()
+
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def limited(i):
+                async with semaphore:
+                    await one_request(session, client_id, i, latencies)
+
+            await asyncio.gather(*(limited(i) for i in range(requests)))
+
+
+async def run(url, clients, concurrency, requests):
+    latencies = []
+    ready = asyncio.Semaphore(0)
+    go = asyncio.Event()
+    tasks = [
+        asyncio.create_task(
+            run_client(url, c, requests, concurrency, latencies, ready, go)
+        )
+        for c in range(clients)
+    ]
+
+    # Time only the calls, not connecting
+    for _ in range(clients):
+        await ready.acquire()
+    start = time.perf_counter()
+    go.set()
+    await asyncio.gather(*tasks)
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"  {clients:>2} clients x {concurrency:>2} in flight  "
+        f"{len(latencies) / seconds:8.0f} req/s  "
+        f"median {statistics.median(latencies) * 1000:6.2f} ms  "
+        f"p95 {p95 * 1000:6.2f} ms"
+    )
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    print(f"{requests} requests per client against one {os.path.basename(SERVER)}:")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        port = free_port()
+        command = [sys.executable, SERVER, "--transport", "http", "--port", str(port)]
+        # Each in-flight call is one HTTP request; keep all of them (plus each
+        # client's event stream) under the server's 503 limit
+        max_connections = max(CLIENTS) * (max(CONCURRENCY) + 2)
+        server = subprocess.Popen(
+            command + ["--max-connections", str(max_connections)],
+            cwd=workdir,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            await wait_for_port(port)
+            url = f"http://127.0.0.1:{port}/mcp"
+            for clients in CLIENTS:
+                for concurrency in CONCURRENCY:
+                    await run(url, clients, concurrency, requests)
+        finally:
+            # SIGTERM: graceful shutdown
+            server.terminate()
+            server.wait(timeout=15)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
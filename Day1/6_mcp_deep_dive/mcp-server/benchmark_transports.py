@@ -0,0 +1,149 @@
+"""
+Benchmark: one stdio server per client vs one shared HTTP server
+
+For N concurrent agent clients, measures:
+- connect time per client: spawn (stdio only) + MCP handshake + first
+  tool call
+- memory: total RSS of the server processes serving those clients
+  (N processes for stdio, one for streamable HTTP)
+
+Memory is read from /proc, so the RSS column is Linux only.
+
+Run: python benchmark_transports.py [max_clients]
+"""
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filesystem_mcp.py")
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def child_pids():
+    """PIDs of processes whose parent is this process (Linux)"""
+    pids = []
+    for name in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # Field 4 is the parent pid; the name in () may contain spaces
+                if int(f.read().rsplit(")", 1)[1].split()[1]) == os.getpid():
+                    pids.append(int(name))
+        except (OSError, IndexError, ValueError):
+            continue
+    return pids
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def client(connect, connected, done, times):
+    """Connect, call one tool, then stay connected until all clients are up"""
+    start = time.perf_counter()
+    async with connect() as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            await session.call_tool("listDir", {"path": "."})
+            times.append(time.perf_counter() - start)
+            connected.release()
+            await done.wait()
+
+
+async def measure(connect, clients, server_pids):
+    times = []
+    connected = asyncio.Semaphore(0)
+    done = asyncio.Event()
+    tasks = [
+        asyncio.create_task(client(connect, connected, done, times))
+        for _ in range(clients)
+    ]
+    for _ in range(clients):
+        await connected.acquire()
+
+    memory = sum(rss_mb(pid) for pid in server_pids())
+    done.set()
+    await asyncio.gather(*tasks)
+    return statistics.mean(times), max(times), memory
+
+
+async def wait_for_port(port, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise TimeoutError(f"HTTP server did not start on port {port}")
+
+
+def report(name, clients, result):
+    mean, worst, memory = result
+    print(
+        f"  {name:<6} {clients:>3} clients  connect avg {mean * 1000:7.0f} ms  "
+        f"max {worst * 1000:7.0f} ms  server RSS {memory:7.1f} MB"
+    )
+
+
+async def main():
+    max_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    levels = [n for n in (1, 5, 10, 20, 50) if n <= max_clients]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        params = StdioServerParameters(command=sys.executable, args=[SERVER], cwd=workdir)
+        print("stdio: one server process per client")
+        for clients in levels:
+            result = await measure(lambda: stdio_client(params), clients, child_pids)
+            report("stdio", clients, result)
+
+        port = free_port()
+        command = [sys.executable, SERVER, "--transport", "http", "--port", str(port)]
+        server = subprocess.Popen(
+            command + ["--max-connections", str(max_clients * 4)],
+            cwd=workdir,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            start = time.perf_counter()
+            await wait_for_port(port)
+            startup_ms = (time.perf_counter() - start) * 1000
+            print(f"\nhttp: one shared server (started once, in {startup_ms:.0f} ms)")
+            url = f"http://127.0.0.1:{port}/mcp"
+            for clients in levels:
+                result = await measure(
+                    lambda: streamablehttp_client(url), clients, lambda: [server.pid]
+                )
+                report("http", clients, result)
+        finally:
+            # SIGTERM: graceful shutdown
+            server.terminate()
+            server.wait(timeout=15)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
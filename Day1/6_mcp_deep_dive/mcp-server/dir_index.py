@@ -0,0 +1,274 @@
+"""
+Directory Index - In-memory file tree kept current by watching for changes
+
+Agents in a large workspace keep re-listing the tree to find out what
+changed. DirectoryIndex scans the tree once (path, type, size, mtime of
+every entry) and then keeps it current:
+
+- with watchdog installed (inotify on Linux, FSEvents on macOS), from
+  file system events
+- otherwise by polling mtimes in a background thread
+
+Every change gets a version number. A token names a version, so
+diff_since(token) returns only the entries changed after it: O(changes)
+instead of O(tree) for the agent. Tokens also carry an id of the index
+instance, so a token from before a server restart (or older than the
+retained change log) asks the caller to take a new snapshot.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+logger = logging.getLogger("EducosysFileSystem")
+
+
+class DirectoryIndex:
+    """
+    Index of every file and directory under `root`
+
+    Args:
+        root: Directory to index
+        skip_dirs: Directory names not descended into (.git, node_modules...)
+        poll_interval: Seconds between mtime scans when watchdog is missing
+        max_changes: Changes kept for diff_since; older tokens need a snapshot
+    """
+
+    def __init__(self, root, skip_dirs=(), poll_interval=2.0, max_changes=10000):
+        self.root = os.path.abspath(root)
+        self.skip_dirs = set(skip_dirs)
+        self.poll_interval = poll_interval
+        self.max_changes = max_changes
+        self.entries = {}
+        self.version = 0
+        self.watching = None
+        self._id = uuid.uuid4().hex[:8]
+        self._changes = deque()
+        self._sorted = None
+        self._lock = threading.RLock()
+        self._started = False
+        self._stop = threading.Event()
+
+    # --- building and watching --------------------------------------------
+
+    def start(self):
+        """Build the index and start watching (only the first call does work)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self.entries = self._scan(self.root)
+            self._sorted = None
+
+        if Observer is not None:
+            observer = Observer()
+            observer.schedule(_EventHandler(self), self.root, recursive=True)
+            observer.daemon = True
+            observer.start()
+            self.watching = "events"
+        else:
+            thread = threading.Thread(target=self._poll, daemon=True)
+            thread.start()
+            self.watching = "polling"
+        logger.info(
+            f"Indexed {len(self.entries)} entries under {self.root} ({self.watching})"
+        )
+
+    def stop(self):
+        self._stop.set()
+
+    def _relpath(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+
+    def _skipped(self, relpath):
+        return any(part in self.skip_dirs for part in relpath.split("/"))
+
+    def _scan(self, directory):
+        """{relpath: (type, size, mtime_ns)} for everything under directory"""
+        entries = {}
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                            stat = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if is_dir and entry.name in self.skip_dirs:
+                            continue
+                        relpath = self._relpath(entry.path)
+                        if is_dir:
+                            entries[relpath] = ("dir", None, stat.st_mtime_ns)
+                            stack.append(entry.path)
+                        else:
+                            entries[relpath] = ("file", stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+        return entries
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            current = self._scan(self.root)
+            with self._lock:
+                for relpath, info in current.items():
+                    if self.entries.get(relpath) != info:
+                        self._set(relpath, info)
+                for relpath in [p for p in self.entries if p not in current]:
+                    self._set(relpath, None)
+
+    def refresh(self, path):
+        """
+        Re-stat one path (and its subtree) right away
+
+        Called by the server's own write tools so a diff reflects their
+        changes immediately, and by the watchdog event handler.
+        """
+        if not self._started:
+            return
+        relpath = self._relpath(path)
+        if relpath == "." or relpath.startswith("..") or self._skipped(relpath):
+            return
+
+        absolute = os.path.join(self.root, relpath)
+        try:
+            stat = os.stat(absolute, follow_symlinks=False)
+        except OSError:
+            stat = None
+
+        is_dir = stat is not None and os.path.isdir(absolute)
+        current = self._scan(absolute) if is_dir else {}
+        if stat is not None:
+            size = None if is_dir else stat.st_size
+            current[relpath] = ("dir" if is_dir else "file", size, stat.st_mtime_ns)
+
+        prefix = relpath + "/"
+        with self._lock:
+            gone = [
+                p
+                for p in self.entries
+                if (p == relpath or p.startswith(prefix)) and p not in current
+            ]
+            for p in gone:
+                self._set(p, None)
+            for p, info in current.items():
+                self._set(p, info)
+
+    def _set(self, relpath, info):
+        """Apply one change (info None = deleted) and log it; holds the lock"""
+        if info is None:
+            if self.entries.pop(relpath, None) is None:
+                return
+        elif self.entries.get(relpath) == info:
+            return
+        else:
+            self.entries[relpath] = info
+
+        self.version += 1
+        self._sorted = None
+        self._changes.append((self.version, relpath))
+        while len(self._changes) > self.max_changes:
+            self._changes.popleft()
+
+    # --- queries -----------------------------------------------------------
+
+    def token(self):
+        return f"{self._id}:{self.version}"
+
+    def _entry(self, relpath):
+        info = self.entries.get(relpath)
+        if info is None:
+            return {"path": relpath, "change": "deleted"}
+        kind, size, mtime_ns = info
+        return {"path": relpath, "type": kind, "size": size, "mtime": mtime_ns / 1e9}
+
+    def snapshot(self, prefix="", offset=0, limit=500):
+        """
+        Entries under `prefix`, sorted by path, one page at a time
+
+        Returns:
+            Dictionary with entries, total, next_offset and a token for
+            diff_since
+        """
+        self.start()
+        # "src", "./src", "src/" and an absolute path all name the same folder
+        prefix = self._relpath(prefix) if prefix else "."
+        prefix = "" if prefix == "." else prefix + "/"
+
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self.entries)
+            paths = self._sorted
+            if prefix:
+                paths = [p for p in paths if p.startswith(prefix)]
+            page = [self._entry(p) for p in paths[offset : offset + limit]]
+            token = self.token()
+
+        next_offset = offset + limit if offset + limit < len(paths) else None
+        return {
+            "entries": page,
+            "total": len(paths),
+            "next_offset": next_offset,
+            "token": token,
+        }
+
+    def diff_since(self, token, limit=500):
+        """
+        Entries added, modified or deleted since `token`
+
+        Returns:
+            Dictionary with changes (current state of each changed path;
+            deleted paths have change="deleted") and a new token, or
+            reset=True when the token is unknown/too old and a new snapshot
+            is needed
+        """
+        self.start()
+        index_id, _, version = (token or "").partition(":")
+
+        with self._lock:
+            # Changes after `since` must all still be in the log
+            oldest = self._changes[0][0] if self._changes else self.version + 1
+            since = int(version) if version.isdigit() else -1
+            if index_id != self._id or not oldest - 1 <= since <= self.version:
+                return {"reset": True, "changes": [], "token": self.token()}
+
+            changed = {}
+            for change_version, relpath in reversed(self._changes):
+                if change_version <= since:
+                    break
+                changed.setdefault(relpath, change_version)
+
+            if len(changed) > limit:
+                return {
+                    "reset": True,
+                    "changes": [],
+                    "token": self.token(),
+                    "reason": f"{len(changed)} changes, more than limit={limit}",
+                }
+            changes = [self._entry(p) for p in sorted(changed)]
+            return {"reset": False, "changes": changes, "token": self.token()}
+
+
+if Observer is not None:
+
+    class _EventHandler(FileSystemEventHandler):
+        def __init__(self, index):
+            self.index = index
+
+        def on_any_event(self, event):
+            if event.event_type in ("opened", "closed", "closed_no_write"):
+                return
+            self.index.refresh(event.src_path)
+            dest = getattr(event, "dest_path", "")
+            if dest:
+                self.index.refresh(dest)
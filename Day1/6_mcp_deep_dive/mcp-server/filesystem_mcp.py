@@ -1,40 +1,528 @@
+import argparse
+import asyncio
+import contextlib
+import fnmatch
+import itertools
+import logging
+import mmap
 import os
-from mcp.server.fastmcp import FastMCP
+import re
+import sys
+import tempfile
+import weakref
+from typing import Literal, Optional
+
+import uvicorn
+from dir_index import DirectoryIndex
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import BaseModel
 
 
 mcp = FastMCP("EducosysFileSystem")
 
+# stdout is the stdio transport channel: anything printed there corrupts it
+logging.basicConfig(
+    stream=sys.stderr,
+    level=logging.INFO,
+    format="%(asctime)s %(name)s %(levelname)s %(message)s",
+)
+logger = logging.getLogger("EducosysFileSystem")
 
-@mcp.tool()
-def addFile(filename: str):
-    """Create a new file in current directory"""
+# Upper bounds so one tool result never floods the model context
+MAX_READ_BYTES = 64 * 1024
+MAX_LIST_ENTRIES = 500
+MAX_GREP_RESULTS = 500
+MAX_LINE_LENGTH = 300
+# grepFiles searches only the start of longer lines (minified files, logs)
+MAX_GREP_LINE_BYTES = 64 * 1024
+SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv"}
+
+# Built on the first snapshot/diffSince call, then kept current
+_index = DirectoryIndex(".", SKIP_DIRS)
+
+
+# One lock per absolute path, created on demand and dropped once unused.
+# Tools run concurrently on the event loop; the lock stops e.g. a create
+# and a delete of the same file from interleaving in the thread pool.
+_path_locks = weakref.WeakValueDictionary()
+
+
+def _path_key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+@contextlib.asynccontextmanager
+async def _locked(*paths):
+    """Hold the locks of all given paths, always acquired in sorted order"""
+    async with contextlib.AsyncExitStack() as stack:
+        for key in sorted({_path_key(p) for p in paths}):
+            lock = _path_locks.get(key)
+            if lock is None:
+                lock = _path_locks[key] = asyncio.Lock()
+            await stack.enter_async_context(lock)
+        yield
+
+
+async def _log(ctx, message):
+    """Log to stderr and to the client over the MCP logging channel"""
+    logger.info(message)
+    if ctx is not None:
+        await ctx.info(message)
+
+
+def _add_file(filename):
     if not os.path.exists(filename):
         with open(filename, "w") as f:
             pass
-        print(f"File '{filename}' created.")
-    else:
-        print(f"File '{filename}' already exists.")
+        return f"File '{filename}' created."
+    return f"File '{filename}' already exists."
 
 
-@mcp.tool()
-def addFolder(directory_name: str):
-    """Create a new Directory in current directory"""
+def _add_folder(directory_name):
     if not os.path.exists(directory_name):
         os.mkdir(directory_name)
-        print(f"Directory '{directory_name}' created.")
-    else:
-        print(f"Directory '{directory_name}' already exists.")
+        return f"Directory '{directory_name}' created."
+    return f"Directory '{directory_name}' already exists."
 
 
-@mcp.tool()
-def deleteFile(filename: str):
-    """Delete a file in current directory"""
+def _delete_file(filename):
     if os.path.exists(filename):
         os.remove(filename)
-        print(f"File '{filename}' deleted.")
+        return f"File '{filename}' deleted."
+    return f"File '{filename}' does not exist."
+
+
+def _write(func, *args, paths):
+    """Run a write, then update the index for its paths (in the worker thread)"""
+    try:
+        return func(*args)
+    finally:
+        for path in paths:
+            _index.refresh(path)
+
+
+@mcp.tool()
+async def addFile(filename: str, ctx: Context):
+    """Create a new file in current directory"""
+    async with _locked(filename):
+        message = await asyncio.to_thread(_write, _add_file, filename, paths=[filename])
+    await _log(ctx, message)
+    return message
+
+
+@mcp.tool()
+async def addFolder(directory_name: str, ctx: Context):
+    """Create a new Directory in current directory"""
+    async with _locked(directory_name):
+        message = await asyncio.to_thread(
+            _write, _add_folder, directory_name, paths=[directory_name]
+        )
+    await _log(ctx, message)
+    return message
+
+
+@mcp.tool()
+async def deleteFile(filename: str, ctx: Context):
+    """Delete a file in current directory"""
+    async with _locked(filename):
+        message = await asyncio.to_thread(
+            _write, _delete_file, filename, paths=[filename]
+        )
+    await _log(ctx, message)
+    return message
+
+
+class FileOperation(BaseModel):
+    """One step of a batch: create a file, make a directory or delete a path"""
+
+    op: Literal["createFile", "mkdir", "delete"]
+    path: str
+    content: str = ""
+
+
+def _apply(operation, undo, keep_backup):
+    """Run one operation; record how to reverse it in `undo`"""
+    path = operation.path
+
+    if operation.op == "createFile":
+        parent = os.path.dirname(path)
+        if parent and not os.path.isdir(parent):
+            raise FileNotFoundError(f"Directory '{parent}' does not exist")
+        with open(path, "x") as f:
+            f.write(operation.content)
+        undo.append(("remove_file", path))
+        return f"File '{path}' created."
+
+    if operation.op == "mkdir":
+        os.mkdir(path)
+        undo.append(("remove_dir", path))
+        return f"Directory '{path}' created."
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"'{path}' does not exist")
+    if os.path.isdir(path) and os.listdir(path):
+        raise OSError(f"Directory '{path}' is not empty")
+
+    if keep_backup:
+        # Move into a new, uniquely named directory next to the original
+        # (same filesystem, so it's instant, and nothing existing can be
+        # overwritten) until the transaction commits
+        parent, name = os.path.split(os.path.normpath(path))
+        holder = tempfile.mkdtemp(prefix=f".{name}.batch-", dir=parent or ".")
+        backup = os.path.join(holder, name)
+        os.rename(path, backup)
+        undo.append(("restore", path, backup))
+    elif os.path.isdir(path):
+        os.rmdir(path)
     else:
-        print(f"File '{filename}' does not exist.")
+        os.remove(path)
+    return f"'{path}' deleted."
+
+
+def _rollback(undo):
+    for step in reversed(undo):
+        if step[0] == "remove_file":
+            os.remove(step[1])
+        elif step[0] == "remove_dir":
+            os.rmdir(step[1])
+        else:
+            os.rename(step[2], step[1])
+            os.rmdir(os.path.dirname(step[2]))
+
+
+def _discard_backups(undo):
+    for step in undo:
+        if step[0] == "restore":
+            if os.path.isdir(step[2]):
+                os.rmdir(step[2])
+            else:
+                os.remove(step[2])
+            os.rmdir(os.path.dirname(step[2]))
+
+
+def _result(index, operation, ok, message):
+    return {
+        "index": index,
+        "op": operation.op,
+        "path": operation.path,
+        "ok": ok,
+        "message": message,
+    }
+
+
+def _run_batch(operations, transactional):
+    results = []
+    undo = []
+
+    for i, operation in enumerate(operations):
+        try:
+            message = _apply(operation, undo, keep_backup=transactional)
+            results.append(_result(i, operation, True, message))
+        except OSError as e:
+            results.append(_result(i, operation, False, str(e)))
+            if transactional:
+                _rollback(undo)
+                return {
+                    "committed": False,
+                    "failed_index": i,
+                    "rolled_back": len(undo),
+                    "results": results,
+                }
+
+    if transactional:
+        _discard_backups(undo)
+
+    succeeded = sum(r["ok"] for r in results)
+    return {
+        "committed": True,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
+
+
+@mcp.tool()
+async def batchOperations(
+    operations: list[FileOperation], ctx: Context, transactional: bool = False
+):
+    """Run many file operations in one call, in order. Each operation is
+    {"op": "createFile" | "mkdir" | "delete", "path": "...", "content": "..."}
+    (content only for createFile). Use this instead of many single calls,
+    e.g. to create a whole project skeleton. With transactional=true, the
+    first failure undoes every operation already done and stops."""
+    async with _locked(*(operation.path for operation in operations)):
+        result = await asyncio.to_thread(
+            _write,
+            _run_batch,
+            operations,
+            transactional,
+            paths=[operation.path for operation in operations],
+        )
+
+    if result["committed"]:
+        summary = f"Batch: {result['succeeded']} succeeded, {result['failed']} failed."
+    else:
+        summary = (
+            f"Batch failed at operation {result['failed_index']}, "
+            f"{result['rolled_back']} rolled back."
+        )
+    await _log(ctx, summary)
+    return result
+
+
+def _read_bytes(mm, size, offset, length):
+    end = min(size, offset + length)
+    return mm[offset:end], end
+
+
+def _read_lines(mm, size, start_line, end_line, max_bytes):
+    """Slice lines start_line..end_line (1-based, inclusive) out of the map"""
+    position = 0
+    for _ in range(start_line - 1):
+        position = mm.find(b"\n", position) + 1
+        if position == 0:
+            return b"", size, start_line
+
+    end = position
+    line = start_line
+    while end < size and (end_line is None or line <= end_line):
+        newline = mm.find(b"\n", end)
+        next_end = size if newline == -1 else newline + 1
+        if next_end - position > max_bytes:
+            break
+        end = next_end
+        line += 1
+
+    if end == position and end < size:
+        # A single line longer than max_bytes: return its first part only
+        end = min(size, position + max_bytes)
+    return mm[position:end], end, line
+
+
+def _read_file(path, start_line, end_line, offset, length):
+    size = os.path.getsize(path)
+    length = max(0, min(length, MAX_READ_BYTES))
+    result = {"path": path, "size": size}
+
+    if start_line is not None and end_line is not None and end_line < start_line:
+        raise ValueError(f"end_line ({end_line}) is before start_line ({start_line})")
+    if size == 0:
+        return {**result, "content": "", "eof": True}
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if start_line is not None:
+            data, end, next_line = _read_lines(
+                mm, size, max(1, start_line), end_line, MAX_READ_BYTES
+            )
+            result.update(start_line=start_line, next_line=next_line, next_offset=end)
+        else:
+            offset = max(0, offset)
+            data, end = _read_bytes(mm, size, offset, length)
+            result.update(offset=offset, next_offset=end)
+
+    result["content"] = data.decode("utf-8", errors="replace")
+    result["eof"] = end >= size
+    return result
+
+
+@mcp.tool()
+async def readFile(
+    path: str,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    offset: int = 0,
+    length: int = MAX_READ_BYTES,
+):
+    """Read part of a file without loading all of it. Use start_line/end_line
+    (1-based, inclusive) for a line range, or offset/length for a byte range.
+    At most 64 KB is returned per call; use next_line / next_offset from the
+    result to continue reading (next_offset also works inside a very long line)."""
+    async with _locked(path):
+        return await asyncio.to_thread(
+            _read_file, path, start_line, end_line, offset, length
+        )
+
+
+def _list_dir(path, offset, limit):
+    offset = max(0, offset)
+    limit = max(1, min(limit, MAX_LIST_ENTRIES))
+    entries = []
+
+    with os.scandir(path) as it:
+        # Fetch one extra entry to know whether another page exists
+        for entry in itertools.islice(it, offset, offset + limit + 1):
+            if len(entries) == limit:
+                return {"path": path, "entries": entries, "next_offset": offset + limit}
+            is_dir = entry.is_dir()
+            size = None
+            if not is_dir:
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    pass  # e.g. a dangling symlink: listed without a size
+            entries.append(
+                {"name": entry.name, "type": "dir" if is_dir else "file", "size": size}
+            )
+
+    return {"path": path, "entries": entries, "next_offset": None}
+
+
+@mcp.tool()
+async def listDir(path: str = ".", offset: int = 0, limit: int = 100):
+    """List a directory page by page: name, type and size of each entry.
+    Returns at most `limit` entries (max 500) starting at `offset`; if
+    next_offset is set, call again with it to get the next page."""
+    return await asyncio.to_thread(_list_dir, path, offset, limit)
+
+
+def _walk_files(root, file_glob):
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for filename in sorted(filenames):
+            if fnmatch.fnmatch(filename, file_glob):
+                yield os.path.join(directory, filename)
+
+
+def _grep_file(file_path, matcher):
+    """
+    Yield (line_number, line) for matching lines, reading line by line
+
+    At most MAX_GREP_LINE_BYTES of a line are read and searched; the rest of
+    a longer line is skipped, so a file without newlines is never loaded
+    whole.
+    """
+    with open(file_path, "rb") as f:
+        if b"\0" in f.read(8192):
+            return  # binary file
+        f.seek(0)
+        number = 0
+        while True:
+            raw = f.readline(MAX_GREP_LINE_BYTES)
+            if not raw:
+                return
+            number += 1
+            if not raw.endswith(b"\n"):
+                rest = raw
+                while rest and not rest.endswith(b"\n"):
+                    rest = f.readline(MAX_GREP_LINE_BYTES)
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if matcher(line):
+                yield number, line
+
+
+def _grep_files(pattern, path, file_glob, regex, ignore_case, max_results):
+    max_results = max(1, min(max_results, MAX_GREP_RESULTS))
+    flags = re.IGNORECASE if ignore_case else 0
+    compiled = re.compile(pattern if regex else re.escape(pattern), flags)
+
+    matches = []
+    files_searched = 0
+    for file_path in _walk_files(path, file_glob):
+        files_searched += 1
+        try:
+            for number, line in _grep_file(file_path, compiled.search):
+                matches.append(
+                    {"file": file_path, "line": number, "text": line[:MAX_LINE_LENGTH]}
+                )
+                if len(matches) >= max_results:
+                    return {
+                        "matches": matches,
+                        "files_searched": files_searched,
+                        "truncated": True,
+                    }
+        except OSError:
+            continue
+
+    return {"matches": matches, "files_searched": files_searched, "truncated": False}
+
+
+@mcp.tool()
+async def grepFiles(
+    pattern: str,
+    path: str = ".",
+    file_glob: str = "*",
+    regex: bool = False,
+    ignore_case: bool = False,
+    max_results: int = 100,
+):
+    """Search file contents under a directory. Returns matching lines as
+    file, line number and text (long lines are shortened), stopping after
+    max_results matches (max 500). Only the first 64 KB of a line are
+    searched. Skips binary files and folders like
+    .git and node_modules. Use file_glob (e.g. "*.py") to narrow the search."""
+    return await asyncio.to_thread(
+        _grep_files, pattern, path, file_glob, regex, ignore_case, max_results
+    )
+
+
+@mcp.tool()
+async def snapshot(path: str = ".", offset: int = 0, limit: int = 500):
+    """Index of everything under a folder (path, type, size, mtime), sorted by
+    path, page by page (at most 500 entries; continue with next_offset). Also
+    returns a token: later, call diffSince(token) to get only what changed
+    instead of listing the whole tree again."""
+    limit = max(1, min(limit, MAX_LIST_ENTRIES))
+    return await asyncio.to_thread(_index.snapshot, path, max(0, offset), limit)
+
+
+@mcp.tool()
+async def diffSince(token: str, limit: int = 500):
+    """Files and folders added, modified or deleted since `token` (from
+    snapshot or a previous diffSince), plus a new token. Deleted paths have
+    change="deleted". If reset is true, the token is too old (or the server
+    restarted): call snapshot again."""
+    limit = max(1, min(limit, MAX_LIST_ENTRIES))
+    return await asyncio.to_thread(_index.diff_since, token, limit)
+
+
+def serve_http(transport, host, port, max_connections, shutdown_timeout):
+    """
+    Serve every client from this one process over streamable HTTP or SSE
+
+    Past max_connections, new connections get 503 instead of piling up.
+    On Ctrl+C / SIGTERM the server stops accepting connections and gives
+    in-flight calls up to shutdown_timeout seconds to finish.
+    """
+    app = mcp.streamable_http_app() if transport == "http" else mcp.sse_app()
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        limit_concurrency=max_connections,
+        timeout_graceful_shutdown=shutdown_timeout,
+        log_level="warning",
+    )
+    path = mcp.settings.streamable_http_path if transport == "http" else "/sse"
+    logger.info(f"Serving {transport} on http://{host}:{port}{path}")
+    try:
+        uvicorn.Server(config).run()
+    finally:
+        _index.stop()
+        logger.info("Server stopped")
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    parser = argparse.ArgumentParser(description="EducosysFileSystem MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http", "sse"],
+        default="stdio",
+        help="stdio: one server per client process (default); http/sse: one "
+        "long-lived server on localhost for many clients",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--shutdown-timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.transport == "stdio":
+        mcp.run(transport="stdio")
+    else:
+        serve_http(
+            args.transport,
+            args.host,
+            args.port,
+            args.max_connections,
+            args.shutdown_timeout,
+        )
@@ -0,0 +1,108 @@
+"""
+Benchmark: GitHub MCP calls with and without GitHubToolCache, offline
+
+Runs a scripted agent workload (the same README read and repository search
+over and over, one file write, then more reads) against fake_github_mcp.py
+and counts how many requests would have reached the GitHub API:
+
+- no cache: every tool call is an API request
+- cache, fresh_for=0: every repeated read is revalidated; unchanged files
+  come back as 304, which GitHub does not count against the rate limit
+- cache, default: repeated reads within fresh_for are served locally
+
+It also checks that a read after create_or_update_file sees the new content.
+
+Run: python benchmark_github_cache.py [rounds]
+"""
+
+import asyncio
+import base64
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fake_github_mcp import FakeRevalidator, load_state
+from github_cache import GitHubToolCache
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.mcp_sessions import MCPSessionManager
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_github_mcp.py")
+OWNER, REPO = "goyalsunil452", "DSA-Questions"
+
+
+async def workload(tools, rounds):
+    read = {"owner": OWNER, "repo": REPO, "path": "README.md"}
+    for _ in range(rounds):
+        await tools["get_file_contents"].ainvoke(read)
+        await tools["search_repositories"].ainvoke({"query": "python machine learning"})
+        await tools["get_file_contents"].ainvoke({**read, "path": "arrays/two_sum.py"})
+
+    await tools["create_or_update_file"].ainvoke(
+        {
+            **read,
+            "content": "# DSA Questions\n\nUpdated.\n",
+            "message": "Update README",
+            "branch": "main",
+        }
+    )
+
+    for _ in range(rounds):
+        result = await tools["get_file_contents"].ainvoke(read)
+
+    text = result if isinstance(result, str) else result[0]["text"]
+    content = base64.b64decode(json.loads(text)["content"]).decode("utf-8")
+    assert content.endswith("Updated.\n"), "stale README served after the write"
+
+
+async def run(name, rounds, make_cache):
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = os.path.join(tmp, "state.json")
+        sessions = MCPSessionManager(
+            {
+                "github": {
+                    "command": sys.executable,
+                    "args": [SERVER],
+                    "env": {"FAKE_GITHUB_STATE": state_path},
+                    "transport": "stdio",
+                }
+            },
+            cache_path=None,
+        )
+        try:
+            tools = await sessions.get_tools()
+            cache = make_cache(FakeRevalidator(state_path))
+            if cache is not None:
+                tools = cache.wrap(tools)
+
+            start = time.perf_counter()
+            await workload({t.name: t for t in tools}, rounds)
+            seconds = time.perf_counter() - start
+        finally:
+            await sessions.close()
+
+        api_calls = load_state(state_path)["api_calls"]
+
+    print(f"  {name:<22} {api_calls:>4} GitHub API requests  {seconds * 1000:8.1f} ms")
+    if cache is not None:
+        print("   ", end="")
+        cache.print_stats()
+
+
+async def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"{rounds} rounds of README read + search + file read, one write, {rounds} more reads:")
+    await run("no cache", rounds, lambda revalidator: None)
+    await run(
+        "cache, fresh_for=0",
+        rounds,
+        lambda revalidator: GitHubToolCache(revalidator, fresh_for=0),
+    )
+    await run("cache, default", rounds, lambda revalidator: GitHubToolCache(revalidator))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+"""
+Benchmark: binding all GitHub tools vs the ToolRouter's top-k per request
+
+Loads the GitHub MCP tools (from the schema cache when warm, so nothing is
+spawned) and runs a set of labelled requests through ToolRouter. For each
+request it reports how many tool-schema tokens are sent with all tools vs
+with the selected ones, whether the expected tool was selected, and the
+routing time.
+
+With --live it also makes one model call per request with each tool set and
+reports the prompt tokens the provider counted and the call latency.
+
+Run: python benchmark_tool_router.py [k] [--live]
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from langchain.chat_models import init_chat_model
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.mcp_sessions import MCPSessionManager
+from shared.tool_router import ToolRouter
+
+load_dotenv()
+
+MODEL = "groq:deepseek-r1-distill-llama-70b"
+
+# (request, tool the agent needs for it)
+QUERIES = [
+    ("Search for repositories about Python machine learning", "search_repositories"),
+    ("Read the README.md file from the goyalsunil452/DSA-Questions repository", "get_file_contents"),
+    ("Create a file called hello.txt with content Hello World in goyalsunil452/DSA-Questions", "create_or_update_file"),
+    ("Open an issue in goyalsunil452/DSA-Questions saying the links are broken", "create_issue"),
+    ("List the latest commits on the main branch of pytorch/pytorch", "list_commits"),
+    ("Find code that uses asyncio.gather in langchain-ai/langgraph", "search_code"),
+    ("Create a new branch called docs in goyalsunil452/DSA-Questions", "create_branch"),
+    ("Merge pull request 12 in goyalsunil452/DSA-Questions", "merge_pull_request"),
+    ("Fork scikit-learn/scikit-learn to my account", "fork_repository"),
+    ("Who is the GitHub user torvalds?", "search_users"),
+]
+
+
+def schema_tokens(tools):
+    # About 4 characters per token for JSON schemas
+    return sum(len(json.dumps(convert_to_openai_tool(t))) for t in tools) // 4
+
+
+async def load_tools():
+    if os.getenv("GITHUB_MCP_FAKE") == "1":
+        server = {
+            "command": sys.executable,
+            "args": [str(Path(__file__).with_name("fake_github_mcp.py"))],
+            "transport": "stdio",
+        }
+    else:
+        server = {
+            "command": "volta",
+            "args": ["run", "npx", "-y", "@modelcontextprotocol/server-github"],
+            "env": {"GITHUB_PERSONAL_ACCESS_TOKEN": os.getenv("GITHUB_TOKEN")},
+            "transport": "stdio",
+        }
+    sessions = MCPSessionManager({"github": server})
+    try:
+        return await sessions.get_tools()
+    finally:
+        await sessions.close()
+
+
+async def model_call(model, tools, query):
+    start = time.perf_counter()
+    response = await model.bind_tools(tools).ainvoke(query)
+    seconds = time.perf_counter() - start
+    return (response.usage_metadata or {}).get("input_tokens", 0), seconds
+
+
+async def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    k = int(args[0]) if args else 6
+    live = "--live" in sys.argv
+
+    tools = await load_tools()
+    start = time.perf_counter()
+    router = ToolRouter(tools, k=k)
+    print(f"Indexed {len(tools)} tools in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    full_tokens = schema_tokens(tools)
+    model = init_chat_model(MODEL) if live else None
+    routed_tokens, route_ms, found = [], [], 0
+    live_full, live_routed = [], []
+
+    print(f"\nk={k}, all tools = ~{full_tokens} schema tokens per model call")
+    for query, expected in QUERIES:
+        start = time.perf_counter()
+        selected = router.select(query)
+        route_ms.append((time.perf_counter() - start) * 1000)
+
+        tokens = schema_tokens(selected)
+        routed_tokens.append(tokens)
+        hit = expected in {t.name for t in selected}
+        found += hit
+        print(
+            f"  {len(selected):>2} tools  ~{tokens:>5} tokens  "
+            f"{'ok  ' if hit else 'MISS'}  {query[:60]}"
+        )
+
+        if live:
+            live_full.append(await model_call(model, tools, query))
+            live_routed.append(await model_call(model, selected, query))
+
+    mean_routed = statistics.mean(routed_tokens)
+    print(
+        f"\nSchema tokens per turn: {full_tokens} -> {mean_routed:.0f} "
+        f"({1 - mean_routed / full_tokens:.0%} less)"
+    )
+    print(
+        f"Expected tool selected: {found}/{len(QUERIES)}, "
+        f"fallbacks to all tools: {router.fallbacks}"
+    )
+    print(f"Routing time: {statistics.mean(route_ms):.2f} ms per request")
+
+    if live:
+        for name, calls in (("all tools", live_full), (f"top-{k}", live_routed)):
+            print(
+                f"  {name:<10} prompt tokens {statistics.mean(c[0] for c in calls):7.0f}  "
+                f"latency {statistics.mean(c[1] for c in calls) * 1000:7.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,242 @@
+"""
+Fake GitHub MCP Server - Offline stand-in for @modelcontextprotocol/server-github
+
+Serves get_file_contents, create_or_update_file and search_repositories
+with the same argument names and response shapes as the real server, from
+a small in-memory set of repositories. State lives in a JSON file
+(FAKE_GITHUB_STATE, default in the temp directory) so writes survive
+server restarts and FakeRevalidator can answer conditional requests the
+way the GitHub API does.
+
+Every tool call increments api_calls in the state file, so you can see how
+many requests would have reached GitHub.
+
+Run through MCP (stdio):
+    {"command": "python", "args": ["fake_github_mcp.py"], "transport": "stdio"}
+"""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Optional
+
+from github_cache import content_sha
+from mcp.server.fastmcp import FastMCP
+
+STATE_PATH = os.getenv(
+    "FAKE_GITHUB_STATE", os.path.join(tempfile.gettempdir(), "fake_github_state.json")
+)
+
+SEED_REPOS = {
+    "goyalsunil452/DSA-Questions": {
+        "description": "Data structures and algorithms practice questions",
+        "language": "Python",
+        "stars": 12,
+        "files": {
+            "README.md": "# DSA Questions\n\nPractice problems on arrays, trees and graphs.\n",
+            "arrays/two_sum.py": "def two_sum(nums, target):\n    seen = {}\n    for i, n in enumerate(nums):\n        if target - n in seen:\n            return [seen[target - n], i]\n        seen[n] = i\n",
+        },
+    },
+    "scikit-learn/scikit-learn": {
+        "description": "Machine learning in Python",
+        "language": "Python",
+        "stars": 61000,
+        "files": {"README.md": "# scikit-learn\n\nMachine learning in Python.\n"},
+    },
+    "pytorch/pytorch": {
+        "description": "Tensors and dynamic neural networks in Python",
+        "language": "Python",
+        "stars": 85000,
+        "files": {"README.md": "# PyTorch\n\nTensors and dynamic neural networks.\n"},
+    },
+}
+
+mcp = FastMCP("FakeGitHub")
+_lock = threading.Lock()
+
+
+def blob_sha(content):
+    """Git blob SHA of a text file, as GitHub reports it"""
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def load_state(path=STATE_PATH):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"api_calls": 0, "repos": SEED_REPOS}
+
+
+def _save_state(state, path=STATE_PATH):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def _api_call():
+    """Load the state and count one GitHub API request"""
+    state = load_state()
+    state["api_calls"] += 1
+    return state
+
+
+def _file_json(full_name, path, content):
+    return {
+        "type": "file",
+        "encoding": "base64",
+        "size": len(content.encode("utf-8")),
+        "name": path.rsplit("/", 1)[-1],
+        "path": path,
+        "content": base64.b64encode(content.encode("utf-8")).decode("ascii"),
+        "sha": blob_sha(content),
+        "html_url": f"https://github.com/{full_name}/blob/main/{path}",
+    }
+
+
+def contents(state, owner, repo, path):
+    """Contents API response for a file or directory, None if not found"""
+    full_name = f"{owner}/{repo}"
+    files = state["repos"].get(full_name, {}).get("files")
+    if files is None:
+        return None
+
+    path = path.strip("/")
+    if path in files:
+        return _file_json(full_name, path, files[path])
+
+    prefix = f"{path}/" if path else ""
+    entries = {}
+    for file_path, content in files.items():
+        if not file_path.startswith(prefix):
+            continue
+        name, _, rest = file_path[len(prefix) :].partition("/")
+        if rest:
+            entries[name] = {"type": "dir", "name": name, "path": prefix + name, "sha": None}
+        else:
+            entries[name] = {
+                "type": "file",
+                "name": name,
+                "path": prefix + name,
+                "sha": blob_sha(content),
+                "size": len(content.encode("utf-8")),
+            }
+    return sorted(entries.values(), key=lambda e: e["name"]) or None
+
+
+@mcp.tool()
+def get_file_contents(owner: str, repo: str, path: str, branch: Optional[str] = None):
+    """Get the contents of a file or directory from a GitHub repository"""
+    with _lock:
+        state = _api_call()
+        _save_state(state)
+    data = contents(state, owner, repo, path)
+    if data is None:
+        raise ValueError(f"Not Found: {owner}/{repo}/{path}")
+    return json.dumps(data, indent=2)
+
+
+@mcp.tool()
+def create_or_update_file(
+    owner: str,
+    repo: str,
+    path: str,
+    content: str,
+    message: str,
+    branch: str,
+    sha: Optional[str] = None,
+):
+    """Create or update a single file in a GitHub repository"""
+    full_name = f"{owner}/{repo}"
+    with _lock:
+        state = _api_call()
+        repository = state["repos"].get(full_name)
+        if repository is None:
+            _save_state(state)
+            raise ValueError(f"Not Found: {full_name}")
+
+        path = path.strip("/")
+        current = repository["files"].get(path)
+        if current is not None and sha is not None and sha != blob_sha(current):
+            _save_state(state)
+            raise ValueError(f"{path} does not match {sha}")
+
+        repository["files"][path] = content
+        _save_state(state)
+
+    return json.dumps(
+        {
+            "content": _file_json(full_name, path, content),
+            "commit": {"message": message, "branch": branch},
+        },
+        indent=2,
+    )
+
+
+@mcp.tool()
+def search_repositories(query: str, page: Optional[int] = None, perPage: Optional[int] = None):
+    """Search for GitHub repositories"""
+    with _lock:
+        state = _api_call()
+        _save_state(state)
+
+    words = query.lower().split()
+    items = [
+        {
+            "full_name": full_name,
+            "description": repository["description"],
+            "language": repository["language"],
+            "stargazers_count": repository["stars"],
+            "html_url": f"https://github.com/{full_name}",
+        }
+        for full_name, repository in state["repos"].items()
+        if any(
+            w in f"{full_name} {repository['description']} {repository['language']}".lower()
+            for w in words
+        )
+    ]
+    items.sort(key=lambda item: -item["stargazers_count"])
+
+    per_page = perPage or 30
+    start = ((page or 1) - 1) * per_page
+    return json.dumps(
+        {"total_count": len(items), "items": items[start : start + per_page]}, indent=2
+    )
+
+
+class FakeRevalidator:
+    """
+    Conditional requests against the fake server's state, like
+    github_cache.GitHubRevalidator does against api.github.com
+
+    ETags are derived from the content SHA, so an unchanged file gets 304.
+    Counts 200 responses as API calls; 304s are free, as on GitHub.
+    """
+
+    def __init__(self, state_path=STATE_PATH):
+        self.state_path = state_path
+        self.not_modified = 0
+
+    def __call__(self, owner, repo, path, ref=None, etag=None):
+        with _lock:
+            state = load_state(self.state_path)
+            data = contents(state, owner, repo, path)
+            if data is None:
+                raise ValueError(f"Not Found: {owner}/{repo}/{path}")
+
+            sha = content_sha(data)
+            if etag == f'"{sha}"':
+                self.not_modified += 1
+                return 304, None, etag
+
+            state["api_calls"] += 1
+            _save_state(state, self.state_path)
+        return 200, sha, f'"{sha}"'
+
+
+if __name__ == "__main__":
+    mcp.run(transport="stdio")
@@ -7,32 +7,54 @@ The AI can search repositories, read files, and add content.
 
 import asyncio
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from github_cache import GitHubRevalidator, GitHubToolCache
 from langgraph.prebuilt import create_react_agent
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.llm_metrics import instrument, metrics_from_env
+from shared.mcp_sessions import MCPSessionManager
+from shared.tool_router import ToolRouter
+
 load_dotenv()
 
+# GITHUB_MCP_FAKE=1 runs against the local fake server: no token, no network
+USE_FAKE = os.getenv("GITHUB_MCP_FAKE") == "1"
+
 
 async def setup_github_mcp():
     print("Setting up GitHub MCP connection...")
 
-    # Create MCP client for GitHub
-    client = MultiServerMCPClient(
-        {
-            "github": {
-                "command": "volta",
-                "args": ["run", "npx", "-y", "@modelcontextprotocol/server-github"],
-                "env": {"GITHUB_PERSONAL_ACCESS_TOKEN": os.getenv("GITHUB_TOKEN")},
-                "transport": "stdio",
-            }
+    if USE_FAKE:
+        from fake_github_mcp import FakeRevalidator
+
+        server = {
+            "command": sys.executable,
+            "args": [str(Path(__file__).with_name("fake_github_mcp.py"))],
+            "transport": "stdio",
         }
-    )
+        revalidator = FakeRevalidator()
+    else:
+        server = {
+            "command": "volta",
+            "args": ["run", "npx", "-y", "@modelcontextprotocol/server-github"],
+            "env": {"GITHUB_PERSONAL_ACCESS_TOKEN": os.getenv("GITHUB_TOKEN")},
+            "transport": "stdio",
+        }
+        revalidator = GitHubRevalidator(os.getenv("GITHUB_TOKEN"))
+
+    # Create MCP client for GitHub; the server stays warm for all requests
+    # and its tool list is cached on disk between runs
+    client = MCPSessionManager({"github": server})
 
     print("Connected to GitHub MCP server")
 
-    # Get available GitHub tools
-    tools = await client.get_tools()
+    # Get available GitHub tools, behind a cache so repeated reads and
+    # searches don't spend rate limit
+    cache = GitHubToolCache(revalidator)
+    tools = cache.wrap(await client.get_tools())
     print(f"Found {len(tools)} GitHub tools:")
 
     for i, tool in enumerate(tools[:10], 1):  # Show first 10 tools
@@ -41,26 +63,36 @@ async def setup_github_mcp():
     if len(tools) > 10:
         print(f"  ... and {len(tools) - 10} more tools")
 
-    return client, tools
+    return client, cache, tools
 
 
 async def create_github_agent(tools):
     """
     Create AI agent with GitHub tools
     """
-    print("\nCreating AI agent with GitHub access...")
-
     agent = create_react_agent(
         model="groq:deepseek-r1-distill-llama-70b",
         tools=tools,
         prompt="You are a helpful AI assistant with access to GitHub tools. When users ask about GitHub operations, use the appropriate tools. For reading files, use get_file_contents. For creating files, use create_or_update_file. For searching repositories, use search_repositories. Always provide the exact parameters the tools need.",
     )
 
-    print("AI agent created successfully")
-    return agent
+    return instrument(agent)
 
 
-async def demonstrate_github_operations(agent):
+async def ask_github_agent(router, content):
+    """
+    Answer one request with only the GitHub tools relevant to it bound,
+    instead of sending every tool schema with every model call
+    """
+    tools = router.select(content)
+    names = ", ".join(t.name for t in tools)
+    print(f"(Binding {len(tools)} of {len(router.tools)} tools: {names})")
+
+    agent = await create_github_agent(tools)
+    return await agent.ainvoke({"messages": [{"role": "user", "content": content}]})
+
+
+async def demonstrate_github_operations(router):
     """
     Demonstrate various GitHub operations
     """
@@ -71,15 +103,9 @@ async def demonstrate_github_operations(agent):
     print("User: 'Search for repositories about Python machine learning'")
 
     try:
-        response = await agent.ainvoke(
-            {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": "Search for repositories about Python machine learning",
-                    }
-                ]
-            }
+        response = await ask_github_agent(
+            router,
+            "Search for repositories about Python machine learning",
         )
 
         print(f"AI Response: {response['messages'][-1].content}")
@@ -94,15 +120,9 @@ async def demonstrate_github_operations(agent):
     )
 
     try:
-        response = await agent.ainvoke(
-            {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": "Read the README.md file from the goyalsunil452/DSA-Questions repository",
-                    }
-                ]
-            }
+        response = await ask_github_agent(
+            router,
+            "Read the README.md file from the goyalsunil452/DSA-Questions repository",
         )
 
         print(f"AI Response: {response['messages'][-1].content}")
@@ -117,15 +137,9 @@ async def demonstrate_github_operations(agent):
     )
 
     try:
-        response = await agent.ainvoke(
-            {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": "Create a file called hello.txt with content Hello World in the goyalsunil452/DSA-Questions repository",
-                    }
-                ]
-            }
+        response = await ask_github_agent(
+            router,
+            "Create a file called hello.txt with content Hello World in the goyalsunil452/DSA-Questions repository",
         )
 
         print(f"AI Response: {response['messages'][-1].content}")
@@ -134,7 +148,7 @@ async def demonstrate_github_operations(agent):
         print(f"Error: {e}")
 
 
-async def interactive_github_demo(agent):
+async def interactive_github_demo(router):
     """
     Interactive demo where user can ask GitHub questions
     """
@@ -150,9 +164,7 @@ async def interactive_github_demo(agent):
             break
 
         try:
-            response = await agent.ainvoke(
-                {"messages": [{"role": "user", "content": user_input}]}
-            )
+            response = await ask_github_agent(router, user_input)
 
             print(f"AI: {response['messages'][-1].content}")
 
@@ -166,24 +178,31 @@ async def main():
     """
     Main function to run the GitHub MCP demo
     """
+    client = None
+    cache = None
     try:
         # Check if GitHub token is available
-        if not os.getenv("GITHUB_TOKEN"):
+        if not USE_FAKE and not os.getenv("GITHUB_TOKEN"):
             print("Error: GITHUB_TOKEN not found in .env file")
             print("Please add your GitHub Personal Access Token to .env file")
             return
 
         # Set up MCP connection
-        client, tools = await setup_github_mcp()
+        client, cache, tools = await setup_github_mcp()
 
-        # Create AI agent
-        agent = await create_github_agent(tools)
+        # Pick the relevant tools per request; the agent is created per
+        # request with just those tools bound. Keyword routing only: GitHub
+        # tool names and requests share verbs and nouns ("create branch",
+        # "merge pull request"), and this chapter has no embedding provider
+        # key. Weak matches fall back to all tools.
+        print("\nIndexing tools for per-request selection...")
+        router = ToolRouter(tools, k=6)
 
         # Demonstrate operations
-        await demonstrate_github_operations(agent)
+        await demonstrate_github_operations(router)
 
         # Interactive demo
-        await interactive_github_demo(agent)
+        await interactive_github_demo(router)
 
     except Exception as e:
         print(f"Error: {e}")
@@ -192,6 +211,16 @@ async def main():
         print("  2. Node.js and npm are installed")
         print("  3. Required packages are installed")
 
+    finally:
+        if client is not None:
+            await client.close()
+        if cache is not None:
+            cache.print_stats()
+
+        metrics = metrics_from_env()
+        if metrics:
+            metrics.print_summary()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,283 @@
+"""
+GitHub Cache - Caching proxy between the agent and the GitHub MCP tools
+
+The agent keeps asking for the same things (README.md of the same repo,
+the same repository search), and every call goes through the MCP server to
+the GitHub API and spends rate limit. GitHubToolCache wraps the MCP tools:
+
+- get_file_contents results are cached with the blob SHA from the response.
+  After `fresh_for` seconds an entry is revalidated with a conditional
+  request (If-None-Match with the stored ETag); GitHub answers 304 Not
+  Modified without counting it against the rate limit. A 200 with the same
+  SHA also keeps the entry; anything else fetches through the MCP server.
+- search_* results are cached for `search_ttl` seconds.
+- create_or_update_file, push_files and delete_file always run and then
+  invalidate the cached contents of the paths they touched (and of their
+  parent directories, whose listings changed too).
+- Every other tool passes straight through.
+
+Usage:
+    cache = GitHubToolCache(GitHubRevalidator(os.getenv("GITHUB_TOKEN")))
+    tools = cache.wrap(await client.get_tools())
+    ...
+    cache.print_stats()
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+
+from langchain_core.tools import StructuredTool
+
+CONTENT_TOOLS = {"get_file_contents"}
+SEARCH_TOOLS = {"search_repositories", "search_code", "search_issues", "search_users"}
+WRITE_TOOLS = {"create_or_update_file", "push_files", "delete_file"}
+
+
+def content_sha(data):
+    """SHA identifying a contents API response: the blob SHA of a file, or a
+    hash of the entry SHAs for a directory listing"""
+    if isinstance(data, dict):
+        return data.get("sha")
+    if isinstance(data, list):
+        shas = sorted(f"{e.get('path')}:{e.get('sha')}" for e in data if isinstance(e, dict))
+        return hashlib.sha256("\n".join(shas).encode()).hexdigest()
+    return None
+
+
+def _text(content):
+    """Text of a tool result (MCP results can be a string or content blocks)"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block if isinstance(block, str) else block.get("text", "")
+            for block in content
+        )
+    return ""
+
+
+def _parse_sha(content):
+    try:
+        return content_sha(json.loads(_text(content)))
+    except ValueError:
+        return None
+
+
+class GitHubRevalidator:
+    """
+    Conditional GET against the GitHub contents API
+
+    Called as revalidator(owner, repo, path, ref, etag) and returns
+    (status, sha, etag): status 304 means unchanged since `etag`.
+    Without a token it still works, but on the unauthenticated rate limit.
+    """
+
+    def __init__(self, token=None, api_url="https://api.github.com", timeout=10):
+        self.token = token
+        self.api_url = api_url
+        self.timeout = timeout
+
+    def __call__(self, owner, repo, path, ref=None, etag=None):
+        url = f"{self.api_url}/repos/{owner}/{repo}/contents/{urllib.parse.quote(path.strip('/'))}"
+        if ref:
+            url += "?" + urllib.parse.urlencode({"ref": ref})
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if etag:
+            headers["If-None-Match"] = etag
+
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = json.load(response)
+                return response.status, content_sha(data), response.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, None, e.headers.get("ETag") or etag
+            raise
+
+
+class GitHubToolCache:
+    """
+    Cache for GitHub MCP tool results
+
+    Args:
+        revalidator: Callable(owner, repo, path, ref, etag) -> (status, sha,
+            etag), e.g. GitHubRevalidator(token). None = refetch stale files
+        fresh_for: Seconds a file result is served without revalidating
+        search_ttl: Seconds a search result stays valid
+        maxsize: Maximum number of cached results (LRU eviction)
+    """
+
+    def __init__(self, revalidator=None, fresh_for=60, search_ttl=600, maxsize=256):
+        self.revalidator = revalidator
+        self.fresh_for = fresh_for
+        self.search_ttl = search_ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "invalidated": 0,
+            "passthrough": 0,
+        }
+
+    def wrap(self, tools):
+        """
+        Put the cache in front of a list of GitHub MCP tools
+
+        Returns:
+            Tools with the same names, descriptions and arguments
+        """
+        return [self._wrap_tool(tool) for tool in tools]
+
+    def _wrap_tool(self, tool):
+        if tool.name in CONTENT_TOOLS:
+            call = self._get_contents
+        elif tool.name in SEARCH_TOOLS:
+            call = self._search
+        elif tool.name in WRITE_TOOLS:
+            call = self._write
+        else:
+            call = self._passthrough
+
+        async def arun(**kwargs):
+            return await call(tool, kwargs)
+
+        return StructuredTool.from_function(
+            coroutine=arun,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            return_direct=tool.return_direct,
+        )
+
+    def _key(self, name, kwargs):
+        return json.dumps([name, kwargs], sort_keys=True, default=repr)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    async def _passthrough(self, tool, kwargs):
+        self.stats["passthrough"] += 1
+        return await tool.ainvoke(kwargs)
+
+    async def _search(self, tool, kwargs):
+        key = self._key(tool.name, kwargs)
+        entry = self._get(key)
+        if entry is not None and time.monotonic() - entry["fetched"] < self.search_ttl:
+            self.stats["hits"] += 1
+            return entry["result"]
+
+        result = await tool.ainvoke(kwargs)
+        self.stats["misses"] += 1
+        self._put(key, {"result": result, "fetched": time.monotonic()})
+        return result
+
+    async def _get_contents(self, tool, kwargs):
+        key = self._key(tool.name, kwargs)
+        entry = self._get(key)
+        if entry is not None:
+            if time.monotonic() - entry["checked"] < self.fresh_for:
+                self.stats["hits"] += 1
+                return entry["result"]
+            if await self._still_valid(entry, kwargs):
+                self.stats["revalidated"] += 1
+                return entry["result"]
+
+        result = await tool.ainvoke(kwargs)
+        self.stats["misses"] += 1
+        self._put(
+            key,
+            {
+                "result": result,
+                "sha": _parse_sha(result),
+                "etag": None,
+                "checked": time.monotonic(),
+                "target": _target(kwargs),
+            },
+        )
+        return result
+
+    async def _still_valid(self, entry, kwargs):
+        if self.revalidator is None or entry["sha"] is None:
+            return False
+        owner, repo, path = _target(kwargs)
+        try:
+            status, sha, etag = await asyncio.to_thread(
+                self.revalidator, owner, repo, path, kwargs.get("branch"), entry["etag"]
+            )
+        except Exception:
+            # Can't revalidate (network, auth): fetch through the MCP server
+            return False
+
+        if status == 304 or (sha is not None and sha == entry["sha"]):
+            entry["etag"] = etag or entry["etag"]
+            entry["checked"] = time.monotonic()
+            return True
+        return False
+
+    async def _write(self, tool, kwargs):
+        result = await tool.ainvoke(kwargs)
+        self.stats["passthrough"] += 1
+
+        owner, repo = kwargs.get("owner"), kwargs.get("repo")
+        paths = [f["path"] for f in kwargs.get("files") or []]
+        if kwargs.get("path"):
+            paths.append(kwargs["path"])
+        for path in paths:
+            self.invalidate(owner, repo, path)
+        return result
+
+    def invalidate(self, owner, repo, path):
+        """Drop cached contents of `path` and of every parent directory"""
+        path = path.strip("/")
+        affected = {path} | {
+            "/".join(path.split("/")[:i]) for i in range(len(path.split("/")))
+        }
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if entry.get("target") is not None
+                and entry["target"][:2] == (owner, repo)
+                and entry["target"][2] in affected
+            ]
+            for key in stale:
+                del self._entries[key]
+        self.stats["invalidated"] += len(stale)
+
+    def print_stats(self):
+        s = self.stats
+        upstream = s["misses"] + s["passthrough"]
+        print(
+            f"GitHub cache: {s['hits']} hits, {s['revalidated']} revalidated (304/same SHA), "
+            f"{s['misses']} misses, {s['invalidated']} invalidated, "
+            f"{upstream} calls reached the MCP server"
+        )
+
+
+def _target(kwargs):
+    return (kwargs.get("owner"), kwargs.get("repo"), (kwargs.get("path") or "").strip("/"))
@@ -7,10 +7,15 @@ This demonstrates proper state management and conversation context.
 
 import streamlit as st
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import InMemorySaver
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.llm_metrics import instrument
+
 load_dotenv()
 
 
@@ -51,7 +56,8 @@ def create_agent():
             checkpointer=checkpointer,
         )
 
-        return agent, checkpointer
+        # Records tokens/latency per LLM call when LLM_METRICS_FILE is set
+        return instrument(agent), checkpointer
 
     except Exception as e:
         st.error(f"Error creating agent: {str(e)}")
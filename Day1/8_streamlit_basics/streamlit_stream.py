@@ -1,9 +1,14 @@
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.prebuilt import create_react_agent
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.llm_metrics import instrument
+
 
 import streamlit as st
 
@@ -24,6 +29,8 @@ agent = create_react_agent(
     prompt="You are a helpful AI assistant. Remember our conversation and provide helpful responses.",
     checkpointer=checkpointer,
 )
+# Records tokens/latency per LLM call when LLM_METRICS_FILE is set
+agent = instrument(agent)
 
 
 def stream_graph_updates(user_input: str):
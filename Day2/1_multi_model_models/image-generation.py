@@ -1,16 +1,22 @@
 import streamlit as st
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
 from PIL import Image
 from io import BytesIO
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.llm_cassette import wrap_genai_client
+
 
 load_dotenv()
 
 
-client = genai.Client()
+# Same as genai.Client(); records/replays when LLM_CASSETTE is set
+client = wrap_genai_client(genai.Client)
 
 
 st.title("AI Image Generator")
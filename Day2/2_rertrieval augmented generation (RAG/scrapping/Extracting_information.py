@@ -10,20 +10,34 @@ if not os.environ.get("GOOGLE_API_KEY"):
     os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_community.document_loaders import WebBaseLoader
 from langchain.tools import tool
 from langgraph.prebuilt import create_react_agent
 from langchain_chroma import Chroma
 
 # Import smart chunking functions
 from smart_chunking import (
-    create_smart_chunks,
+    content_hash,
+    iter_smart_chunks,
     post_retrieval_deduplication,
     get_chunking_stats,
 )
+from batch_embeddings import embed_in_batches
+from bm25_index import BM25Index
+from chroma_sync import print_sync_report, sync_chunks
+from embedding_cache import EmbeddingCache
+from hybrid_retrieval import document_id, hybrid_search
+from web_crawler import CrawlerLoader
+
+# Texts per embedding request and requests in flight during ingestion
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "100"))
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
 
 # Initialize embeddings
-embeddings = GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-001")
+EMBEDDING_MODEL = "models/gemini-embedding-001"
+embeddings = GoogleGenerativeAIEmbeddings(model=EMBEDDING_MODEL)
+
+# Vectors of chunks seen in earlier runs, keyed by (model, content hash)
+embedding_cache = EmbeddingCache("./embedding_cache", model=EMBEDDING_MODEL)
 
 # Initialize ChromaDB vector store
 vectorstore = Chroma(
@@ -32,41 +46,69 @@ vectorstore = Chroma(
     persist_directory="./chroma_genai",
 )
 
-# Load and chunk documents
-loader = WebBaseLoader(web_paths=["https://www.educosys.com/course/genai"])
-docs = loader.load()
-
-# Use smart chunking module
-all_splits = create_smart_chunks(docs, chunk_size=1000, chunk_overlap=200)
-
-# Get chunking statistics
-stats = get_chunking_stats(len(docs), len(all_splits))
-print(
-    f"Chunking efficiency: {stats['efficiency_gain']} ({stats['reduction_percentage']}% reduction)"
+# Keyword index over the same chunk IDs, for exact-term queries
+bm25_index = BM25Index("./bm25_genai.json")
+
+
+def embed_chunks(chunks):
+    """Embed chunks in one batched pass; cached vectors are reused"""
+    return embedding_cache.embed(
+        [chunk.page_content for chunk in chunks],
+        [
+            chunk.metadata.get("content_hash") or content_hash(chunk.page_content)
+            for chunk in chunks
+        ],
+        lambda texts: embed_in_batches(
+            embeddings,
+            texts,
+            batch_size=EMBED_BATCH_SIZE,
+            max_concurrency=EMBED_CONCURRENCY,
+        ),
+    )
+
+
+def embed_new_chunks(chunks):
+    """Embed only the chunks the collection doesn't store yet"""
+    ids = [document_id(chunk) for chunk in chunks]
+    stored = set(vectorstore._collection.get(ids=ids, include=[])["ids"])
+    new = [chunk for i, chunk in zip(ids, chunks) if i not in stored]
+    if new:
+        embed_chunks(new)
+
+
+# Crawl the course site politely (links, then sitemap; per-host limits, HTTP
+# cache with conditional GETs) and chunk pages as they arrive. Chunks that
+# aren't stored yet are embedded a batch at a time while the crawl
+# continues; the embedding cache makes those vectors free when the whole
+# set is synced below.
+loader = CrawlerLoader(
+    ["https://www.educosys.com/course/genai"],
+    max_depth=1,
+    max_pages=30,
+    url_prefixes=["https://www.educosys.com/course/"],
+    cache_dir="./http_cache",
 )
+chunk_stats = {}
+all_splits = []
+for chunk in iter_smart_chunks(
+    loader.lazy_load(), chunk_size=1000, chunk_overlap=200, stats=chunk_stats
+):
+    all_splits.append(chunk)
+    if len(all_splits) % EMBED_BATCH_SIZE == 0:
+        embed_new_chunks(all_splits[-EMBED_BATCH_SIZE:])
+loader.print_stats()
 
-# Create embeddings for each chunk
-chunk_embeddings = []
-
-for i, chunk in enumerate(all_splits):
-    # Get embedding for this chunk
-    embedding_vector = embeddings.embed_query(chunk.page_content)
+# Get chunking statistics
+stats = get_chunking_stats(chunk_stats["documents"], len(all_splits))
+print(f"Chunking efficiency: {stats['efficiency_gain']}")
 
-    # Store chunk with its embedding
-    chunk_info = {
-        "chunk": chunk,
-        "embedding": embedding_vector,
-        "embedding_dimensions": len(embedding_vector),
-    }
-    chunk_embeddings.append(chunk_info)
 
-# Store chunks in ChromaDB
+# Sync ChromaDB with the chunks: only new or changed chunks are embedded
+# and upserted, chunks the pages no longer produce are deleted
 try:
-    vectorstore.add_documents(documents=all_splits)
-
-    # Check total stored chunks
-    total_stored = vectorstore._collection.count()
-    print(f"Total chunks in ChromaDB: {total_stored}")
+    report = sync_chunks(vectorstore, all_splits, embed_chunks, bm25_index=bm25_index)
+    print_sync_report(report)
+    embedding_cache.print_stats(EMBED_BATCH_SIZE)
 
 except Exception as e:
     print(f"Error storing in ChromaDB: {e}")
@@ -82,8 +124,8 @@ llm = init_chat_model("llama-3.1-8b-instant", model_provider="groq")
 def retrieve_context(query: str) -> str:
     """Retrieve relevant context from the knowledge base based on the query."""
     try:
-        # Get relevant documents from ChromaDB
-        relevant_docs = vectorstore.similarity_search(query, k=3)
+        # Get relevant documents: vector and BM25 rankings fused with RRF
+        relevant_docs = hybrid_search(vectorstore, bm25_index, query, k=3)
 
         if not relevant_docs:
             return "No relevant information found in the knowledge base."
@@ -0,0 +1,75 @@
+"""
+Batch Embeddings - One batched embedding pass for RAG ingestion
+
+Embedding chunk by chunk with embed_query makes one API request per chunk,
+and vectorstore.add_documents() then embeds every chunk again. This module
+embeds all chunks once, batch_size texts per embed_documents request with
+up to max_concurrency requests in flight, and writes the vectors straight
+into the Chroma collection so nothing is embedded twice.
+"""
+
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _batches(items, batch_size):
+    return [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def embed_in_batches(embeddings, texts, batch_size=100, max_concurrency=4):
+    """
+    Embed texts with one embed_documents call per batch
+
+    Args:
+        embeddings: LangChain Embeddings (e.g. GoogleGenerativeAIEmbeddings)
+        texts: List of texts to embed
+        batch_size: Texts per API request
+        max_concurrency: Maximum requests in flight at once
+
+    Returns:
+        List of vectors, in the same order as texts
+    """
+    if not texts:
+        return []
+
+    batches = _batches(texts, batch_size)
+    start = time.perf_counter()
+
+    # map() keeps the batch order, so vectors line up with texts
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        results = list(pool.map(embeddings.embed_documents, batches))
+
+    vectors = [vector for batch in results for vector in batch]
+    print(
+        f"Embedded {len(texts)} chunks in {len(batches)} requests "
+        f"(batch size {batch_size}, {max_concurrency} concurrent) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    return vectors
+
+
+def add_with_vectors(vectorstore, chunks, vectors, ids=None, batch_size=100):
+    """
+    Store chunks with precomputed vectors, skipping Chroma's own embedding
+
+    Args:
+        vectorstore: langchain_chroma.Chroma instance
+        chunks: List of Documents
+        vectors: One vector per chunk
+        ids: Optional ids (random UUIDs by default)
+        batch_size: Records per Chroma write
+
+    Returns:
+        List of ids written
+    """
+    ids = ids or [str(uuid.uuid4()) for _ in chunks]
+    for start in range(0, len(chunks), batch_size):
+        end = start + batch_size
+        vectorstore._collection.upsert(
+            ids=ids[start:end],
+            embeddings=vectors[start:end],
+            documents=[chunk.page_content for chunk in chunks[start:end]],
+            metadatas=[chunk.metadata or None for chunk in chunks[start:end]],
+        )
+    return ids
@@ -0,0 +1,240 @@
+"""
+Benchmark: sequential page loading vs CrawlerLoader, against a local site
+
+Serves a generated site from a local http.server (every response delayed
+by --latency to look like a remote server, ETag support, a sitemap and a
+robots.txt with a disallowed section) and compares:
+
+- sequential: one GET after another over the known page list, the way
+  WebBaseLoader loads web_paths
+- crawl cold: CrawlerLoader with an empty HTTP cache
+- crawl warm: the same crawl again; unchanged pages come back as 304
+
+It also checks what the crawler promises: the per-host concurrency limit
+holds, robots.txt is honoured, max_depth is respected and the first page
+arrives long before the crawl ends, and that links are crawled before
+sitemap entries. Exits 1 if a check fails.
+
+Run: python benchmark_crawler.py [--pages 60] [--latency 0.1]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from web_crawler import CrawlerLoader
+
+
+def build_site(pages):
+    """{path: html} - each page links to the next two, plus private pages"""
+    site = {}
+    for i in range(pages):
+        links = "".join(
+            f'<a href="/page/{j}">page {j}</a> ' for j in (i + 1, i + 2) if j < pages
+        )
+        site[f"/page/{i}"] = (
+            f"<html lang='en'><head><title>Page {i}</title></head><body>"
+            f"<p>Content of page {i}. " + "Lorem ipsum dolor sit amet. " * 40 +
+            f"</p>{links}<a href='/private/{i}'>private</a></body></html>"
+        )
+        site[f"/private/{i}"] = "<html><body>private</body></html>"
+    return site
+
+
+def make_handler(site, latency, state):
+    sitemap = "".join(
+        f"<url><loc>{{base}}{path}</loc></url>"
+        for path in site
+        if path.startswith("/page/")
+    )
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with state["lock"]:
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+                state["requests"].append(self.path)
+            try:
+                time.sleep(latency)
+                self.respond()
+            finally:
+                with state["lock"]:
+                    state["in_flight"] -= 1
+
+        def respond(self):
+            base = f"http://{self.headers['Host']}"
+            if self.path == "/robots.txt":
+                body = f"User-agent: *\nDisallow: /private/\nSitemap: {base}/sitemap.xml\n"
+                return self.send_body(body, "text/plain")
+            if self.path == "/sitemap.xml":
+                body = (
+                    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                    + sitemap.replace("{base}", base)
+                    + "</urlset>"
+                )
+                return self.send_body(body, "application/xml")
+            if self.path not in site:
+                self.send_response(404)
+                self.end_headers()
+                return
+
+            body = site[self.path]
+            etag = '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_body(body, "text/html; charset=utf-8", etag)
+
+        def send_body(self, body, content_type, etag=None):
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+def sequential(base, paths):
+    start = time.perf_counter()
+    with httpx.Client() as client:
+        for path in paths:
+            client.get(base + path)
+    return time.perf_counter() - start
+
+
+def crawl(loader):
+    start = time.perf_counter()
+    first = None
+    documents = []
+    for document in loader.lazy_load():
+        if first is None:
+            first = time.perf_counter() - start
+        documents.append(document)
+    return documents, first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=40.0)
+    args = parser.parse_args()
+
+    site = build_site(args.pages)
+    state = {"lock": threading.Lock(), "in_flight": 0, "max_in_flight": 0, "requests": []}
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_handler(site, args.latency, state)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    pages = [p for p in site if p.startswith("/page/")]
+
+    try:
+        seconds = sequential(base, pages)
+        print(f"{len(pages)} pages, {args.latency * 1000:.0f} ms server latency")
+        print(f"  sequential   {seconds:6.2f}s")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            def loader(**kwargs):
+                return CrawlerLoader(
+                    [f"{base}/page/0"],
+                    max_pages=args.pages * 2,
+                    per_host_concurrency=args.concurrency,
+                    requests_per_second=args.rps,
+                    cache_dir=cache_dir,
+                    **kwargs,
+                )
+
+            failures = []
+
+            def check(name, ok):
+                print(f"  {'ok  ' if ok else 'FAIL'} {name}")
+                if not ok:
+                    failures.append(name)
+
+            runs = {}
+            for run in ("cold", "warm"):
+                state["max_in_flight"] = 0
+                state["requests"].clear()
+                crawler = loader(max_depth=args.pages)
+                documents, first, total = crawl(crawler)
+                print(
+                    f"  crawl {run:<6} {total:6.2f}s  first page after "
+                    f"{first:.2f}s  {len(documents)} pages  "
+                    f"max {state['max_in_flight']} in flight"
+                )
+                crawler.print_stats()
+                runs[run] = {
+                    "stats": dict(crawler.stats),
+                    "pages": len(documents),
+                    "first": first,
+                    "total": total,
+                    "max_in_flight": state["max_in_flight"],
+                    "private": [
+                        p for p in state["requests"] if p.startswith("/private/")
+                    ],
+                }
+
+            cold, warm = runs["cold"], runs["warm"]
+            print("\nChecks")
+            check(
+                f"per-host limit {args.concurrency} held",
+                max(cold["max_in_flight"], warm["max_in_flight"]) <= args.concurrency,
+            )
+            check(
+                "robots.txt honoured (no /private/ requests)",
+                not cold["private"] and not warm["private"],
+            )
+            check(f"cold crawl loads all {len(pages)} pages", cold["pages"] == len(pages))
+            check(
+                "warm crawl revalidates every page (all 304)",
+                warm["stats"]["not_modified"] == len(pages)
+                and warm["stats"]["fetched"] == 0,
+            )
+            check("first page before the crawl ends", cold["first"] < cold["total"] / 2)
+
+            shallow = loader(max_depth=1, use_sitemap=False)
+            depths = sorted(d.metadata["source"] for d in crawl(shallow)[0])
+            expected = sorted(f"{base}/page/{i}" for i in range(min(3, args.pages)))
+            check("max_depth=1 without sitemap loads pages 0-2 only", depths == expected)
+
+            if args.pages > 8:
+                # The sitemap lists /page/0 first; the links from /page/5 must
+                # still win the three-page budget
+                limited = CrawlerLoader(
+                    [f"{base}/page/5"],
+                    max_depth=1,
+                    max_pages=3,
+                    per_host_concurrency=args.concurrency,
+                    requests_per_second=args.rps,
+                    cache_dir=None,
+                )
+                sources = sorted(d.metadata["source"] for d in crawl(limited)[0])
+                expected = sorted(f"{base}/page/{i}" for i in (5, 6, 7))
+                check("links are crawled before sitemap entries", sources == expected)
+
+            if failures:
+                sys.exit(1)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
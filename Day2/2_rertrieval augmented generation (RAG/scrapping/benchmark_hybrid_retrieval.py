@@ -0,0 +1,212 @@
+"""
+Benchmark: vector-only vs hybrid (vector + BM25, RRF) retrieval
+
+Runs every query of a labelled set through vector_search and hybrid_search
+and reports, per method, recall@k and query latency (median and p95).
+
+A query is labelled with phrases; a chunk is relevant when it contains
+one of them (case-insensitive). recall@k is the share of relevant chunks
+in the top k, out of at most k relevant ones (min(k, relevant in the
+collection)), averaged over queries.
+
+Two modes:
+
+- live (default): the collection and BM25 index Extracting_information.py
+  built, Gemini embeddings, and a JSONL query file
+  ({"query": ..., "relevant": [phrases]} per line)
+- --synthetic: a generated corpus in a temporary collection, ingested with
+  sync_chunks, embedded with a toy bag-of-words embedding that folds
+  synonyms but, like a dense model with rare tokens, ignores IDs such as
+  "MOD-0042". Half the queries ask for such an ID, half ask about a topic
+  using only synonyms of its words. No API key needed; it checks the
+  pipeline and shows the effect on a corpus built to have both query
+  types, not on the real site.
+
+Run: python benchmark_hybrid_retrieval.py --queries eval_queries.jsonl
+     python benchmark_hybrid_retrieval.py --synthetic
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+import zlib
+
+from langchain_core.documents import Document
+
+from bm25_index import BM25Index, tokenize
+from chroma_sync import sync_chunks
+from hybrid_retrieval import hybrid_search, vector_search
+
+TOPICS = {
+    "agents": ["agent", "planner", "loop", "tools", "reasoning"],
+    "rag": ["retrieval", "chunks", "embeddings", "index", "context"],
+    "mcp": ["protocol", "server", "client", "resources", "transport"],
+    "finetuning": ["training", "dataset", "weights", "lora", "epochs"],
+    "vision": ["image", "pixels", "caption", "diffusion", "frames"],
+}
+# Query word -> corpus word; the toy embedding folds these, BM25 can't
+SYNONYMS = {
+    "assistant": "agent", "planning": "planner",
+    "search": "retrieval", "passages": "chunks",
+    "connector": "server", "consumer": "client",
+    "learning": "training", "adapters": "lora",
+    "picture": "image", "video": "frames",
+}
+FILLER = [
+    "lesson", "module", "example", "students", "project", "notes",
+    "hands", "build", "session", "week", "practice", "guide",
+]
+
+
+class ToyEmbeddings:
+    """Hashed bag of known words, synonyms folded; unknown tokens ignored"""
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.known = set(FILLER) | {w for words in TOPICS.values() for w in words}
+
+    def _embed(self, text):
+        vector = [0.0] * self.dim
+        for word in tokenize(text):
+            word = SYNONYMS.get(word, word)
+            if word in self.known:
+                vector[zlib.crc32(word.encode()) % self.dim] += 1.0
+        norm = sum(v * v for v in vector) ** 0.5 or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def synthetic_corpus(chunks=2000, seed=0):
+    rng = random.Random(seed)
+    documents = []
+    for i in range(chunks):
+        topic = rng.choice(list(TOPICS))
+        words = rng.choices(TOPICS[topic], k=12) + rng.choices(FILLER, k=30)
+        rng.shuffle(words)
+        text = f"MOD-{i:04d} topic-{topic} " + " ".join(words)
+        documents.append(
+            Document(page_content=text, metadata={"source": f"page-{i % 50}"})
+        )
+    return documents
+
+
+def synthetic_queries(documents, count=100, seed=1):
+    """
+    Alternating ID queries (relevant: that chunk) and synonym-only topic
+    queries (relevant: any chunk of the topic)
+    """
+    rng = random.Random(seed)
+    by_topic = {}
+    for query_word, word in SYNONYMS.items():
+        topic = next(t for t, words in TOPICS.items() if word in words)
+        by_topic.setdefault(topic, []).append(query_word)
+
+    queries = []
+    for doc in rng.sample(documents, count):
+        code = doc.page_content.split()[0]
+        if len(queries) % 2 == 0:
+            queries.append({"query": f"Where is {code} covered?", "relevant": [code]})
+        else:
+            topic = rng.choice(list(by_topic))
+            words = " ".join(by_topic[topic])
+            relevant = [f"topic-{topic}"]
+            queries.append({"query": f"explain {words}", "relevant": relevant})
+    return queries
+
+
+def evaluate(name, search, queries, texts, k):
+    recalls = []
+    latencies = []
+    for item in queries:
+        start = time.perf_counter()
+        docs = search(item["query"])[:k]
+        latencies.append((time.perf_counter() - start) * 1000)
+        phrases = [p.lower() for p in item["relevant"]]
+        hits = sum(any(p in d.page_content.lower() for p in phrases) for d in docs)
+        relevant = sum(any(p in t for p in phrases) for t in texts)
+        possible = min(k, relevant)
+        recalls.append(hits / possible if possible else 0.0)
+
+    p95 = sorted(latencies)[max(0, int(len(latencies) * 0.95) - 1)]
+    print(
+        f"  {name:<8} recall@{k} {statistics.mean(recalls):.3f}  "
+        f"latency median {statistics.median(latencies):6.1f} ms  p95 {p95:6.1f} ms"
+    )
+
+
+def run(vectorstore, bm25_index, queries, k):
+    documents = vectorstore._collection.get(include=["documents"])["documents"]
+    texts = [t.lower() for t in documents]
+    print(f"{len(queries)} queries, {len(texts)} chunks, {len(bm25_index)} in BM25")
+    evaluate(
+        "vector",
+        lambda q: [doc for _, doc in vector_search(vectorstore, q, k=k)],
+        queries,
+        texts,
+        k,
+    )
+    evaluate(
+        "hybrid",
+        lambda q: hybrid_search(vectorstore, bm25_index, q, k=k),
+        queries,
+        texts,
+        k,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", default="eval_queries.jsonl")
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("-k", type=int, default=3)
+    args = parser.parse_args()
+
+    from langchain_chroma import Chroma
+
+    if args.synthetic:
+        embeddings = ToyEmbeddings()
+        with tempfile.TemporaryDirectory() as directory:
+            vectorstore = Chroma(
+                collection_name="hybrid_benchmark",
+                embedding_function=embeddings,
+                persist_directory=directory,
+            )
+            bm25_index = BM25Index()
+            documents = synthetic_corpus()
+            sync_chunks(
+                vectorstore,
+                documents,
+                lambda chunks: embeddings.embed_documents(
+                    [c.page_content for c in chunks]
+                ),
+                bm25_index=bm25_index,
+            )
+            run(vectorstore, bm25_index, synthetic_queries(documents), args.k)
+        return
+
+    from dotenv import load_dotenv
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+    load_dotenv()
+    vectorstore = Chroma(
+        collection_name="educosys_genai_info",
+        embedding_function=GoogleGenerativeAIEmbeddings(
+            model="models/gemini-embedding-001"
+        ),
+        persist_directory="./chroma_genai",
+    )
+    with open(args.queries, encoding="utf-8") as f:
+        queries = [json.loads(line) for line in f if line.strip()]
+    run(vectorstore, BM25Index("./bm25_genai.json"), queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: MinHash LSH near-duplicate removal on synthetic chunks
+
+Generates chunks of random words, of which a share are copies of earlier
+original chunks with two words changed (like a date or a menu item; about
+0.87 word-shingle Jaccard similarity to the original), and reports for
+growing input sizes:
+
+- time and chunks per second (should grow roughly linearly with size)
+- near-duplicates caught vs planted, and unique chunks wrongly dropped
+- what exact content-hash deduplication alone would have caught
+
+Run: python benchmark_near_duplicates.py [max_chunks] [threshold]
+"""
+
+import random
+import sys
+import time
+
+from langchain_core.documents import Document
+
+from smart_chunking import _remove_near_duplicates, content_hash
+
+VOCABULARY = [f"word{i}" for i in range(5000)]
+
+
+def make_chunks(count, duplicate_share=0.3, edits=2, words=150, seed=0):
+    """Chunks plus the indices of the planted near-duplicates"""
+    rng = random.Random(seed)
+    chunks = []
+    originals = []
+    planted = set()
+    for i in range(count):
+        if originals and rng.random() < duplicate_share:
+            text = rng.choice(originals).page_content.split()
+            for _ in range(edits):
+                text[rng.randrange(len(text))] = f"2024-{rng.randint(1, 12):02d}"
+            planted.add(i)
+        else:
+            text = rng.choices(VOCABULARY, k=words)
+        chunk = Document(page_content=" ".join(text), metadata={"i": i})
+        if i not in planted:
+            originals.append(chunk)
+        chunks.append(chunk)
+    return chunks, planted
+
+
+def main():
+    max_chunks = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    threshold = float(sys.argv[2]) if len(sys.argv) > 2 else 0.8
+    sizes = [n for n in (10_000, 50_000, 100_000, 200_000, 500_000) if n <= max_chunks]
+
+    print(f"threshold {threshold}, 150 words per chunk, 30% near-duplicates")
+    for size in sizes:
+        chunks, planted = make_chunks(size)
+        exact = size - len({content_hash(c.page_content) for c in chunks})
+
+        start = time.perf_counter()
+        kept = _remove_near_duplicates(chunks, threshold)
+        seconds = time.perf_counter() - start
+
+        dropped = {c.metadata["i"] for c in chunks} - {c.metadata["i"] for c in kept}
+        print(
+            f"  {size:>7} chunks  {seconds:6.2f}s  {size / seconds:8.0f} chunks/s  "
+            f"caught {len(dropped & planted)}/{len(planted)}  "
+            f"false drops {len(dropped - planted)}  exact-hash dedup {exact}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: low-quality chunk check, before and after PhraseMatcher
+
+Compares, on synthetic chunks, the check _filter_low_quality_chunks used
+to run (lowercase the chunk and the pattern again for every pattern) with
+PhraseMatcher (patterns lowercased and pruned once, chunk lowercased once)
+and with one combined case-insensitive regex, the other obvious single-pass
+option. All must make the same decision for every chunk.
+
+Chunks are drawn from a pool of distinct texts, so a million of them fit
+in memory; about 5% contain a low-quality phrase somewhere.
+
+Run: python benchmark_quality_filter.py [chunks] [chunk_length]
+"""
+
+import random
+import re
+import sys
+import time
+
+from smart_chunking import LOW_QUALITY_PATTERNS, low_quality_matcher
+
+WORDS = "model agent tool retrieval vector prompt context token server embedding".split()
+
+
+def old_is_low_quality(content):
+    is_low_quality = any(
+        pattern.lower() in content.lower() for pattern in LOW_QUALITY_PATTERNS
+    )
+    if ("404" in content and "Error" in content) or (
+        "page does not exist" in content.lower()
+    ):
+        is_low_quality = True
+    return is_low_quality
+
+
+def new_is_low_quality(content, matcher):
+    return matcher.matches(content) or ("404" in content and "Error" in content)
+
+
+def regex_is_low_quality(content, regex):
+    is_low_quality = regex.search(content) is not None
+    return is_low_quality or ("404" in content and "Error" in content)
+
+
+def make_pool(size, length, seed=0):
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(size):
+        words = []
+        while sum(len(w) + 1 for w in words) < length:
+            words.append(rng.choice(WORDS))
+        if rng.random() < 0.05:
+            phrase = rng.choice(LOW_QUALITY_PATTERNS).upper()
+            words.insert(rng.randrange(len(words)), phrase)
+        pool.append(" ".join(words))
+    return pool
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    pool = make_pool(20_000, length)
+    rng = random.Random(1)
+    chunks = [pool[rng.randrange(len(pool))] for _ in range(count)]
+    matcher = low_quality_matcher(tuple(LOW_QUALITY_PATTERNS))
+    regex = re.compile("|".join(re.escape(p) for p in matcher.phrases), re.IGNORECASE)
+    checks = [
+        ("per-pattern lower() + in", old_is_low_quality),
+        ("PhraseMatcher", lambda c: new_is_low_quality(c, matcher)),
+        ("combined regex", lambda c: regex_is_low_quality(c, regex)),
+    ]
+
+    print(f"{count} chunks of ~{length} chars, {len(LOW_QUALITY_PATTERNS)} patterns")
+    decisions = []
+    baseline = None
+    for name, check in checks:
+        start = time.perf_counter()
+        decisions.append([check(c) for c in chunks])
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print(
+            f"  {name:<26} {seconds:7.2f}s  {count / seconds:10.0f} chunks/s  "
+            f"{baseline / seconds:4.1f}x"
+        )
+    same = all(d == decisions[0] for d in decisions)
+    print(f"  flagged {sum(decisions[0])}, same decisions: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: create_smart_chunks (lists) vs iter_smart_chunks (streaming)
+
+Chunks a generated corpus both ways, each in a fresh child process so peak
+RSS is measured separately:
+
+- batch: the corpus is loaded into a list and create_smart_chunks builds
+  a full list per stage
+- stream: documents are generated one at a time and iter_smart_chunks
+  yields chunks to a consumer that only counts them (as an embedding or
+  upload step would, without keeping them)
+
+Reports peak RSS (Unix), time and chunks per second, and checks both
+produce the same number of chunks.
+
+Run: python benchmark_streaming_chunking.py [--docs 5000] [--doc-size 10000]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+from langchain_core.documents import Document
+
+from smart_chunking import create_smart_chunks, iter_smart_chunks
+
+WORDS = [f"term{i}" for i in range(20000)]
+
+
+def generate_corpus(docs, doc_size, seed=0):
+    """Documents of paragraphs, some repeated across documents (nav, footer)"""
+    rng = random.Random(seed)
+    boilerplate = [" ".join(rng.choices(WORDS, k=60)) for _ in range(20)]
+    for i in range(docs):
+        paragraphs = []
+        size = 0
+        while size < doc_size:
+            if rng.random() < 0.1:
+                paragraph = rng.choice(boilerplate)
+            else:
+                paragraph = " ".join(rng.choices(WORDS, k=rng.randint(20, 150)))
+            paragraphs.append(paragraph)
+            size += len(paragraph) + 2
+        yield Document(
+            page_content="\n\n".join(paragraphs), metadata={"source": f"doc-{i}"}
+        )
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run(mode, docs, doc_size):
+    """Child process: chunk the corpus one way and print a JSON result"""
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if mode == "batch":
+            chunks = len(create_smart_chunks(list(generate_corpus(docs, doc_size))))
+        else:
+            chunks = sum(1 for _ in iter_smart_chunks(generate_corpus(docs, doc_size)))
+    seconds = time.perf_counter() - start
+    print(json.dumps({"chunks": chunks, "seconds": seconds, "rss_mb": peak_rss_mb()}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--doc-size", type=int, default=10000)
+    parser.add_argument("--mode", choices=["batch", "stream"])
+    args = parser.parse_args()
+
+    if args.mode:
+        return run(args.mode, args.docs, args.doc_size)
+
+    corpus_mb = args.docs * args.doc_size / 1e6
+    print(f"{args.docs} documents x {args.doc_size} chars (~{corpus_mb:.0f} MB text)")
+    results = {}
+    for mode in ("batch", "stream"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--docs", str(args.docs),
+             "--doc-size", str(args.doc_size)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = results[mode] = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"  {mode:<6} peak RSS {result['rss_mb']:7.0f} MB  "
+            f"{result['seconds']:6.1f}s  "
+            f"{result['chunks'] / result['seconds']:7.0f} chunks/s  "
+            f"{result['chunks']} chunks"
+        )
+    same = results["batch"]["chunks"] == results["stream"]["chunks"]
+    print(f"  same chunk count: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+BM25 Index - Persistent keyword index kept next to the Chroma collection
+
+Vector search alone often misses exact-term queries: course names,
+acronyms like "MCP", tool names. BM25Index is a small inverted index over
+the same chunk IDs as the collection (see chroma_sync.chunk_id):
+
+- built during ingestion and updated incrementally by sync_chunks
+  (add new chunk IDs, remove stale ones)
+- search(query, k) returns chunk IDs ranked by Okapi BM25
+- saved as one JSON file of per-chunk term counts; the postings are
+  rebuilt from it on load
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+
+_WORD_RE = re.compile(r"\w+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+    "in", "is", "it", "of", "on", "or", "the", "this", "to", "what", "with",
+    "you", "your", "about", "me", "tell", "do", "does", "i", "can",
+}
+
+
+def tokenize(text):
+    """Lowercased words without stopwords"""
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Incremental Okapi BM25 index of chunk IDs
+
+    Args:
+        path: JSON file to load from and save to (None keeps it in memory)
+        k1: Term frequency saturation
+        b: Length normalisation
+    """
+
+    def __init__(self, path=None, k1=1.2, b=0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.docs = {}  # chunk ID -> {term: count}
+        self.postings = {}  # term -> {chunk ID: count}
+        self.lengths = {}
+        self.total_length = 0
+
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for chunk_id, terms in json.load(f)["docs"].items():
+                    self._index(chunk_id, terms)
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, chunk_id):
+        return chunk_id in self.docs
+
+    def _index(self, chunk_id, terms):
+        self.docs[chunk_id] = terms
+        length = sum(terms.values())
+        self.lengths[chunk_id] = length
+        self.total_length += length
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[chunk_id] = count
+
+    def add(self, ids, texts):
+        """Index (or re-index) chunks"""
+        self.remove([i for i in ids if i in self.docs])
+        for chunk_id, text in zip(ids, texts):
+            self._index(chunk_id, dict(Counter(tokenize(text))))
+
+    def remove(self, ids):
+        """Drop chunks from the index (unknown IDs are ignored)"""
+        for chunk_id in ids:
+            terms = self.docs.pop(chunk_id, None)
+            if terms is None:
+                continue
+            self.total_length -= self.lengths.pop(chunk_id)
+            for term in terms:
+                posting = self.postings[term]
+                del posting[chunk_id]
+                if not posting:
+                    del self.postings[term]
+
+    def search(self, query, k=10):
+        """
+        Top-k chunks for a query
+
+        Returns:
+            List of (chunk ID, score), best first; only chunks sharing at
+            least one query term
+        """
+        n = len(self.docs)
+        if n == 0:
+            return []
+        avg_length = self.total_length / n
+
+        scores = Counter()
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for chunk_id, tf in posting.items():
+                length_ratio = self.lengths[chunk_id] / avg_length
+                norm = self.k1 * (1 - self.b + self.b * length_ratio)
+                scores[chunk_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores.most_common(k)
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"docs": self.docs}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,120 @@
+"""
+Chroma Sync - Incremental upsert of chunks into a persistent collection
+
+Adding every chunk on every run with random IDs makes the collection grow
+with duplicates. sync_chunks() gives each chunk a deterministic ID from its
+source URL and content hash, then for the sources being ingested:
+
+- chunks whose ID is already stored are left alone (not even embedded)
+- new or changed chunks are embedded and upserted
+- stored chunks the source no longer produces are deleted
+
+and reports the collection size and how long each step took. An optional
+BM25Index (bm25_index.py) is kept in step with the same IDs.
+"""
+
+import hashlib
+import time
+
+from batch_embeddings import add_with_vectors
+from smart_chunking import content_hash
+
+
+def chunk_id(source, chunk_hash):
+    """Deterministic ID for a chunk of a source"""
+    return hashlib.sha1(f"{source}\n{chunk_hash}".encode()).hexdigest()
+
+
+def sync_chunks(vectorstore, chunks, embed_fn, batch_size=100, bm25_index=None):
+    """
+    Bring the collection in line with the given chunks
+
+    Args:
+        vectorstore: langchain_chroma.Chroma instance
+        chunks: All chunks of the sources being ingested
+        embed_fn: Callable(list of chunks) -> list of vectors, only called
+            for chunks that are not stored yet
+        batch_size: Records per Chroma read/write
+        bm25_index: Optional BM25Index to update (and save) alongside
+
+    Returns:
+        Dictionary with added, unchanged, deleted, size before/after and
+        timings in seconds
+    """
+    collection = vectorstore._collection
+    timings = {}
+    start = time.perf_counter()
+    size_before = collection.count()
+
+    # Deterministic IDs; the same chunk twice in one run is stored once
+    current = {}
+    for chunk in chunks:
+        source = chunk.metadata.get("source", "unknown")
+        chunk_hash = chunk.metadata.get("content_hash")
+        if not chunk_hash:
+            chunk_hash = content_hash(chunk.page_content)
+        current.setdefault(chunk_id(source, chunk_hash), chunk)
+
+    sources = sorted({c.metadata.get("source", "unknown") for c in current.values()})
+    stored = set()
+    for i in range(0, len(sources), batch_size):
+        result = collection.get(
+            where={"source": {"$in": sources[i : i + batch_size]}}, include=[]
+        )
+        stored.update(result["ids"])
+    timings["lookup"] = time.perf_counter() - start
+
+    new_ids = [i for i in current if i not in stored]
+    stale_ids = sorted(stored - set(current))
+
+    step = time.perf_counter()
+    new_chunks = [current[i] for i in new_ids]
+    vectors = embed_fn(new_chunks) if new_chunks else []
+    timings["embed"] = time.perf_counter() - step
+
+    step = time.perf_counter()
+    if new_chunks:
+        add_with_vectors(
+            vectorstore, new_chunks, vectors, ids=new_ids, batch_size=batch_size
+        )
+    for i in range(0, len(stale_ids), batch_size):
+        collection.delete(ids=stale_ids[i : i + batch_size])
+    timings["write"] = time.perf_counter() - step
+
+    if bm25_index is not None:
+        step = time.perf_counter()
+        # New chunks, plus stored ones the index is missing (e.g. first run
+        # with an index, or an index file that was deleted)
+        missing = [i for i in current if i not in bm25_index]
+        bm25_index.add(missing, [current[i].page_content for i in missing])
+        bm25_index.remove(stale_ids)
+        bm25_index.save()
+        timings["bm25"] = time.perf_counter() - step
+    timings["total"] = time.perf_counter() - start
+
+    return {
+        "added": len(new_ids),
+        "unchanged": len(current) - len(new_ids),
+        "deleted": len(stale_ids),
+        "size_before": size_before,
+        "size_after": collection.count(),
+        "bm25_size": len(bm25_index) if bm25_index is not None else None,
+        "timings": {k: round(v, 3) for k, v in timings.items()},
+    }
+
+
+def print_sync_report(report):
+    t = report["timings"]
+    print(
+        f"Chroma sync: {report['added']} added, {report['unchanged']} unchanged, "
+        f"{report['deleted']} stale deleted; "
+        f"collection {report['size_before']} -> {report['size_after']} chunks"
+    )
+    print(
+        f"  lookup {t['lookup']:.2f}s, embed {t['embed']:.2f}s, "
+        f"write {t['write']:.2f}s, total {t['total']:.2f}s"
+    )
+    if report["bm25_size"] is not None:
+        print(
+            f"  BM25 index: {report['bm25_size']} chunks, updated in {t['bm25']:.2f}s"
+        )
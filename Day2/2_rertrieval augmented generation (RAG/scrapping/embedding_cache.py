@@ -0,0 +1,146 @@
+"""
+Embedding Cache - Content-addressed, persistent cache of chunk embeddings
+
+Re-running ingestion re-embeds the whole site although most chunks have
+not changed. EmbeddingCache keys every vector by (embedding model, content
+hash) - the same normalized MD5 smart_chunking uses for deduplication - so
+only new or changed chunks reach the embedding API.
+
+Storage, one directory per model:
+- vectors.f32: all vectors as one float32 array, appended to and read
+  through a memory map (no JSON floats, nothing loaded up front)
+- index.json: content hash -> row number in vectors.f32
+"""
+
+import json
+import math
+import os
+import re
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Persistent (model, content hash) -> vector cache
+
+    Args:
+        directory: Cache directory (one subdirectory per model)
+        model: Embedding model name, part of the key
+    """
+
+    def __init__(self, directory=".embedding_cache", model="default"):
+        self.model = model
+        self.directory = os.path.join(directory, re.sub(r"[^\w.-]+", "_", model))
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.index_path = os.path.join(self.directory, "index.json")
+        self.hits = 0
+        self.misses = 0
+
+        self.dim = None
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.dim = data["dim"]
+            self.index = data["rows"]
+        self._drop_orphan_rows()
+        self._matrix = None
+
+    def _drop_orphan_rows(self):
+        """Vectors written by a run that died before saving the index"""
+        if not os.path.exists(self.vectors_path):
+            return
+        expected = len(self.index) * (self.dim or 0) * 4
+        if os.path.getsize(self.vectors_path) > expected:
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(expected)
+
+    def _rows(self):
+        if self._matrix is None and self.index:
+            self._matrix = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(len(self.index), self.dim),
+            )
+        return self._matrix
+
+    def get_many(self, hashes):
+        """Cached vectors for the given hashes (None where missing)"""
+        matrix = self._rows()
+        return [
+            matrix[self.index[h]].tolist() if h in self.index else None
+            for h in hashes
+        ]
+
+    def put_many(self, hashes, vectors):
+        """Append new vectors and persist the index"""
+        new = [(h, v) for h, v in zip(hashes, vectors) if h not in self.index]
+        if not new:
+            return
+
+        array = np.asarray([v for _, v in new], dtype=np.float32)
+        if self.dim is None:
+            self.dim = array.shape[1]
+        elif array.shape[1] != self.dim:
+            raise ValueError(
+                f"Embedding size changed from {self.dim} to {array.shape[1]} "
+                f"for model {self.model}; clear {self.directory}"
+            )
+
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.vectors_path, "ab") as f:
+            f.write(array.tobytes())
+        for h, _ in new:
+            self.index[h] = len(self.index)
+
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "dim": self.dim, "rows": self.index}, f)
+        os.replace(tmp_path, self.index_path)
+        self._matrix = None
+
+    def embed(self, texts, hashes, embed_fn):
+        """
+        Vectors for texts, calling embed_fn only for uncached ones
+
+        Args:
+            texts: Texts to embed
+            hashes: Content hash of each text
+            embed_fn: Callable(list of texts) -> list of vectors
+
+        Returns:
+            List of vectors, in the same order as texts
+        """
+        vectors = self.get_many(hashes)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        # The same new text can occur twice; embed it once
+        unique = {}
+        for i in missing:
+            unique.setdefault(hashes[i], texts[i])
+
+        self.hits += len(texts) - len(unique)
+        self.misses += len(unique)
+
+        if unique:
+            new_vectors = embed_fn(list(unique.values()))
+            self.put_many(list(unique), new_vectors)
+            by_hash = dict(zip(unique, new_vectors))
+            for i in missing:
+                vectors[i] = by_hash[hashes[i]]
+        return vectors
+
+    def print_stats(self, batch_size=100):
+        """Hit rate and embedding requests saved (at batch_size per request)"""
+        total = self.hits + self.misses
+        if total == 0:
+            return
+        requests_without = math.ceil(total / batch_size)
+        requests_with = math.ceil(self.misses / batch_size)
+        print(
+            f"Embedding cache: {self.hits}/{total} hits ({self.hits / total:.0%}), "
+            f"{self.misses} chunks embedded, "
+            f"{requests_without - requests_with} embedding requests saved"
+        )
@@ -0,0 +1,82 @@
+"""
+Hybrid Retrieval - Vector search and BM25 combined with rank fusion
+
+Vector search finds chunks that mean the same as the query; BM25 finds
+chunks that contain its exact terms (course names, acronyms like "MCP").
+hybrid_search() runs both over the same chunk IDs and merges the two
+rankings with reciprocal rank fusion (RRF): every list a chunk appears in
+adds 1 / (rrf_k + rank). RRF only uses ranks, so the cosine distances and
+BM25 scores never have to be put on one scale.
+"""
+
+from langchain_core.documents import Document
+
+from chroma_sync import chunk_id
+from smart_chunking import content_hash
+
+
+def reciprocal_rank_fusion(rankings, rrf_k=60):
+    """
+    Fuse ranked ID lists
+
+    Args:
+        rankings: Lists of IDs, best first
+        rrf_k: Damping constant; 60 is the value from the original RRF paper
+
+    Returns:
+        List of (id, score), best first
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def document_id(doc):
+    """Chunk ID of a retrieved Document, as assigned by sync_chunks"""
+    chunk_hash = doc.metadata.get("content_hash") or content_hash(doc.page_content)
+    return chunk_id(doc.metadata.get("source", "unknown"), chunk_hash)
+
+
+def vector_search(vectorstore, query, k=3):
+    """Vector-only retrieval as (chunk ID, Document) pairs"""
+    return [
+        (document_id(doc), doc) for doc in vectorstore.similarity_search(query, k=k)
+    ]
+
+
+def hybrid_search(vectorstore, bm25_index, query, k=3, candidates=10, rrf_k=60):
+    """
+    Top-k chunks by fused vector and BM25 rank
+
+    Args:
+        vectorstore: langchain_chroma.Chroma instance
+        bm25_index: BM25Index over the same chunk IDs
+        query: User query
+        k: Chunks to return
+        candidates: Chunks taken from each retriever before fusing
+        rrf_k: RRF damping constant
+
+    Returns:
+        List of Documents, best first
+    """
+    vector_hits = vector_search(vectorstore, query, k=candidates)
+    keyword_ids = [i for i, _ in bm25_index.search(query, k=candidates)]
+    fused = reciprocal_rank_fusion(
+        [[i for i, _ in vector_hits], keyword_ids], rrf_k=rrf_k
+    )[:k]
+
+    documents = dict(vector_hits)
+    # Chunks only BM25 found still have to be read from the collection
+    missing = [i for i, _ in fused if i not in documents]
+    if missing:
+        result = vectorstore._collection.get(
+            ids=missing, include=["documents", "metadatas"]
+        )
+        for i, text, metadata in zip(
+            result["ids"], result["documents"], result["metadatas"]
+        ):
+            documents[i] = Document(page_content=text, metadata=metadata or {})
+
+    return [documents[i] for i, _ in fused if i in documents]
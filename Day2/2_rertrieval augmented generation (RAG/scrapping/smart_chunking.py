@@ -4,11 +4,41 @@ Provides advanced chunking strategies to reduce duplication and improve content
 """
 
 import hashlib
+import zlib
+from functools import lru_cache
+
+import numpy as np
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
-
-def create_smart_chunks(documents, chunk_size=1000, chunk_overlap=200):
+# Chunks containing any of these (case-insensitive) are dropped as
+# navigation, error-page or loader-warning boilerplate
+LOW_QUALITY_PATTERNS = [
+    "404 Error",
+    "This page does not exist",
+    "page does not exist",
+    "Go back",
+    "Take me home",
+    "Courses",
+    "Free Content",
+    "Login",
+    "Signup",
+    "Checkout",
+    "Go back home",
+    "Please go back home",
+    "checkout our awesome courses",
+    "USER_AGENT environment variable not set",
+    "consider setting it to identify your requests",
+]
+
+
+def create_smart_chunks(
+    documents,
+    chunk_size=1000,
+    chunk_overlap=200,
+    near_duplicate_threshold=0.8,
+    low_quality_patterns=None,
+):
     """
     Create smart chunks with deduplication and better splitting strategy
 
@@ -16,6 +46,10 @@ def create_smart_chunks(documents, chunk_size=1000, chunk_overlap=200):
         documents: List of documents to chunk
         chunk_size: Target size for each chunk
         chunk_overlap: Overlap between consecutive chunks
+        near_duplicate_threshold: Drop chunks whose estimated Jaccard
+            similarity to an earlier chunk is at least this (None disables)
+        low_quality_patterns: Phrases marking a chunk as low quality
+            (default LOW_QUALITY_PATTERNS)
 
     Returns:
         List of processed and deduplicated chunks
@@ -23,7 +57,124 @@ def create_smart_chunks(documents, chunk_size=1000, chunk_overlap=200):
     print("Creating smart chunks with deduplication...")
 
     # Strategy 1: Better text splitting with semantic boundaries
-    text_splitter = RecursiveCharacterTextSplitter(
+    text_splitter = _text_splitter(chunk_size, chunk_overlap)
+
+    # Split documents
+    all_splits = text_splitter.split_documents(documents)
+    print(f"Initial chunks created: {len(all_splits)}")
+
+    # Strategy 2: Content deduplication
+    unique_chunks = _remove_duplicates(all_splits)
+    if near_duplicate_threshold is not None:
+        unique_chunks = _remove_near_duplicates(
+            unique_chunks, near_duplicate_threshold
+        )
+
+    # Strategy 3: Filter low-quality chunks
+    quality_chunks = _filter_low_quality_chunks(unique_chunks, low_quality_patterns)
+
+    # Strategy 4: Merge very short chunks with adjacent ones
+    merged_chunks = _merge_short_chunks(quality_chunks, chunk_size)
+
+    print(f"Final chunks after merging: {len(merged_chunks)}")
+
+    return merged_chunks
+
+
+def iter_smart_chunks(
+    documents,
+    chunk_size=1000,
+    chunk_overlap=200,
+    near_duplicate_threshold=0.8,
+    low_quality_patterns=None,
+    stats=None,
+):
+    """
+    Streaming variant of create_smart_chunks
+
+    Takes documents one at a time (any iterable, e.g. a loader's
+    lazy_load()) through split -> dedup -> filter -> merge and yields each
+    chunk as soon as it is final. Instead of a full list per stage it keeps
+    only the seen content hashes, the near-duplicate index and one chunk of
+    lookahead for merging, so memory does not grow with the documents'
+    text. Produces the same chunks, in the same order, as
+    create_smart_chunks on the same documents.
+
+    Args:
+        documents: Iterable of documents to chunk
+        chunk_size: Target size for each chunk
+        chunk_overlap: Overlap between consecutive chunks
+        near_duplicate_threshold: As in create_smart_chunks (None disables)
+        low_quality_patterns: As in create_smart_chunks
+        stats: Optional dictionary, filled with per-stage counts
+
+    Yields:
+        Processed and deduplicated chunks
+    """
+    text_splitter = _text_splitter(chunk_size, chunk_overlap)
+    if low_quality_patterns is None:
+        low_quality_patterns = LOW_QUALITY_PATTERNS
+    matcher = low_quality_matcher(tuple(low_quality_patterns))
+    near_duplicates = (
+        NearDuplicateIndex(near_duplicate_threshold)
+        if near_duplicate_threshold is not None
+        else None
+    )
+    seen_hashes = set()
+    counts = stats if stats is not None else {}
+    counts.update(
+        documents=0, splits=0, duplicates=0, near_duplicates=0, low_quality=0, chunks=0
+    )
+
+    pending = None  # One chunk of lookahead for merging
+    for document in documents:
+        counts["documents"] += 1
+        for chunk in text_splitter.split_documents([document]):
+            counts["splits"] += 1
+
+            chunk_hash = content_hash(chunk.page_content)
+            if chunk_hash in seen_hashes:
+                counts["duplicates"] += 1
+                continue
+            seen_hashes.add(chunk_hash)
+            chunk.metadata["content_hash"] = chunk_hash
+
+            if near_duplicates is not None and near_duplicates.add(chunk.page_content):
+                counts["near_duplicates"] += 1
+                continue
+
+            content = chunk.page_content.strip()
+            if len(content) < 100 or _is_low_quality(content, matcher):
+                counts["low_quality"] += 1
+                continue
+
+            if pending is None:
+                pending = chunk
+                continue
+            merged_chunk = _merge_pair(pending, chunk, chunk_size)
+            counts["chunks"] += 1
+            if merged_chunk is not None:
+                yield merged_chunk
+                pending = None
+            else:
+                yield pending
+                pending = chunk
+
+    if pending is not None:
+        counts["chunks"] += 1
+        yield pending
+
+    print(
+        f"Streamed {counts['chunks']} chunks from {counts['documents']} documents "
+        f"({counts['splits']} splits, {counts['duplicates']} duplicates, "
+        f"{counts['near_duplicates']} near-duplicates, "
+        f"{counts['low_quality']} low-quality dropped)"
+    )
+
+
+def _text_splitter(chunk_size, chunk_overlap):
+    """Splitter preferring paragraph, line and sentence boundaries"""
+    return RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         length_function=len,
@@ -40,42 +191,27 @@ def create_smart_chunks(documents, chunk_size=1000, chunk_overlap=200):
         ],
     )
 
-    # Split documents
-    all_splits = text_splitter.split_documents(documents)
-    print(f"Initial chunks created: {len(all_splits)}")
 
-    # Strategy 2: Content deduplication
-    unique_chunks = _remove_duplicates(all_splits)
-
-    # Strategy 3: Filter low-quality chunks
-    quality_chunks = _filter_low_quality_chunks(unique_chunks)
-
-    # Strategy 4: Merge very short chunks with adjacent ones
-    merged_chunks = _merge_short_chunks(quality_chunks, chunk_size)
-
-    print(f"Final chunks after merging: {len(merged_chunks)}")
-
-    return merged_chunks
+def content_hash(content):
+    """Create a hash of normalized content for deduplication"""
+    # Normalize content: lowercase, remove extra whitespace
+    normalized = " ".join(content.lower().split())
+    return hashlib.md5(normalized.encode()).hexdigest()
 
 
 def _remove_duplicates(chunks):
     """Remove duplicate chunks based on content hash"""
-
-    def get_content_hash(content):
-        """Create a hash of normalized content for deduplication"""
-        # Normalize content: lowercase, remove extra whitespace
-        normalized = " ".join(content.lower().split())
-        return hashlib.md5(normalized.encode()).hexdigest()
-
     unique_chunks = []
     seen_hashes = set()
     duplicate_count = 0
 
     for chunk in chunks:
-        content_hash = get_content_hash(chunk.page_content)
+        chunk_hash = content_hash(chunk.page_content)
 
-        if content_hash not in seen_hashes:
-            seen_hashes.add(content_hash)
+        if chunk_hash not in seen_hashes:
+            seen_hashes.add(chunk_hash)
+            # Kept for the embedding cache and vector store IDs
+            chunk.metadata["content_hash"] = chunk_hash
             unique_chunks.append(chunk)
         else:
             duplicate_count += 1
@@ -86,45 +222,216 @@ def _remove_duplicates(chunks):
     return unique_chunks
 
 
-def _filter_low_quality_chunks(chunks):
+def _shingles(content, size=5):
+    """Hashes of the overlapping `size`-word windows of normalized content"""
+    words = content.lower().split()
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode())}
+    return {
+        zlib.crc32(" ".join(words[i : i + size]).encode())
+        for i in range(len(words) - size + 1)
+    }
+
+
+def _lsh_bands(num_perm, threshold):
+    """
+    (bands, rows) with bands * rows = num_perm, closest to the threshold
+
+    Two chunks with Jaccard similarity s share at least one band with
+    probability 1 - (1 - s^rows)^bands; the S-curve is steepest around
+    (1 / bands) ^ (1 / rows).
+    """
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles
+
+    Args:
+        num_perm: Hash functions per signature (more = better estimates)
+        shingle_size: Words per shingle
+        seed: Seed for the hash functions; signatures are comparable only
+            between MinHashers with the same seed and num_perm
+    """
+
+    # Prime above 2^32, so (a * x + b) % PRIME is a permutation of 32-bit x
+    PRIME = 4294967311
+
+    def __init__(self, num_perm=64, shingle_size=5, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.a = rng.randint(1, 2**32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 2**32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, content):
+        shingles = np.fromiter(_shingles(content, self.shingle_size), dtype=np.uint64)
+        # a * x + b stays below 2^64 for 32-bit a, b and x
+        hashes = (shingles[:, None] * self.a + self.b) % np.uint64(self.PRIME)
+        # Minima fit in 32 bits except the rare 2^32..PRIME-1, which wrap;
+        # still a fixed function of the shingle set, at half the memory
+        return hashes.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def similarity(sig1, sig2):
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.mean(sig1 == sig2))
+
+
+class NearDuplicateIndex:
+    """
+    MinHash LSH index answering "is this a near-duplicate of a chunk seen so far?"
+
+    Exact hashing misses boilerplate that differs by a date or a menu item.
+    Each chunk gets a MinHash signature of its word shingles; LSH banding
+    puts the signature into one bucket per band, so only chunks sharing a
+    bucket are compared. That keeps deduplication roughly linear in the
+    number of chunks instead of comparing every pair.
+
+    Args:
+        threshold: Minimum estimated Jaccard similarity to count as a
+            near-duplicate (0-1)
+        num_perm: MinHash size
+        shingle_size: Words per shingle
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, shingle_size=5):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.bands, self.rows = _lsh_bands(num_perm, threshold)
+        self.buckets = {}
+        self.signatures = []
+
+    def add(self, content):
+        """
+        Index content unless it is a near-duplicate
+
+        Returns:
+            True if content is a near-duplicate (and was not indexed)
+        """
+        signature = self.hasher.signature(content)
+        rows = self.rows
+        # Buckets are keyed by a hash of the band; a collision only adds a
+        # candidate, which the signature comparison then rejects
+        keys = [
+            hash((band, signature[band * rows : (band + 1) * rows].tobytes()))
+            for band in range(self.bands)
+        ]
+
+        candidates = set()
+        for key in keys:
+            bucket = self.buckets.get(key)
+            if isinstance(bucket, int):
+                candidates.add(bucket)
+            elif bucket:
+                candidates.update(bucket)
+        if any(
+            MinHasher.similarity(
+                signature, np.frombuffer(self.signatures[i], dtype=np.uint32)
+            )
+            >= self.threshold
+            for i in candidates
+        ):
+            return True
+
+        # Most buckets hold one chunk: store its number, a list only once shared
+        position = len(self.signatures)
+        for key in keys:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                self.buckets[key] = position
+            elif isinstance(bucket, int):
+                self.buckets[key] = [bucket, position]
+            else:
+                bucket.append(position)
+        # Kept as bytes: far smaller than one numpy array per chunk
+        self.signatures.append(signature.tobytes())
+        return False
+
+
+def _remove_near_duplicates(chunks, threshold=0.8, num_perm=64, shingle_size=5):
+    """
+    Remove chunks that are near-duplicates of an earlier chunk
+
+    Args:
+        chunks: List of chunks, in order (the first of a group is kept)
+        threshold: Minimum estimated Jaccard similarity (see NearDuplicateIndex)
+        num_perm: MinHash size
+        shingle_size: Words per shingle
+
+    Returns:
+        List of chunks without near-duplicates
+    """
+    index = NearDuplicateIndex(threshold, num_perm, shingle_size)
+    kept = [chunk for chunk in chunks if not index.add(chunk.page_content)]
+    near_duplicate_count = len(chunks) - len(kept)
+
+    print(
+        f"Near-duplicates removed (similarity >= {threshold}): {near_duplicate_count}"
+    )
+
+    return kept
+
+
+class PhraseMatcher:
+    """
+    Case-insensitive "contains any of these phrases" check
+
+    Built once per pattern list: phrases are lowercased up front, and a
+    phrase containing another phrase is dropped because the shorter one
+    already matches (e.g. "go back home" is covered by "go back"). Each
+    check then lowercases the chunk once and runs the remaining substring
+    searches, instead of lowercasing chunk and pattern for every pattern.
+
+    Args:
+        patterns: Literal phrases
+    """
+
+    def __init__(self, patterns):
+        lowered = sorted({p.lower() for p in patterns if p}, key=len)
+        self.phrases = []
+        for phrase in lowered:
+            if not any(shorter in phrase for shorter in self.phrases):
+                self.phrases.append(phrase)
+
+    def matches(self, content):
+        lowered = content.lower()
+        return any(phrase in lowered for phrase in self.phrases)
+
+
+@lru_cache(maxsize=16)
+def low_quality_matcher(patterns):
+    """PhraseMatcher for a tuple of patterns, built once per tuple"""
+    return PhraseMatcher(patterns)
+
+
+def _is_low_quality(content, matcher):
+    """Whether stripped chunk content contains low-quality phrases"""
+    # Check if content contains any low-quality patterns
+    is_low_quality = matcher.matches(content)
+
+    # Additional check for 404-like content
+    if "404" in content and "Error" in content:
+        is_low_quality = True
+
+    return is_low_quality
+
+
+def _filter_low_quality_chunks(chunks, patterns=None):
     """Filter out low-quality chunks"""
     quality_chunks = []
-
-    # Define low-quality content patterns
-    low_quality_patterns = [
-        "404 Error",
-        "This page does not exist",
-        "Go back",
-        "Take me home",
-        "Courses",
-        "Free Content",
-        "Login",
-        "Signup",
-        "Checkout",
-        "Go back home",
-        "Please go back home",
-        "checkout our awesome courses",
-        "USER_AGENT environment variable not set",
-        "consider setting it to identify your requests",
-    ]
+    if patterns is None:
+        patterns = LOW_QUALITY_PATTERNS
+    matcher = low_quality_matcher(tuple(patterns))
 
     for chunk in chunks:
         content = chunk.page_content.strip()
 
         # Skip chunks that are too short or contain low-quality content
         if len(content) >= 100:
-            # Check if content contains any low-quality patterns
-            is_low_quality = any(
-                pattern.lower() in content.lower() for pattern in low_quality_patterns
-            )
-
-            # Additional check for 404-like content
-            if (
-                "404" in content and "Error" in content
-            ) or "page does not exist" in content.lower():
-                is_low_quality = True
-
-            if not is_low_quality:
+            if not _is_low_quality(content, matcher):
                 quality_chunks.append(chunk)
             else:
                 print(f"Filtered out low-quality chunk: {content[:100]}...")
@@ -134,6 +441,27 @@ def _filter_low_quality_chunks(chunks):
     return quality_chunks
 
 
+def _merge_pair(current_chunk, next_chunk, chunk_size):
+    """Merged chunk if current_chunk is very short and the pair fits, else None"""
+    if len(current_chunk.page_content.strip()) >= 200:
+        return None
+
+    # Merge chunks if combined length is reasonable
+    combined_content = current_chunk.page_content + "\n\n" + next_chunk.page_content
+    if len(combined_content) > chunk_size * 1.5:  # Allow some overflow
+        return None
+
+    return Document(
+        page_content=combined_content,
+        metadata={
+            "source": current_chunk.metadata.get("source", "unknown"),
+            "merged": True,
+            "original_chunks": 2,
+            "content_hash": content_hash(combined_content),
+        },
+    )
+
+
 def _merge_short_chunks(chunks, chunk_size):
     """Merge very short chunks with adjacent ones"""
     merged_chunks = []
@@ -143,24 +471,9 @@ def _merge_short_chunks(chunks, chunk_size):
         current_chunk = chunks[i]
 
         # If current chunk is too short and there's a next chunk
-        if len(current_chunk.page_content.strip()) < 200 and i + 1 < len(chunks):
-            next_chunk = chunks[i + 1]
-
-            # Merge chunks if combined length is reasonable
-            combined_content = (
-                current_chunk.page_content + "\n\n" + next_chunk.page_content
-            )
-
-            if len(combined_content) <= chunk_size * 1.5:  # Allow some overflow
-                # Create merged chunk
-                merged_chunk = Document(
-                    page_content=combined_content,
-                    metadata={
-                        "source": current_chunk.metadata.get("source", "unknown"),
-                        "merged": True,
-                        "original_chunks": 2,
-                    },
-                )
+        if i + 1 < len(chunks):
+            merged_chunk = _merge_pair(current_chunk, chunks[i + 1], chunk_size)
+            if merged_chunk is not None:
                 merged_chunks.append(merged_chunk)
                 i += 2  # Skip both chunks
                 continue
@@ -171,25 +484,36 @@ def _merge_short_chunks(chunks, chunk_size):
     return merged_chunks
 
 
-def post_retrieval_deduplication(documents):
+def post_retrieval_deduplication(documents, threshold=0.8):
     """
     Remove duplicate content after retrieval
 
     Args:
         documents: List of retrieved documents
+        threshold: Word-shingle Jaccard similarity above which a document
+            counts as a near-duplicate of an earlier one
 
     Returns:
         List of unique documents
     """
     unique_docs = []
     seen_content = set()
+    seen_shingles = []
 
     for doc in documents:
         # Normalize content for comparison (first 50 words)
         normalized_content = " ".join(doc.page_content.lower().split()[:50])
 
-        if normalized_content not in seen_content:
+        # Only a handful of documents: compare shingle sets exactly
+        shingles = _shingles(doc.page_content)
+        is_near_duplicate = any(
+            len(shingles & seen) / len(shingles | seen) >= threshold
+            for seen in seen_shingles
+        )
+
+        if normalized_content not in seen_content and not is_near_duplicate:
             seen_content.add(normalized_content)
+            seen_shingles.append(shingles)
             unique_docs.append(doc)
         else:
             print(f"Skipping duplicate content in retrieval")
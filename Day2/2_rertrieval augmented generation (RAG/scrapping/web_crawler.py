@@ -0,0 +1,418 @@
+"""
+Web Crawler - Async, polite site crawler that streams Documents
+
+WebBaseLoader fetches a fixed list of URLs one after another and returns
+only when all of them are done. CrawlerLoader instead:
+
+- discovers pages by following links, up to max_depth links away from
+  the start URLs, staying on the start URLs' hosts, then from the site's
+  sitemap (robots.txt "Sitemap:" lines or /sitemap.xml) with what is
+  left of max_pages
+- fetches concurrently, but at most per_host_concurrency requests and
+  requests_per_second request starts per host, and honours robots.txt
+- keeps an on-disk HTTP cache and revalidates it with conditional GETs
+  (If-None-Match / If-Modified-Since), so unchanged pages come back as a
+  body-less 304
+- yields each page as a Document as soon as it is fetched, so chunking
+  and embedding can start before the crawl finishes
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+from bs4 import BeautifulSoup
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+SKIP_EXTENSIONS = (
+    ".pdf", ".zip", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico",
+    ".css", ".js", ".mp4", ".mp3", ".woff", ".woff2", ".xml",
+)
+
+
+class HTTPCache:
+    """
+    On-disk cache of response bodies with their validators
+
+    One JSON file per URL: url, etag, last_modified, content_type, text.
+    """
+
+    def __init__(self, directory=".http_cache"):
+        self.directory = directory
+
+    def _path(self, url):
+        name = hashlib.sha1(url.encode()).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, url):
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url, entry):
+        """Store an entry; responses without validators can't be revalidated"""
+        if not entry["etag"] and not entry["last_modified"]:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(url)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(url))
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for a cached entry"""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+class _Host:
+    """Per-host concurrency limit, request spacing and robots.txt rules"""
+
+    def __init__(self, concurrency, requests_per_second):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+        self.robots = None
+        self.sitemaps = []
+        self.ready = asyncio.Event()
+
+    async def wait_turn(self):
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class CrawlerLoader(BaseLoader):
+    """
+    Crawl sites starting from `start_urls` and load every HTML page
+
+    Args:
+        start_urls: URLs to start from (depth 0); their hosts are crawled
+        max_depth: Links followed away from a start URL (0 = start URLs only)
+        max_pages: Stop after this many pages
+        use_sitemap: Also crawl the URLs listed in each host's sitemap, after
+            the pages found by following links
+        url_prefixes: Only crawl URLs starting with one of these (optional)
+        per_host_concurrency: Requests in flight per host
+        requests_per_second: Request starts per second per host
+        cache_dir: HTTP cache directory (None disables the cache)
+        user_agent: User-Agent header, also used for robots.txt
+        timeout: Seconds per request
+    """
+
+    def __init__(
+        self,
+        start_urls,
+        max_depth=2,
+        max_pages=100,
+        use_sitemap=True,
+        url_prefixes=None,
+        per_host_concurrency=2,
+        requests_per_second=2.0,
+        cache_dir=".http_cache",
+        user_agent="EducosysRAGBot/1.0",
+        timeout=20.0,
+    ):
+        self.start_urls = [self._normalize(url) for url in start_urls]
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.use_sitemap = use_sitemap
+        self.url_prefixes = tuple(url_prefixes or ())
+        self.per_host_concurrency = per_host_concurrency
+        self.requests_per_second = requests_per_second
+        self.cache = HTTPCache(cache_dir) if cache_dir else None
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.hosts = {urlparse(url).netloc for url in self.start_urls}
+        self.stats = {}
+
+    # --- URL handling --------------------------------------------------------
+
+    @staticmethod
+    def _normalize(url):
+        url, _ = urldefrag(url.strip())
+        return url
+
+    def _allowed(self, url):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or parsed.netloc not in self.hosts:
+            return False
+        if parsed.path.lower().endswith(SKIP_EXTENSIONS):
+            return False
+        return not self.url_prefixes or url.startswith(self.url_prefixes)
+
+    # --- fetching ------------------------------------------------------------
+
+    async def _fetch(self, client, host, url):
+        """
+        GET url under the host's limits, revalidating a cached copy
+
+        Returns:
+            (status, content_type, text); status is "fetched", "not_modified"
+            or "error"
+        """
+        cached = self.cache.get(url) if self.cache else None
+        async with host.semaphore:
+            await host.wait_turn()
+            try:
+                response = await client.get(url, headers=HTTPCache.validators(cached))
+            except httpx.HTTPError:
+                return "error", "", ""
+
+        if response.status_code == 304 and cached:
+            return "not_modified", cached["content_type"], cached["text"]
+        if response.status_code != 200:
+            return "error", "", ""
+
+        entry = {
+            "url": url,
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "content_type": response.headers.get("content-type", ""),
+            "text": response.text,
+        }
+        if self.cache:
+            self.cache.put(url, entry)
+        return "fetched", entry["content_type"], entry["text"]
+
+    async def _host(self, client, hosts, url):
+        """Per-host state, reading robots.txt on first use"""
+        parsed = urlparse(url)
+        if parsed.netloc in hosts:
+            host = hosts[parsed.netloc]
+            await host.ready.wait()
+            return host
+
+        host = _Host(self.per_host_concurrency, self.requests_per_second)
+        hosts[parsed.netloc] = host
+        robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+        host.robots = RobotFileParser(robots_url)
+        host.robots.parse([])
+        host.sitemaps = [f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"]
+        try:
+            status, _, text = await self._fetch(client, host, robots_url)
+            if status != "error":
+                host.robots.parse(text.splitlines())
+                host.sitemaps = host.robots.site_maps() or host.sitemaps
+        finally:
+            # Waiters must never hang; without robots.txt everything is allowed
+            host.ready.set()
+        return host
+
+    def _can_fetch(self, host, url):
+        return host.robots.can_fetch(self.user_agent, url)
+
+    async def _sitemap_urls(self, client, hosts, sitemap_url, seen=None):
+        """Page URLs listed in a sitemap (following sitemap indexes)"""
+        seen = seen if seen is not None else set()
+        if sitemap_url in seen:
+            return []
+        seen.add(sitemap_url)
+
+        host = await self._host(client, hosts, sitemap_url)
+        status, _, text = await self._fetch(client, host, sitemap_url)
+        if status == "error":
+            return []
+        try:
+            root = ET.fromstring(text.encode())
+        except ET.ParseError:
+            return []
+
+        locations = [
+            el.text.strip()
+            for el in root.iter()
+            if el.tag.rsplit("}", 1)[-1] == "loc" and el.text
+        ]
+        if root.tag.rsplit("}", 1)[-1] == "sitemapindex":
+            urls = []
+            for location in locations:
+                urls += await self._sitemap_urls(client, hosts, location, seen)
+            return urls
+        return [self._normalize(location) for location in locations]
+
+    # --- parsing -------------------------------------------------------------
+
+    def _parse(self, url, text):
+        """Document and outgoing links of an HTML page"""
+        soup = BeautifulSoup(text, "html.parser")
+        links = [
+            self._normalize(urljoin(url, a["href"]))
+            for a in soup.find_all("a", href=True)
+        ]
+
+        metadata = {"source": url}
+        if soup.title and soup.title.string:
+            metadata["title"] = soup.title.string.strip()
+        description = soup.find("meta", attrs={"name": "description"})
+        if description and description.get("content"):
+            metadata["description"] = description["content"].strip()
+        if soup.html and soup.html.get("lang"):
+            metadata["language"] = soup.html["lang"]
+
+        for element in soup(["script", "style", "noscript"]):
+            element.decompose()
+        content = re.sub(r"\n\s*\n+", "\n\n", soup.get_text())
+        return Document(page_content=content.strip(), metadata=metadata), links
+
+    async def _crawl_page(self, client, hosts, url, depth):
+        """(url, depth, document or None, links) for one page"""
+        host = await self._host(client, hosts, url)
+        if not self._can_fetch(host, url):
+            self.stats["robots_skipped"] += 1
+            return url, depth, None, []
+
+        status, content_type, text = await self._fetch(client, host, url)
+        self.stats[status] += 1
+        if status == "error" or "html" not in content_type:
+            return url, depth, None, []
+
+        document, links = await asyncio.to_thread(self._parse, url, text)
+        document.metadata["depth"] = depth
+        return url, depth, document, links
+
+    # --- loading -------------------------------------------------------------
+
+    async def alazy_load(self):
+        """Yield a Document per HTML page, in the order pages finish"""
+        self.stats = {
+            "pages": 0,
+            "fetched": 0,
+            "not_modified": 0,
+            "error": 0,
+            "robots_skipped": 0,
+        }
+        start = time.perf_counter()
+        seen = set()
+        disallowed = set()
+        tasks = []
+        pending = 0
+        # Sitemap entries wait until link-discovered pages are done, so a
+        # large sitemap can't use up max_pages before the links are followed
+        sitemap_backlog = []
+        results = asyncio.Queue()
+        hosts = {}
+
+        async with httpx.AsyncClient(
+            headers={"User-Agent": self.user_agent},
+            timeout=self.timeout,
+            follow_redirects=True,
+        ) as client:
+
+            async def run(url, depth):
+                try:
+                    result = await self._crawl_page(client, hosts, url, depth)
+                except Exception:
+                    self.stats["error"] += 1
+                    result = (url, depth, None, [])
+                await results.put(result)
+
+            def schedule(url, depth):
+                nonlocal pending
+                if url in seen or len(seen) >= self.max_pages or not self._allowed(url):
+                    return
+                # Known disallowed pages don't use up max_pages
+                host = hosts.get(urlparse(url).netloc)
+                if host and host.ready.is_set() and not self._can_fetch(host, url):
+                    if url not in disallowed:
+                        disallowed.add(url)
+                        self.stats["robots_skipped"] += 1
+                    return
+                seen.add(url)
+                pending += 1
+                tasks.append(asyncio.create_task(run(url, depth)))
+
+            try:
+                for url in self.start_urls:
+                    schedule(url, 0)
+                if self.use_sitemap and self.max_depth > 0:
+                    for url in self.start_urls:
+                        host = await self._host(client, hosts, url)
+                        for sitemap_url in host.sitemaps:
+                            sitemap_backlog += await self._sitemap_urls(
+                                client, hosts, sitemap_url
+                            )
+
+                # Every scheduled page puts exactly one result
+                while pending or sitemap_backlog:
+                    if not pending:
+                        for page_url in sitemap_backlog:
+                            schedule(page_url, 1)
+                        sitemap_backlog = []
+                        continue
+                    url, depth, document, links = await results.get()
+                    pending -= 1
+                    if depth < self.max_depth:
+                        for link in links:
+                            schedule(link, depth + 1)
+                    if document is not None:
+                        self.stats["pages"] += 1
+                        yield document
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        self.stats["seconds"] = round(time.perf_counter() - start, 2)
+
+    def lazy_load(self):
+        """
+        Yield Documents while the crawl runs in a background thread
+
+        Lets synchronous code (e.g. chunk + embed per page) overlap with
+        fetching the rest of the site.
+        """
+        pages = queue.Queue(maxsize=self.max_pages)
+        done = object()
+        stop = threading.Event()
+
+        async def produce():
+            try:
+                async for document in self.alazy_load():
+                    if stop.is_set():
+                        break
+                    pages.put(document)
+            except Exception as e:
+                pages.put(e)
+            finally:
+                pages.put(done)
+
+        thread = threading.Thread(target=asyncio.run, args=(produce(),), daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = pages.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def print_stats(self):
+        s = self.stats
+        print(
+            f"Crawled {s['pages']} pages in {s.get('seconds', 0):.2f}s: "
+            f"{s['fetched']} fetched, {s['not_modified']} unchanged (304), "
+            f"{s['error']} errors, {s['robots_skipped']} disallowed by robots.txt"
+        )
@@ -1,13 +1,18 @@
 # YouTube Tutorial Link - https://youtu.be/NF2aRqIlYNE
 
 import os
+import sys
 import asyncio
+from pathlib import Path
 from dotenv import load_dotenv
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
-from langchain.chat_models import init_chat_model
 from langgraph_supervisor import create_supervisor
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from shared.llm_cassette import cassette_model
+from shared.llm_metrics import instrument, metrics_from_env
+from shared.mcp_sessions import MCPSessionManager
+
 load_dotenv()
 
 from langchain_core.messages import convert_to_messages
@@ -55,7 +60,8 @@ def pretty_print_messages(update, last_message=False):
 
 async def run_agent(query):
 
-    client = MultiServerMCPClient(
+    # Bright Data server stays warm for every agent's tool calls
+    client = MCPSessionManager(
         {
             "bright_data": {
                 "command": "npx",
@@ -69,8 +75,15 @@ async def run_agent(query):
             },
         }
     )
-    tools = await client.get_tools()
-    model = init_chat_model(model="openai:gpt-4.1", api_key=os.getenv("OPENAI_API_KEY"))
+    try:
+        await run_supervisor(query, await client.get_tools())
+    finally:
+        await client.close()
+
+
+async def run_supervisor(query, tools):
+    # Same as init_chat_model; records/replays when LLM_CASSETTE is set
+    model = cassette_model("openai:gpt-4.1", api_key=os.getenv("OPENAI_API_KEY"))
 
     stock_finder_agent = create_react_agent(
         model,
@@ -131,7 +144,7 @@ async def run_agent(query):
     )
 
     supervisor = create_supervisor(
-        model=init_chat_model("openai:gpt-4.1"),
+        model=cassette_model("openai:gpt-4.1"),
         agents=[
             stock_finder_agent,
             market_data_agent,
@@ -151,8 +164,11 @@ async def run_agent(query):
         add_handoff_back_messages=True,
         output_mode="full_history",
     ).compile()
+    # Records tokens/latency per LLM call when LLM_METRICS_FILE is set
+    supervisor = instrument(supervisor)
 
-    for chunk in supervisor.stream(
+    # MCP tools are async-only, so the graph has to run on the event loop
+    async for chunk in supervisor.astream(
         {
             "messages": [
                 {
@@ -166,6 +182,10 @@ async def run_agent(query):
 
     final_message_history = chunk["supervisor"]["messages"]
 
+    metrics = metrics_from_env()
+    if metrics:
+        metrics.print_summary()
+
 
 if __name__ == "__main__":
     asyncio.run(run_agent("Give me good stock recommendation from NSE"))
@@ -0,0 +1,6 @@
+"""
+Shared helpers used by the chapter scripts.
+
+Scripts add the repository root to ``sys.path`` and import from here, e.g.
+``from shared.llm_metrics import instrument``.
+"""
@@ -0,0 +1,454 @@
+"""
+LLM Cassette - Record/replay layer for offline, reproducible runs
+
+In "record" mode every model call goes to the real provider and the
+request -> response pair is saved to a JSON cassette file, including each
+streamed chunk and when it arrived. In "replay" mode the same calls are
+served from the cassette without any network access, optionally sleeping
+to reproduce the recorded latency (latency_scale=1.0) or not at all
+(latency_scale=0.0). "auto" replays what it has and records the rest.
+
+This lets us benchmark our own overhead (graph execution, tools, parsing)
+separately from provider latency.
+
+Usage:
+    # LangChain chat models (wraps init_chat_model)
+    model = cassette_model("groq:llama-3.3-70b-versatile")
+
+    # Existing model instances such as ChatGroq
+    model = wrap_chat_model(ChatGroq(...), "groq:llama-3.1-8b-instant")
+
+    # Google GenAI client
+    client = wrap_genai_client(genai.Client)
+
+Configuration comes from the environment unless passed explicitly:
+    LLM_CASSETTE=cassettes/simple_chat.json
+    LLM_CASSETTE_MODE=record | replay | auto     (default: replay)
+    LLM_CASSETTE_LATENCY=0.0 .. 1.0              (default: 0.0)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessageChunk,
+    message_to_dict,
+    messages_from_dict,
+    tool_call_chunk,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+MODES = ("record", "replay", "auto")
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when a request was never recorded"""
+
+
+class Cassette:
+    """
+    JSON file of recorded episodes keyed by request fingerprint
+
+    The same request may be recorded several times (e.g. a retry or a
+    repeated prompt); replays cycle through the episodes in order.
+    """
+
+    def __init__(self, path, mode="replay"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected one of {MODES}")
+
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._cursor = {}
+        self.episodes = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.episodes = json.load(f)
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette '{path}' does not exist; record it first")
+
+    def lookup(self, key):
+        """Return the next recorded episode for key, or None"""
+        if self.mode == "record":
+            return None
+
+        with self._lock:
+            episodes = self.episodes.get(key)
+            if not episodes:
+                if self.mode == "replay":
+                    raise CassetteMiss(
+                        f"No recording for request {key[:12]} in '{self.path}'"
+                    )
+                return None
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            return episodes[index % len(episodes)]
+
+    def record(self, key, episode):
+        with self._lock:
+            self.episodes.setdefault(key, []).append(episode)
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.episodes, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+def fingerprint(*parts):
+    """Stable SHA-256 over JSON-able request parts"""
+    payload = json.dumps(_jsonable(parts), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _jsonable(value):
+    """Convert request objects into something stable to hash"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, bytes):
+        return {"bytes": hashlib.sha256(value).hexdigest()}
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if hasattr(value, "model_dump"):
+        return _jsonable(value.model_dump(mode="json", exclude_none=True))
+    if hasattr(value, "tobytes") and hasattr(value, "size"):
+        # PIL images
+        return {"image": hashlib.sha256(value.tobytes()).hexdigest(), "size": value.size}
+    return repr(value)
+
+
+def _message_key(message):
+    """Message identity without the random ids LangChain assigns"""
+    return {
+        "type": message.type,
+        "content": message.content,
+        "tool_calls": [
+            {"name": tc["name"], "args": tc["args"], "id": tc.get("id")}
+            for tc in getattr(message, "tool_calls", None) or []
+        ],
+        "tool_call_id": getattr(message, "tool_call_id", None),
+    }
+
+
+def _as_chunk(message):
+    """Turn a recorded AIMessage into a single stream chunk"""
+    return AIMessageChunk(
+        content=message.content,
+        tool_call_chunks=[
+            tool_call_chunk(
+                name=tc["name"], args=json.dumps(tc["args"]), id=tc.get("id"), index=i
+            )
+            for i, tc in enumerate(getattr(message, "tool_calls", None) or [])
+        ],
+        usage_metadata=getattr(message, "usage_metadata", None),
+        response_metadata=message.response_metadata,
+    )
+
+
+def _from_dict(data):
+    return messages_from_dict([data])[0]
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    Chat model that records or replays another chat model
+
+    In replay mode `inner` may be None, so no API key is needed.
+    """
+
+    inner: Optional[Any] = None
+    cassette: Any
+    model: str
+    latency_scale: float = 0.0
+
+    @property
+    def _llm_type(self):
+        return "cassette"
+
+    @property
+    def _identifying_params(self):
+        return {"model_name": self.model, "mode": self.cassette.mode}
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        formatted = [convert_to_openai_tool(t) for t in tools]
+        if tool_choice is not None:
+            kwargs["tool_choice"] = tool_choice
+        return self.bind(tools=formatted, **kwargs)
+
+    def _key(self, messages, stop, kwargs):
+        return fingerprint(
+            self.model, [_message_key(m) for m in messages], stop, kwargs
+        )
+
+    def _live_model(self, kwargs):
+        if self.inner is None:
+            raise CassetteMiss(f"No live model configured for '{self.model}'")
+
+        kwargs = dict(kwargs)
+        model = self.inner
+        tools = kwargs.pop("tools", None)
+        if tools:
+            tool_kwargs = {
+                k: kwargs.pop(k)
+                for k in ("tool_choice", "parallel_tool_calls")
+                if k in kwargs
+            }
+            model = model.bind_tools(tools, **tool_kwargs)
+        if kwargs:
+            model = model.bind(**kwargs)
+        return model
+
+    def _sleep(self, seconds):
+        if self.latency_scale > 0 and seconds > 0:
+            time.sleep(seconds * self.latency_scale)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        key = self._key(messages, stop, kwargs)
+        episode = self.cassette.lookup(key)
+
+        if episode is not None:
+            self._sleep(episode["latency"])
+            if episode["kind"] == "stream":
+                message = _from_dict(episode["chunks"][0]["message"])
+                for chunk in episode["chunks"][1:]:
+                    message = message + _from_dict(chunk["message"])
+            else:
+                message = _from_dict(episode["message"])
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        start = time.perf_counter()
+        message = self._live_model(kwargs).invoke(messages, stop=stop)
+        self.cassette.record(
+            key,
+            {
+                "kind": "invoke",
+                "latency": time.perf_counter() - start,
+                "message": message_to_dict(message),
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        key = self._key(messages, stop, kwargs)
+        episode = self.cassette.lookup(key)
+
+        if episode is not None:
+            if episode["kind"] == "invoke":
+                self._sleep(episode["latency"])
+                timed_chunks = [(0.0, _as_chunk(_from_dict(episode["message"])))]
+            else:
+                timed_chunks = [
+                    (c["t"], _from_dict(c["message"])) for c in episode["chunks"]
+                ]
+
+            previous = 0.0
+            for t, message in timed_chunks:
+                self._sleep(t - previous)
+                previous = t
+                chunk = ChatGenerationChunk(message=message)
+                if run_manager:
+                    run_manager.on_llm_new_token(message.content, chunk=chunk)
+                yield chunk
+            return
+
+        recorded = []
+        start = time.perf_counter()
+        for message in self._live_model(kwargs).stream(messages, stop=stop):
+            recorded.append(
+                {"t": time.perf_counter() - start, "message": message_to_dict(message)}
+            )
+            chunk = ChatGenerationChunk(message=message)
+            if run_manager:
+                run_manager.on_llm_new_token(message.content, chunk=chunk)
+            yield chunk
+
+        if recorded:
+            self.cassette.record(
+                key,
+                {
+                    "kind": "stream",
+                    "latency": time.perf_counter() - start,
+                    "chunks": recorded,
+                },
+            )
+
+
+class _CassetteGenAIModels:
+    """Stand-in for `genai.Client().models`"""
+
+    def __init__(self, models, cassette, latency_scale):
+        self._models = models
+        self._cassette = cassette
+        self._latency_scale = latency_scale
+
+    def _sleep(self, seconds):
+        if self._latency_scale > 0 and seconds > 0:
+            time.sleep(seconds * self._latency_scale)
+
+    def _live(self):
+        if self._models is None:
+            raise CassetteMiss("No live genai client configured")
+        return self._models
+
+    def generate_content(self, *, model, contents, config=None):
+        from google.genai import types
+
+        key = fingerprint("genai", model, contents, config)
+        episode = self._cassette.lookup(key)
+        if episode is not None:
+            self._sleep(episode["latency"])
+            return types.GenerateContentResponse.model_validate(episode["response"])
+
+        start = time.perf_counter()
+        response = self._live().generate_content(
+            model=model, contents=contents, config=config
+        )
+        self._cassette.record(
+            key,
+            {
+                "kind": "invoke",
+                "latency": time.perf_counter() - start,
+                "response": response.model_dump(mode="json", exclude_none=True),
+            },
+        )
+        return response
+
+    def generate_content_stream(self, *, model, contents, config=None):
+        from google.genai import types
+
+        key = fingerprint("genai-stream", model, contents, config)
+        episode = self._cassette.lookup(key)
+        if episode is not None:
+            previous = 0.0
+            for chunk in episode["chunks"]:
+                self._sleep(chunk["t"] - previous)
+                previous = chunk["t"]
+                yield types.GenerateContentResponse.model_validate(chunk["response"])
+            return
+
+        recorded = []
+        start = time.perf_counter()
+        for response in self._live().generate_content_stream(
+            model=model, contents=contents, config=config
+        ):
+            recorded.append(
+                {
+                    "t": time.perf_counter() - start,
+                    "response": response.model_dump(mode="json", exclude_none=True),
+                }
+            )
+            yield response
+
+        if recorded:
+            self._cassette.record(
+                key,
+                {
+                    "kind": "stream",
+                    "latency": time.perf_counter() - start,
+                    "chunks": recorded,
+                },
+            )
+
+
+class CassetteGenAIClient:
+    """Minimal `genai.Client` wrapper exposing `.models`"""
+
+    def __init__(self, client, cassette, latency_scale=0.0):
+        self._client = client
+        self.models = _CassetteGenAIModels(
+            client.models if client is not None else None, cassette, latency_scale
+        )
+
+    def __getattr__(self, name):
+        if self._client is None:
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+
+_cassettes = {}
+
+
+def cassette_from_env(path=None, mode=None):
+    """
+    Return the shared Cassette for LLM_CASSETTE, or None when disabled
+    """
+    path = path or os.getenv("LLM_CASSETTE")
+    if not path:
+        return None
+    mode = mode or os.getenv("LLM_CASSETTE_MODE", "replay")
+    if path not in _cassettes:
+        _cassettes[path] = Cassette(path, mode)
+    return _cassettes[path]
+
+
+def _latency_scale(latency_scale):
+    if latency_scale is not None:
+        return latency_scale
+    return float(os.getenv("LLM_CASSETTE_LATENCY", "0"))
+
+
+def wrap_chat_model(model, model_id, cassette=None, latency_scale=None):
+    """
+    Wrap an existing chat model instance (e.g. ChatGroq)
+
+    Returns the model unchanged if no cassette is configured.
+    """
+    cassette = cassette or cassette_from_env()
+    if cassette is None:
+        return model
+    return CassetteChatModel(
+        inner=model,
+        cassette=cassette,
+        model=model_id,
+        latency_scale=_latency_scale(latency_scale),
+    )
+
+
+def cassette_model(model_id, cassette=None, latency_scale=None, **kwargs):
+    """
+    Drop-in for `init_chat_model(model_id, **kwargs)`
+
+    In replay mode the real model is never constructed, so no API key or
+    network is required.
+    """
+    cassette = cassette or cassette_from_env()
+    if cassette is None:
+        return init_chat_model(model_id, **kwargs)
+
+    inner = None if cassette.mode == "replay" else init_chat_model(model_id, **kwargs)
+    provider = kwargs.get("model_provider")
+    return CassetteChatModel(
+        inner=inner,
+        cassette=cassette,
+        model=f"{provider}:{model_id}" if provider else model_id,
+        latency_scale=_latency_scale(latency_scale),
+    )
+
+
+def wrap_genai_client(client_factory, cassette=None, latency_scale=None):
+    """
+    Build a genai client, wrapped when a cassette is configured
+
+    Args:
+        client_factory: Callable returning a `genai.Client` (e.g. genai.Client)
+    """
+    cassette = cassette or cassette_from_env()
+    if cassette is None:
+        return client_factory()
+    client = None if cassette.mode == "replay" else client_factory()
+    return CassetteGenAIClient(client, cassette, _latency_scale(latency_scale))
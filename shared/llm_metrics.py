@@ -0,0 +1,259 @@
+"""
+LLM Metrics - Per-call token and latency instrumentation
+
+A LangChain callback handler that records, for every chat model call:
+model name, prompt tokens, completion tokens, time to first token (TTFT)
+and total latency. Records are appended to a JSONL file and aggregated
+into a summary.
+
+Works with anything that accepts callbacks: `init_chat_model(...)` models,
+`create_react_agent(...)` graphs and supervisors.
+
+Usage:
+    metrics = LLMMetrics("llm_calls.jsonl")
+    agent = instrument(create_react_agent(...), metrics)
+    ...
+    metrics.print_summary()
+
+Or let the environment decide (no-op unless LLM_METRICS_FILE is set):
+    agent = instrument(create_react_agent(...))
+"""
+
+import json
+import os
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+class JSONLSink:
+    """Append-only JSONL writer shared between threads"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class LLMMetrics(BaseCallbackHandler):
+    """
+    Callback handler recording one record per LLM call
+
+    Args:
+        path: Optional JSONL file to append records to
+        keep_records: Keep records in memory for summary() (default True)
+    """
+
+    def __init__(self, path=None, keep_records=True):
+        self.sink = JSONLSink(path) if path else None
+        self.keep_records = keep_records
+        self.records = []
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    # --- callback hooks -------------------------------------------------
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id, serialized, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, serialized, kwargs)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        call = self._inflight.get(run_id)
+        if call is not None and call["first_token"] is None:
+            call["first_token"] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        call = self._inflight.pop(run_id, None)
+        if call is None:
+            return
+
+        end = time.perf_counter()
+        prompt_tokens, completion_tokens = _extract_usage(response)
+        llm_output = response.llm_output or {}
+
+        record = {
+            "ts": time.time(),
+            "model": llm_output.get("model_name") or call["model"],
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "ttft_ms": (
+                round((call["first_token"] - call["start"]) * 1000, 2)
+                if call["first_token"] is not None
+                else None
+            ),
+            "latency_ms": round((end - call["start"]) * 1000, 2),
+        }
+        self._record(record)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        call = self._inflight.pop(run_id, None)
+        if call is None:
+            return
+
+        record = {
+            "ts": time.time(),
+            "model": call["model"],
+            "prompt_tokens": None,
+            "completion_tokens": None,
+            "ttft_ms": None,
+            "latency_ms": round((time.perf_counter() - call["start"]) * 1000, 2),
+            "error": type(error).__name__,
+        }
+        self._record(record)
+
+    # --- helpers ----------------------------------------------------------
+
+    def _start(self, run_id, serialized, kwargs):
+        self._inflight[run_id] = {
+            "start": time.perf_counter(),
+            "first_token": None,
+            "model": _model_name(serialized, kwargs),
+        }
+
+    def _record(self, record):
+        if self.keep_records:
+            with self._lock:
+                self.records.append(record)
+        if self.sink:
+            self.sink.write(record)
+
+    def summary(self):
+        """
+        Aggregate the recorded calls
+
+        Returns:
+            Dictionary with totals overall and per model
+        """
+        with self._lock:
+            records = list(self.records)
+
+        per_model = {}
+        for record in records:
+            stats = per_model.setdefault(
+                record["model"] or "unknown",
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "total_latency_ms": 0.0,
+                    "ttfts": [],
+                },
+            )
+            stats["calls"] += 1
+            if record.get("error"):
+                stats["errors"] += 1
+            stats["prompt_tokens"] += record["prompt_tokens"] or 0
+            stats["completion_tokens"] += record["completion_tokens"] or 0
+            stats["total_latency_ms"] += record["latency_ms"]
+            if record["ttft_ms"] is not None:
+                stats["ttfts"].append(record["ttft_ms"])
+
+        for stats in per_model.values():
+            ttfts = stats.pop("ttfts")
+            stats["avg_latency_ms"] = round(stats["total_latency_ms"] / stats["calls"], 2)
+            stats["avg_ttft_ms"] = round(sum(ttfts) / len(ttfts), 2) if ttfts else None
+            stats["total_latency_ms"] = round(stats["total_latency_ms"], 2)
+
+        return {
+            "calls": len(records),
+            "prompt_tokens": sum(s["prompt_tokens"] for s in per_model.values()),
+            "completion_tokens": sum(
+                s["completion_tokens"] for s in per_model.values()
+            ),
+            "models": per_model,
+        }
+
+    def print_summary(self):
+        """Print a short human readable summary"""
+        summary = self.summary()
+        print(
+            f"LLM calls: {summary['calls']} | "
+            f"prompt tokens: {summary['prompt_tokens']} | "
+            f"completion tokens: {summary['completion_tokens']}"
+        )
+        for model, stats in summary["models"].items():
+            ttft = stats["avg_ttft_ms"]
+            print(
+                f"  {model}: {stats['calls']} calls, "
+                f"avg latency {stats['avg_latency_ms']} ms, "
+                f"avg TTFT {ttft if ttft is not None else '-'} ms"
+            )
+
+    def close(self):
+        if self.sink:
+            self.sink.close()
+
+
+def _model_name(serialized, kwargs):
+    """Best-effort model name from the callback start arguments"""
+    metadata = kwargs.get("metadata") or {}
+    if metadata.get("ls_model_name"):
+        return metadata["ls_model_name"]
+
+    params = kwargs.get("invocation_params") or {}
+    for key in ("model", "model_name"):
+        if params.get(key):
+            return params[key]
+
+    serialized = serialized or {}
+    return (serialized.get("kwargs") or {}).get("model_name") or serialized.get("name")
+
+
+def _extract_usage(response):
+    """Return (prompt_tokens, completion_tokens) from an LLMResult"""
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage = getattr(message, "usage_metadata", None)
+            if usage:
+                return usage.get("input_tokens"), usage.get("output_tokens")
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return token_usage.get("prompt_tokens"), token_usage.get("completion_tokens")
+
+
+_env_metrics = None
+
+
+def metrics_from_env():
+    """
+    Return a process-wide LLMMetrics if LLM_METRICS_FILE is set, else None
+    """
+    global _env_metrics
+    path = os.getenv("LLM_METRICS_FILE")
+    if not path:
+        return None
+    if _env_metrics is None:
+        _env_metrics = LLMMetrics(path)
+    return _env_metrics
+
+
+def instrument(runnable, metrics=None):
+    """
+    Attach metrics callbacks to a model, agent or compiled graph
+
+    Args:
+        runnable: Any LangChain runnable (chat model, agent, graph)
+        metrics: LLMMetrics instance; defaults to metrics_from_env()
+
+    Returns:
+        The runnable bound with the callback, or unchanged if disabled
+    """
+    metrics = metrics or metrics_from_env()
+    if metrics is None:
+        return runnable
+    return runnable.with_config(callbacks=[metrics])
@@ -0,0 +1,342 @@
+"""
+MCP Sessions - Long-lived MCP server sessions with cached tool discovery
+
+`MultiServerMCPClient(...).get_tools()` spawns every stdio server
+(python, npx, volta run npx) just to list its tools, and the tools it
+returns open a fresh session - a new subprocess - on every single call.
+
+MCPSessionManager instead:
+- keeps one session per server open for the life of the manager and
+  reuses it for every tool call across agent invocations
+- restarts a server's session if the process dies, then retries the call
+- caches each server's tool schemas on disk; the cache entry is tied to a
+  fingerprint of the server config (and the mtime of local server scripts)
+  and expires after max_age, so a warm start skips discovery and does not
+  spawn anything until a tool is actually called
+- reports cold vs warm startup time per server
+- records spawn, discovery and tool call spans when a tracer is given or
+  MCP_TRACE_FILE is set (see mcp_tracing.py)
+
+Usage:
+    mcp = MCPSessionManager({"EducosysFileSystem": {...}})
+    tools = await mcp.get_tools()
+    agent = create_react_agent(model, tools)
+    ...
+    await mcp.close()
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+import anyio
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp.types import CONNECTION_CLOSED, Tool
+
+try:
+    from mcp.shared.exceptions import McpError
+except ImportError:  # renamed in newer mcp releases
+    from mcp.shared.exceptions import MCPError as McpError
+
+from shared.mcp_tracing import payload_size, tracer_from_env
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "educosys-mcp", "tool_schemas.json"
+)
+
+# Errors meaning the server process/transport is gone (not a tool error)
+_CONNECTION_ERRORS = (
+    OSError,
+    EOFError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+
+def _connection_lost(error):
+    """Whether an error means the server is gone rather than a tool failure"""
+    if isinstance(error, _CONNECTION_ERRORS):
+        return True
+    if isinstance(error, McpError):
+        # In-flight requests (and sends) after the server died fail with
+        # CONNECTION_CLOSED instead of a transport error
+        data = getattr(error, "error", None)
+        code = getattr(data, "code", getattr(error, "code", None))
+        return code == CONNECTION_CLOSED
+    return False
+
+
+def config_fingerprint(connection):
+    """Hash of a server's connection config plus mtimes of local scripts"""
+    parts = {
+        "command": connection.get("command"),
+        "args": connection.get("args"),
+        "url": connection.get("url"),
+        "transport": connection.get("transport"),
+        # Values can be secrets: only their hash goes into the fingerprint
+        "env": {
+            k: hashlib.sha256(str(v).encode()).hexdigest()
+            for k, v in sorted((connection.get("env") or {}).items())
+        },
+        "scripts": {
+            arg: os.path.getmtime(arg)
+            for arg in connection.get("args") or []
+            if isinstance(arg, str) and os.path.isfile(arg)
+        },
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+class _ServerSession:
+    """
+    One MCP session kept open in its own task
+
+    The session's context manager has to be entered and exited by the same
+    task, so a background task owns it and waits until asked to stop.
+    """
+
+    def __init__(self, client, name, tracer=None):
+        self.client = client
+        self.name = name
+        self.tracer = tracer
+        self.session = None
+        self.restarts = 0
+        self._task = None
+        self._stop = None
+        self._ended = None
+        self._lock = asyncio.Lock()
+
+    async def _run(self, ready, ended, errors):
+        try:
+            async with self.client.session(self.name) as session:
+                self.session = session
+                ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            self.session = None
+            ready.set()
+            ended.set()
+
+    async def _start(self):
+        ready = asyncio.Event()
+        errors = []
+        self._stop = asyncio.Event()
+        self._ended = asyncio.Event()
+        start = time.perf_counter()
+        self._task = asyncio.create_task(self._run(ready, self._ended, errors))
+        await ready.wait()
+        if self.tracer:
+            self.tracer.record(
+                "spawn", self.name, start, time.perf_counter(), error=bool(errors)
+            )
+        if errors:
+            raise errors[0]
+
+    async def ensure_started(self):
+        async with self._lock:
+            if self.session is None:
+                if self._task is not None:
+                    self.restarts += 1
+                    print(f"MCP server '{self.name}' is down, restarting...")
+                await self._start()
+            return self.session
+
+    async def restart(self, failed=None):
+        """
+        Stop and start the server session
+
+        Args:
+            failed: The session a call failed on. Concurrent calls that hit
+                the same crash then restart it once: later ones get the
+                session the first one started.
+        """
+        async with self._lock:
+            if failed is None or self.session is None or self.session is failed:
+                await self.stop()
+                self.restarts += 1
+                print(f"MCP server '{self.name}' is down, restarting...")
+                await self._start()
+            return self.session
+
+    async def stop(self):
+        if self._task is not None:
+            self._stop.set()
+            try:
+                await self._task
+            except Exception:
+                pass
+        self.session = None
+
+    async def call_tool(self, *args, **kwargs):
+        """Same signature as ClientSession.call_tool; restarts once on crash"""
+        queued = time.perf_counter()
+        session = await self.ensure_started()
+        start = time.perf_counter()
+        result = None
+        try:
+            try:
+                result = await self._call(session, self._ended, *args, **kwargs)
+            except Exception as e:
+                if not _connection_lost(e):
+                    raise
+                session = await self.restart(failed=session)
+                result = await self._call(session, self._ended, *args, **kwargs)
+            return result
+        finally:
+            if self.tracer:
+                self._trace_call(args, kwargs, result, queued, start)
+
+    async def _call(self, session, ended, *args, **kwargs):
+        """
+        session.call_tool, failing if the session ends before it answers
+
+        A request in flight when another caller restarts the session would
+        otherwise wait for a response that never comes.
+        """
+        call = asyncio.ensure_future(session.call_tool(*args, **kwargs))
+        closed = asyncio.ensure_future(ended.wait())
+        try:
+            await asyncio.wait({call, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if call.done():
+                return call.result()
+            raise ConnectionError(f"MCP server '{self.name}' session closed")
+        finally:
+            closed.cancel()
+            call.cancel()
+
+    def _trace_call(self, args, kwargs, result, queued, start):
+        name = args[0] if args else kwargs.get("name")
+        arguments = args[1] if len(args) > 1 else kwargs.get("arguments")
+        self.tracer.record(
+            "tool",
+            self.name,
+            start,
+            time.perf_counter(),
+            tool=name,
+            queue_wait_ms=round((start - queued) * 1000, 2),
+            args_bytes=payload_size(arguments),
+            result_bytes=payload_size(result),
+            error=result is None or bool(result.isError),
+        )
+
+    async def list_tools(self):
+        session = await self.ensure_started()
+        start = time.perf_counter()
+        result = await session.list_tools()
+        if self.tracer:
+            self.tracer.record("list_tools", self.name, start, time.perf_counter())
+        return result
+
+
+class MCPSessionManager:
+    """
+    Warm MCP sessions and cached tool schemas for several servers
+
+    Args:
+        connections: Same dict as MultiServerMCPClient takes
+        cache_path: JSON file for cached tool schemas (None disables it)
+        max_age: Seconds before cached schemas are rediscovered
+        tracer: MCPTracer for spans, closed with the manager; defaults to
+            tracer_from_env(), which is shared and closed at process exit
+    """
+
+    def __init__(
+        self,
+        connections,
+        cache_path=DEFAULT_CACHE_PATH,
+        max_age=24 * 3600,
+        tracer=None,
+    ):
+        self.connections = connections
+        self.cache_path = cache_path
+        self.max_age = max_age
+        self.tracer = tracer or tracer_from_env()
+        self._owns_tracer = tracer is not None
+        self.client = MultiServerMCPClient(connections)
+        self.servers = {
+            name: _ServerSession(self.client, name, self.tracer) for name in connections
+        }
+        self.timings = {}
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    async def _server_schemas(self, name, cache):
+        """Return (mcp Tool list, was_cached) for one server"""
+        fingerprint = config_fingerprint(self.connections[name])
+        entry = cache.get(name)
+        if (
+            entry
+            and entry["fingerprint"] == fingerprint
+            and time.time() - entry["saved"] < self.max_age
+        ):
+            return [Tool.model_validate(t) for t in entry["tools"]], True
+
+        result = await self.servers[name].list_tools()
+        cache[name] = {
+            "fingerprint": fingerprint,
+            "saved": time.time(),
+            "tools": [t.model_dump(mode="json", exclude_none=True) for t in result.tools],
+        }
+        return result.tools, False
+
+    async def get_tools(self):
+        """
+        LangChain tools for all servers, bound to the long-lived sessions
+
+        Returns:
+            List of tools ready for create_react_agent
+        """
+        cache = self._load_cache()
+        tools = []
+        discovered = False
+
+        for name, server in self.servers.items():
+            start = time.perf_counter()
+            schemas, cached = await self._server_schemas(name, cache)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            discovered = discovered or not cached
+
+            self.timings[name] = {"cached": cached, "startup_ms": round(elapsed_ms, 1)}
+            how = "warm, from schema cache" if cached else "cold, spawned and discovered"
+            print(f"MCP '{name}': {len(schemas)} tools in {elapsed_ms:.0f} ms ({how})")
+
+            tools.extend(convert_mcp_tool_to_langchain_tool(server, t) for t in schemas)
+
+        if discovered:
+            self._save_cache(cache)
+        return tools
+
+    async def close(self):
+        """Stop all server sessions (and write the trace of a given tracer)"""
+        for server in self.servers.values():
+            await server.stop()
+        if self.tracer and self._owns_tracer:
+            self.tracer.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
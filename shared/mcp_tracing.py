@@ -0,0 +1,226 @@
+"""
+MCP Tracing - Per-server, per-tool latency spans for MCP sessions
+
+Tells apart the time spent spawning MCP servers, discovering their tools
+and running each tool call. MCPSessionManager records a span for:
+
+- spawn: starting a server process and the MCP handshake
+- list_tools: tool discovery (skipped when schemas come from the cache)
+- tool: every tool call, with argument size, result size, queue wait (time
+  until the session was ready, including a spawn or restart) and execution
+  latency
+
+Spans are appended to a JSONL file and, when the tracer closes, written as
+a Chrome trace-event file with one track per server. The MCP_TRACE_FILE
+tracer is shared by every session manager in the process and closes at
+exit, so one trace covers the whole run. Open it in
+chrome://tracing or https://ui.perfetto.dev. If LLM_METRICS_FILE is set too,
+the LLM calls recorded by llm_metrics go on their own track, so you can see
+whether a slow run was the model, a server start or one slow tool.
+
+Usage (no-op unless MCP_TRACE_FILE is set):
+    MCP_TRACE_FILE=mcp_trace.jsonl python stock_recommendation.py
+    # -> mcp_trace.jsonl and mcp_trace.chrome.json
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+from shared.llm_metrics import JSONLSink, metrics_from_env
+
+
+class MCPTracer:
+    """
+    Collects MCP spans
+
+    Args:
+        path: Optional JSONL file to append spans to
+        chrome_path: Chrome trace-event file written by close()
+    """
+
+    def __init__(self, path=None, chrome_path=None):
+        self.sink = JSONLSink(path) if path else None
+        self.chrome_path = chrome_path
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def record(self, kind, server, start, end, tool=None, **fields):
+        """
+        Record one span
+
+        Args:
+            kind: "spawn", "list_tools" or "tool"
+            server: MCP server name
+            start, end: time.perf_counter() values
+            tool: Tool name for tool spans
+            fields: Extra values (sizes, queue_wait_ms, error...)
+        """
+        span = {
+            # Wall-clock start, so spans line up with LLM call records
+            "ts": time.time() - (time.perf_counter() - start),
+            "kind": kind,
+            "server": server,
+            "tool": tool,
+            "latency_ms": round((end - start) * 1000, 2),
+            **fields,
+        }
+        with self._lock:
+            self.spans.append(span)
+        if self.sink:
+            self.sink.write(span)
+
+    def summary(self):
+        """
+        Aggregate spans per server and tool
+
+        Returns:
+            {server: {tool or kind: {"calls", "avg_ms", "max_ms", "total_ms"}}}
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        grouped = defaultdict(lambda: defaultdict(list))
+        for span in spans:
+            name = span["tool"] if span["kind"] == "tool" else f"({span['kind']})"
+            grouped[span["server"]][name].append(span["latency_ms"])
+
+        return {
+            server: {
+                name: {
+                    "calls": len(latencies),
+                    "avg_ms": round(sum(latencies) / len(latencies), 2),
+                    "max_ms": max(latencies),
+                    "total_ms": round(sum(latencies), 2),
+                }
+                for name, latencies in names.items()
+            }
+            for server, names in grouped.items()
+        }
+
+    def print_summary(self):
+        """Print per-server, per-tool latencies, slowest first"""
+        for server, names in self.summary().items():
+            print(f"MCP server '{server}':")
+            for name, stats in sorted(names.items(), key=lambda i: -i[1]["total_ms"]):
+                print(
+                    f"  {name}: {stats['calls']} calls, avg {stats['avg_ms']} ms, "
+                    f"max {stats['max_ms']} ms"
+                )
+
+    def chrome_trace(self, llm_records=None):
+        """
+        Spans as Chrome trace-event JSON ("X" complete events, one thread
+        per server, plus an LLM thread when llm_records are given)
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        threads = {}
+        events = []
+
+        def tid(name):
+            if name not in threads:
+                threads[name] = len(threads) + 1
+                events.append(
+                    {
+                        "ph": "M",
+                        "name": "thread_name",
+                        "pid": 1,
+                        "tid": threads[name],
+                        "args": {"name": name},
+                    }
+                )
+            return threads[name]
+
+        for span in spans:
+            args = {
+                k: v
+                for k, v in span.items()
+                if k not in ("ts", "kind", "server", "tool")
+            }
+            events.append(
+                {
+                    "ph": "X",
+                    "name": span["tool"] or span["kind"],
+                    "cat": span["kind"],
+                    "pid": 1,
+                    "tid": tid(f"mcp:{span['server']}"),
+                    "ts": round(span["ts"] * 1e6),
+                    "dur": round(span["latency_ms"] * 1000),
+                    "args": args,
+                }
+            )
+
+        for record in llm_records or []:
+            # LLM records are stamped when the call ends
+            events.append(
+                {
+                    "ph": "X",
+                    "name": record.get("model") or "llm",
+                    "cat": "llm",
+                    "pid": 1,
+                    "tid": tid("llm"),
+                    "ts": round((record["ts"] - record["latency_ms"] / 1000) * 1e6),
+                    "dur": round(record["latency_ms"] * 1000),
+                    "args": {k: v for k, v in record.items() if k != "ts"},
+                }
+            )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path=None, llm_records=None):
+        """Write the Chrome trace file; LLM calls default to metrics_from_env()"""
+        path = path or self.chrome_path
+        if not path:
+            return None
+        if llm_records is None:
+            metrics = metrics_from_env()
+            llm_records = metrics.records if metrics else None
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(llm_records), f)
+        return path
+
+    def close(self):
+        """Write the Chrome trace, print the summary and close the JSONL file"""
+        path = self.write_chrome_trace()
+        if self.spans:
+            self.print_summary()
+        if path:
+            print(f"MCP trace written to {path} (open in ui.perfetto.dev)")
+        if self.sink:
+            self.sink.close()
+            self.sink = None
+
+
+_env_tracer = None
+
+
+def tracer_from_env():
+    """
+    Return a process-wide MCPTracer if MCP_TRACE_FILE is set, else None
+
+    The Chrome trace goes next to it: mcp_trace.jsonl -> mcp_trace.chrome.json.
+    It is written when the process exits; session managers don't close it.
+    """
+    global _env_tracer
+    path = os.getenv("MCP_TRACE_FILE")
+    if not path:
+        return None
+    if _env_tracer is None:
+        _env_tracer = MCPTracer(path, f"{os.path.splitext(path)[0]}.chrome.json")
+        atexit.register(_env_tracer.close)
+    return _env_tracer
+
+
+def payload_size(value):
+    """Approximate size in bytes of tool arguments or a tool result"""
+    if value is None:
+        return 0
+    if hasattr(value, "model_dump_json"):
+        return len(value.model_dump_json())
+    return len(json.dumps(value, default=str))
@@ -0,0 +1,91 @@
+"""
+Parallel Tools - Concurrent tool execution with per-tool timeouts
+
+When the model asks for several tools in one turn, LangGraph's ToolNode
+dispatches them together: sync tools go through a thread pool and async
+(MCP) tools are gathered on the event loop, and results come back in the
+same order as the tool calls. What it does not have is a time limit, so
+one hanging tool stalls the whole turn.
+
+parallel_tool_node() wraps every tool with a timeout and returns a
+ToolNode for create_react_agent. A tool that times out returns an error
+message to the model instead of blocking, so turn latency is bounded by
+max(tool latency, timeout) rather than sum(tool latency).
+
+Usage:
+    agent = create_react_agent(
+        model="groq:llama-3.3-70b-versatile",
+        tools=parallel_tool_node(tools, timeout=10, timeouts={"calculate": 2}),
+    )
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import ToolNode
+
+# Runs the wrapped sync tools so a stuck tool can be abandoned after its
+# timeout; the ToolNode's own pool keeps dispatching the other calls.
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="tool")
+
+
+def _timeout_message(name, timeout):
+    return f"Error: tool '{name}' timed out after {timeout}s"
+
+
+def with_timeout(tool, timeout):
+    """
+    Wrap a tool so it gives up after `timeout` seconds
+
+    Args:
+        tool: Any LangChain tool (sync, async or MCP)
+        timeout: Seconds before an error message is returned instead
+
+    Returns:
+        A StructuredTool with the same name, description and arguments
+    """
+
+    def run(**kwargs):
+        # Copy the context so callbacks/tracing of the current run still apply
+        context = contextvars.copy_context()
+        future = _executor.submit(context.run, tool.invoke, kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            return _timeout_message(tool.name, timeout)
+
+    async def arun(**kwargs):
+        try:
+            return await asyncio.wait_for(tool.ainvoke(kwargs), timeout)
+        except asyncio.TimeoutError:
+            return _timeout_message(tool.name, timeout)
+
+    return StructuredTool.from_function(
+        func=run,
+        coroutine=arun,
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        return_direct=tool.return_direct,
+    )
+
+
+def parallel_tool_node(tools, timeout=30, timeouts=None):
+    """
+    Build a ToolNode that runs tool calls concurrently with timeouts
+
+    Args:
+        tools: List of tools
+        timeout: Default timeout in seconds for every tool
+        timeouts: Optional per-tool overrides, e.g. {"calculate": 2}
+
+    Returns:
+        ToolNode to pass as `tools=` to create_react_agent
+    """
+    timeouts = timeouts or {}
+    wrapped = [with_timeout(t, timeouts.get(t.name, timeout)) for t in tools]
+    return ToolNode(wrapped)
@@ -0,0 +1,172 @@
+"""
+Tool Router - Bind only the tools relevant to the current request
+
+MCP servers like GitHub's expose dozens of tools, and binding all of them
+sends every tool schema with every model call. ToolRouter indexes the tool
+names and descriptions once and, per user query, picks the top-k tools:
+
+- keyword score: BM25 over name and description words (snake_case and
+  camelCase names are split, the name counts more than the description)
+- embedding score (optional): cosine similarity between the query and the
+  tool descriptions, with any LangChain Embeddings object
+- hybrid: both scores normalised to 0..1 and mixed with `alpha`
+
+If nothing matches well (best BM25 score below min_score and no embedding
+above min_similarity) the full tool set is returned, so the agent is never
+left without the tool it needs because a query only shared a generic word
+like "repository" with the tools.
+
+Usage:
+    router = ToolRouter(tools, k=6)
+    agent = create_react_agent(model, tools=router.select(user_query))
+"""
+
+import math
+import re
+from collections import Counter
+
+_WORD_RE = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|[0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "of", "on", "or", "the", "this", "to", "with", "you", "your",
+    "me", "my", "i", "please", "can", "what", "which", "use",
+}
+
+
+def _stem(word):
+    for suffix in ("ing", "ies", "es", "ed", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[: -len(suffix)] + ("y" if suffix == "ies" else "")
+    return word
+
+
+def tokenize(text):
+    """Lowercased, lightly stemmed words; splits snake_case and camelCase"""
+    return [
+        _stem(w.lower())
+        for w in _WORD_RE.findall(text or "")
+        if w.lower() not in STOPWORDS
+    ]
+
+
+class ToolRouter:
+    """
+    Picks the most relevant tools for a query
+
+    Args:
+        tools: All available tools
+        k: Number of tools to return per query
+        embeddings: Optional LangChain Embeddings (embed_documents/embed_query)
+        alpha: Weight of the embedding score in the hybrid (0 = keywords only)
+        min_score: Raw BM25 score that counts as a keyword match; one
+            distinctive word in common scores about 2-3, words shared by
+            most tools well under 1
+        min_similarity: Embedding similarity that counts as a match
+        always: Tool names that are always included (count towards k)
+    """
+
+    def __init__(
+        self,
+        tools,
+        k=8,
+        embeddings=None,
+        alpha=0.5,
+        min_score=1.5,
+        min_similarity=0.3,
+        always=(),
+    ):
+        self.tools = list(tools)
+        self.k = k
+        self.embeddings = embeddings
+        self.alpha = alpha if embeddings else 0.0
+        self.min_score = min_score
+        self.min_similarity = min_similarity
+        self.always = [t for t in self.tools if t.name in set(always)]
+        self.fallbacks = 0
+
+        # Name words count three times as much as description words
+        self._docs = [
+            Counter(tokenize(t.name) * 3 + tokenize(t.description))
+            for t in self.tools
+        ]
+        self._lengths = [sum(doc.values()) for doc in self._docs]
+        self._avg_length = sum(self._lengths) / max(1, len(self._docs))
+        document_frequency = Counter(w for doc in self._docs for w in doc)
+        n = len(self._docs)
+        self._idf = {
+            w: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for w, df in document_frequency.items()
+        }
+
+        self._vectors = None
+        if embeddings is not None:
+            texts = [f"{t.name}: {t.description}" for t in self.tools]
+            self._vectors = [_normalize(v) for v in embeddings.embed_documents(texts)]
+
+    def _keyword_scores(self, query, k1=1.2, b=0.75):
+        words = set(tokenize(query))
+        scores = []
+        for doc, length in zip(self._docs, self._lengths):
+            score = 0.0
+            for w in words:
+                tf = doc.get(w)
+                if tf:
+                    norm = k1 * (1 - b + b * length / self._avg_length)
+                    score += self._idf[w] * tf * (k1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def scores(self, query):
+        """
+        Hybrid relevance score of every tool for a query
+
+        Returns:
+            (scores, matched): one score per tool, and whether the best
+            match is strong enough to route on
+        """
+        keyword = self._keyword_scores(query)
+        best_keyword = max(keyword, default=0.0)
+        matched = best_keyword >= self.min_score
+        keyword = [s / best_keyword if best_keyword else 0.0 for s in keyword]
+
+        if self._vectors is None:
+            return keyword, matched
+
+        query_vector = _normalize(self.embeddings.embed_query(query))
+        similarity = [sum(a * b for a, b in zip(query_vector, v)) for v in self._vectors]
+        matched = matched or max(similarity, default=0.0) >= self.min_similarity
+        return [
+            (1 - self.alpha) * kw + self.alpha * max(0.0, sim)
+            for kw, sim in zip(keyword, similarity)
+        ], matched
+
+    def select(self, query):
+        """
+        Tools to bind for this query
+
+        Returns:
+            Up to k tools, best first (always-included tools first), or all
+            tools if the query matches none of them well
+        """
+        if len(self.tools) <= self.k:
+            return self.tools
+
+        scores, matched = self.scores(query)
+        if not matched:
+            self.fallbacks += 1
+            return self.tools
+
+        ranked = sorted(range(len(self.tools)), key=lambda i: -scores[i])
+        selected = list(self.always)
+        for i in ranked:
+            if len(selected) >= self.k:
+                break
+            if self.tools[i] not in selected and scores[i] > 0:
+                selected.append(self.tools[i])
+        return selected
+
+
+def _normalize(vector):
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]